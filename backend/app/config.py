@@ -1,6 +1,8 @@
+import logging
 import os
 from pydantic_settings import BaseSettings
 from pydantic import ValidationError
+from typing import Optional
 import sys
 
 class Settings(BaseSettings):
@@ -12,6 +14,95 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     API_URL: str
 
+    # "mongo", or "local" for the embedded SQLite-backed store (one process only)
+    STORAGE_BACKEND: str = "mongo"
+    LOCAL_DB_PATH: str = "advisor.sqlite3"
+
+    # MongoDB client tuning; unset values keep the driver defaults
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_CONNECT_TIMEOUT_MS: int = 10000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_COMPRESSORS: Optional[str] = None  # e.g. "zstd,snappy,zlib"
+    MONGO_WRITE_CONCERN: Optional[str] = None  # e.g. "1" or "majority"
+    MONGO_JOURNAL: Optional[bool] = None
+    MONGO_CREATE_INDEXES: bool = True
+
+    # Group commit for conversation saves: writes queued while a bulk_write is
+    # in flight go out together in the next one
+    BULK_WRITE_ENABLED: bool = True
+    BULK_WRITE_MAX_BATCH_SIZE: int = 500
+    BULK_WRITE_MAX_WAIT_MS: float = 0.0
+
+    # LLM backend tuning
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_MAX_CONCURRENCY: int = 16
+    OPENAI_TIMEOUT: float = 30.0
+    OPENAI_MAX_RETRIES: int = 1
+
+    # LLM admission control: OPENAI_MAX_CONCURRENCY slots, an optional
+    # tokens-per-minute budget, and a bounded per-profile fair queue
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_TOKENS_PER_MINUTE: Optional[int] = None
+    LLM_QUEUE_MAX_DEPTH: int = 256
+    LLM_QUEUE_MAX_PER_PROFILE: int = 8
+    LLM_QUEUE_TIMEOUT: float = 10.0
+
+    # Sentiment engine tuning
+    SENTIMENT_MODEL: str = "distilbert-base-uncased-finetuned-sst-2-english"
+    SENTIMENT_MAX_BATCH_SIZE: int = 32
+    SENTIMENT_MAX_WAIT_MS: float = 10.0
+    SENTIMENT_TIMEOUT: float = 5.0
+
+    # Conversation memory and prompt assembly
+    MEMORY_WINDOW_TURNS: int = 10
+    MEMORY_SUMMARY_MAX_CHARS: int = 2000
+    PROMPT_TOKEN_BUDGET: int = 1500
+
+    # Advisor response cache
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_TTL_SECONDS: float = 3600.0
+    RESPONSE_CACHE_SEMANTIC: bool = False
+    RESPONSE_CACHE_SIMILARITY: float = 0.9
+
+    # Local intent router: tags each chat message, answers direct profile
+    # queries without the LLM and trims the prompt to the relevant sections
+    INTENT_ROUTER_ENABLED: bool = True
+    INTENT_ROUTER_LOCAL_ANSWERS: bool = True
+
+    # In-process profile read cache. Other workers don't see invalidations,
+    # so the TTL bounds how stale a read can be across processes.
+    PROFILE_CACHE_ENABLED: bool = True
+    PROFILE_CACHE_MAX_ENTRIES: int = 10000
+    PROFILE_CACHE_TTL_SECONDS: float = 30.0
+
+    # Local development only: create the demo login testuser/testpassword on
+    # startup. Leave off anywhere real; add users with scripts/create_user.py
+    CREATE_DEMO_USER: bool = False
+
+    # Auth: verified tokens are cached until they expire; user records
+    # (and their disabled flag) for a short TTL
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # When set, GET /metrics requires "Authorization: Bearer <token>"; the
+    # JSON /metrics/* endpoints always need a logged-in user
+    METRICS_BEARER_TOKEN: Optional[str] = None
+
+    # Sampling profiler, triggered per request with an X-Profile header
+    PROFILER_ENABLED: bool = False
+    PROFILER_INTERVAL_MS: float = 5.0
+    PROFILER_MAX_STORED: int = 20
+
+    # Load models in a background task at startup instead of on first use
+    WARM_UP_ON_STARTUP: bool = True
+
     class Config:
         env_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env')
         env_file_encoding = 'utf-8'
@@ -23,7 +114,8 @@ except ValidationError as e:
     print(f"Attempted to load .env from: {Settings.Config.env_file}")
     sys.exit(1)
 
-# Print loaded settings for debugging
-print("Loaded settings:")
-for field, value in settings.dict().items():
-    print(f"{field}: {'*' * len(value) if 'KEY' in field else value}")
\ No newline at end of file
+# Log loaded settings for debugging
+logger = logging.getLogger(__name__)
+if logger.isEnabledFor(logging.DEBUG):
+    for field, value in settings.dict().items():
+        logger.debug("%s: %s", field, '*' * len(value) if 'KEY' in field else value)
@@ -1,16 +1,72 @@
 # Backend: app/database.py
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
 from app.config import settings
+from app.instrumentation import mongo_listener
+
+logger = logging.getLogger(__name__)
+
+# Indexes for the fields ProfileService filters and sorts on. Listing sorts by
+# (field, _id) in either direction, which one ascending index serves.
+INDEXES = {
+    "profiles": [
+        [("name", ASCENDING), ("_id", ASCENDING)],
+        [("age", ASCENDING), ("_id", ASCENDING)],
+        [("income", ASCENDING), ("_id", ASCENDING)],
+        [("savings", ASCENDING), ("_id", ASCENDING)],
+        [("debts", ASCENDING), ("_id", ASCENDING)],
+    ],
+    "conversations": [
+        [("profile_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+    ],
+}
+
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "compressors": settings.MONGO_COMPRESSORS,
+        "journal": settings.MONGO_JOURNAL,
+    }
+    if settings.MONGO_WRITE_CONCERN is not None:
+        w = settings.MONGO_WRITE_CONCERN
+        options["w"] = int(w) if w.isdigit() else w
+    return {name: value for name, value in options.items() if value is not None}
+
 
 class Database:
     client: AsyncIOMotorClient = None
 
     async def connect_to_database(self):
-        self.client = AsyncIOMotorClient(settings.MONGO_URL)
+        if settings.STORAGE_BACKEND == "local":
+            from app.local_store import LocalClient
+            self.client = LocalClient(settings.LOCAL_DB_PATH)
+        else:
+            self.client = AsyncIOMotorClient(settings.MONGO_URL, event_listeners=[mongo_listener], **client_options())
         self.db = self.client[settings.DB_NAME]
+        if settings.MONGO_CREATE_INDEXES:
+            await self.create_indexes()
+
+    async def create_indexes(self):
+        # create_index is a no-op when an identical index exists, so this is safe on every start
+        for collection, indexes in INDEXES.items():
+            for keys in indexes:
+                try:
+                    await self.db[collection].create_index(keys)
+                except OperationFailure as e:
+                    # e.g. an index on the same keys created by hand with other options
+                    logger.warning("Could not create index %s on %s: %s", keys, collection, e)
 
     async def close_database_connection(self):
         if self.client:
             self.client.close()
 
-database = Database()
\ No newline at end of file
+database = Database()
@@ -1,31 +1,28 @@
 # Backend: app/dependencies.py
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from app.config import settings
-from app.models import TokenData
+from app.services.auth_service import UserService, verify_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
-    # Here you would typically get the user from the database
-    # For simplicity, we're just returning the username
-    return {"username": token_data.username}
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    # Signature checks are cached per token, so repeat requests skip the JWT decode
+    username = verify_access_token(token)
+    if username is None:
+        raise credentials_exception()
+    return {"username": username}
 
 async def get_current_active_user(current_user: dict = Depends(get_current_user)):
-    if current_user.get("disabled"):
+    user = await UserService.get_user(current_user["username"])
+    if user is None:
+        raise credentials_exception()
+    if user.disabled:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
+    return {"username": user.username, "disabled": user.disabled}
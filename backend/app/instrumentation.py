@@ -0,0 +1,215 @@
+# Backend: app/instrumentation.py
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter as Tally, OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from uuid import uuid4
+
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import monitoring
+from app.config import settings
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests currently being served", ["method"])
+STAGE_LATENCY = Histogram("stage_duration_seconds", "Latency of instrumented service calls", ["stage"])
+STAGE_ERRORS = Counter("stage_errors_total", "Instrumented service calls that raised", ["stage"])
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens reported by the LLM backend", ["kind"])
+LLM_IN_PROGRESS = Gauge("llm_requests_in_progress", "LLM completions currently holding a concurrency slot")
+MONGO_OPERATIONS = Counter("mongo_operations_total", "MongoDB commands sent", ["collection", "command", "outcome"])
+MONGO_LATENCY = Histogram("mongo_command_duration_seconds", "MongoDB command latency", ["command"])
+LLM_QUEUE_WAIT = Histogram("llm_queue_wait_seconds", "Time chat requests waited for an LLM slot", ["priority"])
+LLM_QUEUE_DEPTH = Gauge("llm_queue_depth", "Requests waiting for an LLM slot", ["priority"])
+LLM_SHED = Counter("llm_requests_shed_total", "Requests rejected by the LLM scheduler", ["priority", "reason"])
+INTENT_ROUTES = Counter("intent_routes_total", "Chat messages by routed intent and what answered them",
+                        ["intent", "handler"])
+
+PROFILE_HEADER = "x-profile"
+
+
+def instrumented(stage: str):
+    """Record the latency of a function (sync, async or async generator) under ``stage``."""
+    def decorator(func: Callable):
+        histogram = STAGE_LATENCY.labels(stage)
+        errors = STAGE_ERRORS.labels(stage)
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+        elif inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def record_llm_usage(usage):
+    if usage is not None:
+        LLM_TOKENS.labels("prompt").inc(usage.prompt_tokens or 0)
+        LLM_TOKENS.labels("completion").inc(usage.completion_tokens or 0)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Counts and times every command the Motor client sends."""
+
+    def __init__(self):
+        self._collections: Dict[Tuple, str] = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = target if isinstance(target, str) else ""
+
+    def _finished(self, event, outcome: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_OPERATIONS.labels(collection, event.command_name, outcome).inc()
+        MONGO_LATENCY.labels(event.command_name).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finished(event, "success")
+
+    def failed(self, event):
+        self._finished(event, "failure")
+
+
+mongo_listener = MongoCommandListener()
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread every ``interval`` seconds from a
+    background thread and aggregates it as folded stacks (the input format of
+    flamegraph.pl and speedscope).
+
+    Profiling a request samples the event loop thread, so other requests that
+    run concurrently show up in the same profile.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Tally()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """The most recent request profiles, served at ``/metrics/request_profiles/{id}``."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+        self._active = threading.Lock()
+
+    def start(self) -> Optional[Tuple[str, SamplingProfiler]]:
+        # One profile at a time; overlapping requests would sample the same thread anyway
+        if not self._active.acquire(blocking=False):
+            return None
+        profiler = SamplingProfiler(threading.get_ident(), settings.PROFILER_INTERVAL_MS / 1000)
+        profiler.start()
+        return uuid4().hex, profiler
+
+    def finish(self, profile_id: str, profiler: SamplingProfiler):
+        try:
+            self._profiles[profile_id] = profiler.stop()
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+        finally:
+            self._active.release()
+
+    def get(self, profile_id: str) -> Optional[str]:
+        return self._profiles.get(profile_id)
+
+
+profile_store = ProfileStore(max_entries=settings.PROFILER_MAX_STORED)
+
+
+class MetricsMiddleware:
+    """Records per-route latency and in-flight requests, and profiles requests
+    that carry an ``X-Profile`` header when ``PROFILER_ENABLED`` is set."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        profiling = None
+        if settings.PROFILER_ENABLED and any(name == PROFILE_HEADER.encode() for name, _ in scope["headers"]):
+            profiling = profile_store.start()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profiling is not None:
+                    message["headers"] = [*message.get("headers", []), (b"x-profile-id", profiling[0].encode())]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            if profiling is not None:
+                profile_store.finish(*profiling)
+            # Label by route template so ids in the path don't explode cardinality
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(method, getattr(route, "path", "unmatched"), str(status)).observe(elapsed)
@@ -0,0 +1,568 @@
+# Backend: app/local_store.py
+import asyncio
+import copy
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bson import ObjectId, json_util
+from pymongo import InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+MISSING = object()
+# $type aliases the services query on
+BSON_TYPES = {"string": str, "objectId": ObjectId}
+# The operators the services use. Anything else raises ValueError rather than
+# silently matching differently from MongoDB; extend these together with
+# tests/test_local_store.py.
+QUERY_OPERATORS = {"$in", "$lt", "$lte", "$gte", "$exists", "$type", "$regex", "$options"}
+UPDATE_OPERATORS = {"$set", "$unset", "$inc", "$push", "$setOnInsert"}
+
+
+def get_path(document: Any, path: str) -> Any:
+    """Resolve a dotted path such as ``recent.0.timestamp``; MISSING if absent."""
+    value = document
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part, MISSING)
+        elif isinstance(value, list) and part.isdigit():
+            index = int(part)
+            value = value[index] if index < len(value) else MISSING
+        else:
+            return MISSING
+        if value is MISSING:
+            return MISSING
+    return value
+
+
+def set_path(document: dict, path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        document = document.setdefault(part, {})
+    document[parts[-1]] = value
+
+
+def unset_path(document: dict, path: str):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        document = document.get(part)
+        if not isinstance(document, dict):
+            return
+    document.pop(parts[-1], None)
+
+
+def compare_value(value: Any, operator: str, operand: Any) -> bool:
+    if operator == "$eq":
+        return value == operand or (operand is None and value is MISSING)
+    if operator == "$in":
+        return any(compare_value(value, "$eq", item) for item in operand)
+    if value is MISSING or value is None:
+        return False
+    try:
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        if operator == "$lte":
+            return value <= operand
+    except TypeError:
+        # Mongo never matches range queries across types
+        return False
+    raise ValueError(f"Unsupported query operator {operator!r}")
+
+
+def match_condition(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+        unsupported = set(condition) - QUERY_OPERATORS
+        if unsupported:
+            raise ValueError(f"Unsupported query operator {sorted(unsupported)[0]!r}")
+        for operator, operand in condition.items():
+            if operator == "$options":
+                continue
+            if operator == "$exists":
+                if (value is not MISSING) != bool(operand):
+                    return False
+            elif operator == "$type":
+                if not isinstance(value, BSON_TYPES[operand]):
+                    return False
+            elif operator == "$regex":
+                flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+                if not isinstance(value, str) or not re.search(operand, value, flags):
+                    return False
+            elif not match_scalar_or_array(value, operator, operand):
+                return False
+        return True
+    return match_scalar_or_array(value, "$eq", condition)
+
+
+def match_scalar_or_array(value: Any, operator: str, operand: Any) -> bool:
+    # Like Mongo, a condition on an array field matches if any element does
+    if isinstance(value, list) and not isinstance(operand, list):
+        return any(compare_value(item, operator, operand) for item in value)
+    return compare_value(value, operator, operand)
+
+
+def matches(document: dict, query: dict) -> bool:
+    for path, condition in query.items():
+        if path == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif path.startswith("$"):
+            raise ValueError(f"Unsupported query operator {path!r}")
+        elif not match_condition(get_path(document, path), condition):
+            return False
+    return True
+
+
+def project(document: dict, projection: Optional[dict]) -> dict:
+    if not projection:
+        return copy.deepcopy(document)
+    include_id = projection.get("_id", 1)
+    fields = {field: flag for field, flag in projection.items() if field != "_id"}
+    if any(fields.values()):
+        result = {field: copy.deepcopy(document[field]) for field in fields if field in document}
+    else:
+        result = {field: copy.deepcopy(value) for field, value in document.items() if field not in fields}
+    if include_id and "_id" in document:
+        result["_id"] = document["_id"]
+    else:
+        result.pop("_id", None)
+    return result
+
+
+def sort_key(value: Any):
+    # Mongo's order across types: missing/null, numbers, strings, ObjectIds, booleans
+    if value is MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (4, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, ObjectId):
+        return (3, value)
+    return (5, value)
+
+
+def normalize_sort(key_or_list, direction: Optional[int] = None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    return list(key_or_list)
+
+
+def apply_update(document: dict, update: dict, inserting: bool = False):
+    unsupported = set(update) - UPDATE_OPERATORS
+    if unsupported:
+        raise ValueError(f"Unsupported update operator {sorted(unsupported)[0]!r}")
+    for operator, fields in update.items():
+        if operator == "$setOnInsert":
+            if inserting:
+                for path, value in fields.items():
+                    set_path(document, path, copy.deepcopy(value))
+        elif operator == "$set":
+            for path, value in fields.items():
+                set_path(document, path, copy.deepcopy(value))
+        elif operator == "$unset":
+            for path in fields:
+                unset_path(document, path)
+        elif operator == "$inc":
+            for path, amount in fields.items():
+                current = get_path(document, path)
+                set_path(document, path, (0 if current is MISSING or current is None else current) + amount)
+        elif operator == "$push":
+            for path, value in fields.items():
+                current = get_path(document, path)
+                items = list(current) if isinstance(current, list) else []
+                if isinstance(value, dict) and "$each" in value:
+                    if set(value) != {"$each"}:
+                        raise ValueError(f"Unsupported $push modifiers {sorted(set(value) - {'$each'})!r}")
+                    items.extend(copy.deepcopy(value["$each"]))
+                else:
+                    items.append(copy.deepcopy(value))
+                set_path(document, path, items)
+
+
+def upsert_seed(query: dict) -> dict:
+    # Equality conditions in the filter become fields of the inserted document
+    document = {}
+    for path, condition in query.items():
+        if not (isinstance(condition, dict) and any(key.startswith("$") for key in condition)):
+            set_path(document, path, copy.deepcopy(condition))
+    return document
+
+
+class LocalCursor:
+    """The part of Motor's cursor API the services use."""
+
+    def __init__(self, collection: "LocalCollection", query: dict, projection: Optional[dict]):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[Iterator[dict]] = None
+
+    def sort(self, key_or_list, direction: Optional[int] = None) -> "LocalCursor":
+        self._sort = normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int) -> "LocalCursor":
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "LocalCursor":
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int) -> "LocalCursor":
+        return self
+
+    async def _documents(self) -> List[dict]:
+        await self._collection._ready()
+        documents = self._collection._find(self._query)
+        # Stable sorts applied from the last key to the first give a multi-key sort
+        for field, direction in reversed(self._sort):
+            documents.sort(key=lambda document: sort_key(get_path(document, field)), reverse=direction < 0)
+        documents = documents[self._skip:]
+        if self._limit:
+            documents = documents[:self._limit]
+        return [project(document, self._projection) for document in documents]
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        documents = await self._documents()
+        return documents[:length] if length else documents
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._results is None:
+            self._results = iter(await self._documents())
+        try:
+            return next(self._results)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class LocalCollection:
+    """A collection held in memory, keyed by ``_id``, and written through to
+    one SQLite table.
+
+    The table is read once, on first use, on the client's I/O thread. Each
+    operation reads and changes the in-memory documents without awaiting, so
+    it is atomic with respect to other requests on the loop; it then awaits
+    the SQLite write, which the I/O thread commits in submission order.
+    """
+
+    def __init__(self, client: "LocalClient", table: str):
+        self.name = table.split(".", 1)[-1]
+        self._client = client
+        self._table = table
+        # None until _ready() has read the table; every public method awaits it first
+        self._documents: Optional[Dict[Any, dict]] = None
+        self._loading: Optional[asyncio.Future] = None
+        # field -> value -> ids (a dict used as an insertion-ordered set)
+        self._indexes: Dict[str, Dict[Any, Dict[Any, None]]] = {}
+
+    async def _ready(self):
+        if self._documents is not None:
+            return
+        if self._loading is None:
+            # Concurrent first callers share one read of the table
+            self._loading = asyncio.ensure_future(self._client.run(self._read_table))
+        try:
+            documents = await asyncio.shield(self._loading)
+        finally:
+            if self._loading is not None and self._loading.done():
+                self._loading = None
+        if self._documents is None:
+            self._documents = documents
+
+    def _read_table(self) -> Dict[Any, dict]:
+        # Runs on the I/O thread
+        connection = self._client.connection
+        connection.execute(f'CREATE TABLE IF NOT EXISTS "{self._table}" (id TEXT PRIMARY KEY, doc TEXT NOT NULL)')
+        documents = {}
+        for (raw,) in connection.execute(f'SELECT doc FROM "{self._table}"'):
+            document = json_util.loads(raw)
+            documents[document["_id"]] = document
+        return documents
+
+    async def _persist(self, documents: Iterable[dict] = (), deleted: Iterable[Any] = ()):
+        # Serialize on the loop, so later in-memory changes can't leak into this write
+        rows = [(json_util.dumps(document["_id"]), json_util.dumps(document)) for document in documents]
+        ids = [(json_util.dumps(_id),) for _id in deleted]
+        if rows or ids:
+            await self._client.run(self._write, rows, ids)
+
+    def _write(self, rows: List[Tuple[str, str]], ids: List[Tuple[str]]):
+        # Runs on the I/O thread
+        connection = self._client.connection
+        connection.executemany(f'INSERT OR REPLACE INTO "{self._table}" (id, doc) VALUES (?, ?)', rows)
+        connection.executemany(f'DELETE FROM "{self._table}" WHERE id = ?', ids)
+        connection.commit()
+
+    def _index(self, document: dict):
+        for field, index in self._indexes.items():
+            value = get_path(document, field)
+            if isinstance(value, (str, int, float, ObjectId)):
+                index.setdefault(value, {})[document["_id"]] = None
+
+    def _unindex(self, document: dict):
+        for field, index in self._indexes.items():
+            ids = index.get(get_path(document, field))
+            if ids is not None:
+                ids.pop(document["_id"], None)
+
+    def _store(self, document: dict, previous: Optional[dict] = None):
+        if previous is not None:
+            self._unindex(previous)
+        self._documents[document["_id"]] = document
+        self._index(document)
+
+    def _find(self, query: dict) -> List[dict]:
+        # Equality on _id or on an indexed field narrows the candidates before matching
+        if "_id" in query and not isinstance(query["_id"], dict):
+            document = self._documents.get(query["_id"])
+            return [document] if document is not None and matches(document, query) else []
+        for field, index in self._indexes.items():
+            value = query.get(field, MISSING)
+            if isinstance(value, (str, int, float, ObjectId)):
+                candidates = (self._documents[_id] for _id in index.get(value, ()))
+                return [document for document in candidates if matches(document, query)]
+        return [document for document in self._documents.values() if matches(document, query)]
+
+    async def create_index(self, keys, **kwargs) -> str:
+        # Hash index on the leading field; range conditions and sorts still scan the candidates
+        await self._ready()
+        keys = normalize_sort(keys)
+        field = keys[0][0]
+        if field not in self._indexes:
+            index = self._indexes[field] = {}
+            for document in self._documents.values():
+                value = get_path(document, field)
+                if isinstance(value, (str, int, float, ObjectId)):
+                    index.setdefault(value, {})[document["_id"]] = None
+        return "_".join(f"{name}_{direction}" for name, direction in keys)
+
+    async def find_one(self, query: Optional[dict] = None, projection: Optional[dict] = None) -> Optional[dict]:
+        await self._ready()
+        found = self._find(query or {})
+        return project(found[0], projection) if found else None
+
+    def find(self, query: Optional[dict] = None, projection: Optional[dict] = None) -> LocalCursor:
+        return LocalCursor(self, query or {}, projection)
+
+    async def count_documents(self, query: dict) -> int:
+        await self._ready()
+        return len(self._find(query))
+
+    async def distinct(self, key: str, query: Optional[dict] = None) -> list:
+        await self._ready()
+        values = []
+        for document in self._find(query or {}):
+            value = get_path(document, key)
+            for item in (value if isinstance(value, list) else [value]):
+                if item is not MISSING and item not in values:
+                    values.append(item)
+        return values
+
+    def _insert(self, document: dict) -> dict:
+        document = copy.deepcopy(document)
+        document.setdefault("_id", ObjectId())
+        if document["_id"] in self._documents:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} _id: {document['_id']!r}", 11000)
+        self._store(document)
+        return document
+
+    async def insert_one(self, document: dict) -> InsertOneResult:
+        await self._ready()
+        inserted = self._insert(document)
+        # Motor sets the generated _id on the caller's document too
+        document["_id"] = inserted["_id"]
+        await self._persist([inserted])
+        return InsertOneResult(inserted["_id"], True)
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True) -> InsertManyResult:
+        await self._ready()
+        inserted, errors = [], []
+        for index, document in enumerate(documents):
+            try:
+                inserted.append(self._insert(document))
+                document["_id"] = inserted[-1]["_id"]
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        await self._persist(inserted)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted), "writeConcernErrors": [],
+                                  "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []})
+        return InsertManyResult([document["_id"] for document in inserted], True)
+
+    def _update(self, query: dict, update: dict, upsert: bool) -> Tuple[Optional[dict], Optional[dict], bool]:
+        # Returns (before, after, upserted); the caller persists after if it changed
+        found = self._find(query)
+        if found:
+            before = found[0]
+            after = copy.deepcopy(before)
+            apply_update(after, update)
+            self._store(after, before)
+            return before, after, False
+        if not upsert:
+            return None, None, False
+        after = upsert_seed(query)
+        apply_update(after, update, inserting=True)
+        after = self._insert(after)
+        return None, after, True
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        await self._ready()
+        before, after, upserted = self._update(query, update, upsert)
+        if after is not None and after != before:
+            await self._persist([after])
+        raw = {"n": 1 if after is not None else 0, "nModified": int(before is not None and before != after)}
+        if upserted:
+            raw["upserted"] = after["_id"]
+        return UpdateResult(raw, True)
+
+    async def replace_one(self, query: dict, replacement: dict, upsert: bool = False) -> UpdateResult:
+        await self._ready()
+        found = self._find(query)
+        if not found and not upsert:
+            return UpdateResult({"n": 0, "nModified": 0}, True)
+        # Like MongoDB, an upsert takes its _id from the filter when the replacement has none
+        _id = found[0]["_id"] if found else replacement.get("_id", upsert_seed(query).get("_id", ObjectId()))
+        document = {**copy.deepcopy(replacement), "_id": _id}
+        self._store(document, found[0] if found else None)
+        await self._persist([document])
+        raw = {"n": 1, "nModified": int(bool(found))}
+        if not found:
+            raw["upserted"] = document["_id"]
+        return UpdateResult(raw, True)
+
+    async def find_one_and_update(self, query: dict, update: dict, projection: Optional[dict] = None,
+                                  upsert: bool = False, return_document: bool = ReturnDocument.BEFORE) -> Optional[dict]:
+        await self._ready()
+        before, after, _ = self._update(query, update, upsert)
+        document = after if return_document == ReturnDocument.AFTER else before
+        result = project(document, projection) if document is not None else None
+        if after is not None and after != before:
+            await self._persist([after])
+        return result
+
+    async def bulk_write(self, requests: list, ordered: bool = True) -> BulkWriteResult:
+        # Supports the InsertOne and UpdateOne requests the services send; the
+        # whole batch is committed in one SQLite transaction
+        await self._ready()
+        result = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": [],
+                  "writeErrors": [], "writeConcernErrors": []}
+        changed: Dict[Any, dict] = {}
+        for index, request in enumerate(requests):
+            if isinstance(request, InsertOne):
+                try:
+                    inserted = self._insert(request._doc)
+                except DuplicateKeyError as e:
+                    result["writeErrors"].append({"index": index, "code": 11000, "errmsg": str(e), "op": request._doc})
+                    if ordered:
+                        break
+                    continue
+                request._doc["_id"] = inserted["_id"]
+                changed[inserted["_id"]] = inserted
+                result["nInserted"] += 1
+                continue
+            if not isinstance(request, UpdateOne):
+                raise ValueError(f"Unsupported bulk_write request {type(request).__name__}")
+            before, after, upserted = self._update(request._filter, request._doc, bool(request._upsert))
+            if after is not None and after != before:
+                changed[after["_id"]] = after
+            if upserted:
+                result["nUpserted"] += 1
+                result["upserted"].append({"index": index, "_id": after["_id"]})
+            elif after is not None:
+                result["nMatched"] += 1
+                result["nModified"] += int(before != after)
+        await self._persist(changed.values())
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    async def delete_one(self, query: dict) -> DeleteResult:
+        await self._ready()
+        return await self._delete(self._find(query)[:1])
+
+    async def delete_many(self, query: dict) -> DeleteResult:
+        await self._ready()
+        return await self._delete(self._find(query))
+
+    async def _delete(self, found: List[dict]) -> DeleteResult:
+        for document in found:
+            self._unindex(document)
+            del self._documents[document["_id"]]
+        await self._persist(deleted=[document["_id"] for document in found])
+        return DeleteResult({"n": len(found)}, True)
+
+
+class LocalDatabase:
+    def __init__(self, client: "LocalClient", name: str):
+        self.name = name
+        self._client = client
+        self._collections: Dict[str, LocalCollection] = {}
+
+    def __getitem__(self, name: str) -> LocalCollection:
+        if name not in self._collections:
+            self._collections[name] = LocalCollection(self._client, f"{self.name}.{name}")
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> LocalCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+class LocalClient:
+    """Embedded stand-in for AsyncIOMotorClient backed by one SQLite file.
+
+    Documents live in memory with an ``_id`` index and every write goes
+    through to SQLite, so restarts keep the data. Every collection is loaded
+    whole on first use, so this suits data sets that fit comfortably in RAM.
+    All SQLite calls run on one dedicated thread, which keeps reads and
+    commits off the event loop and keeps the connection on the thread that
+    opened it. Only one process should open a given file.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-store")
+        self.connection: sqlite3.Connection = self._io.submit(self._connect, path).result()
+        self._databases: Dict[str, LocalDatabase] = {}
+        self._closed = False
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    async def run(self, function, *args):
+        """Run ``function(*args)`` on the I/O thread, in submission order."""
+        return await asyncio.get_running_loop().run_in_executor(self._io, function, *args)
+
+    def __getitem__(self, name: str) -> LocalDatabase:
+        if name not in self._databases:
+            self._databases[name] = LocalDatabase(self, name)
+        return self._databases[name]
+
+    def close(self):
+        # Writes already submitted finish first; the executor runs jobs in order.
+        # Safe to call twice, like Motor's close().
+        if self._closed:
+            return
+        self._closed = True
+        self._io.submit(self.connection.close)
+        self._io.shutdown(wait=True)
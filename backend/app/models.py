@@ -1,6 +1,6 @@
 # Backend: app/models.py
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, field_validator
+from typing import Dict, List, Optional
 from datetime import datetime,date
 
 class SpendingEntry(BaseModel):
@@ -21,6 +21,93 @@ class UserProfile(BaseModel):
     spending_data: List[dict] = []
     spending_data: List[SpendingEntry] = []
     conversation_history: List[dict] = []
+    version: int = 0
+
+class AdvisorContext(BaseModel):
+    id: Optional[str] = None
+    name: str
+    age: Optional[int] = None
+    income: Optional[float] = None
+    savings: Optional[float] = None
+    debts: Optional[float] = None
+    investments: Optional[str] = None
+    financial_goals: List[str] = []
+
+class ProfileSummary(AdvisorContext):
+    # Listing view: profile fields without spending data or history
+    version: int = 0
+
+class ProfileUpdate(BaseModel):
+    # Partial update: only fields present in the request body are written
+    name: Optional[str] = None
+    age: Optional[int] = None
+    income: Optional[float] = None
+    savings: Optional[float] = None
+    debts: Optional[float] = None
+    investments: Optional[str] = None
+    financial_goals: Optional[List[str]] = None
+
+    @field_validator("name", "financial_goals")
+    @classmethod
+    def not_null(cls, value):
+        # Optional so they can be left out, but the stored fields can't be null
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+class SpendingAppendResult(BaseModel):
+    profile_id: str
+    appended: int
+    version: int
+
+class ProfilePage(BaseModel):
+    items: List[ProfileSummary]
+    total: int
+    offset: int
+    limit: int
+
+class ConversationTurn(BaseModel):
+    user: str
+    bot: str
+    timestamp: str
+
+class ConversationPage(BaseModel):
+    turns: List[ConversationTurn]
+    next_before: Optional[str] = None
+
+class ConversationMemory(BaseModel):
+    summary: str = ""
+    recent: List[ConversationTurn] = []
+
+class SpendingAnomaly(BaseModel):
+    date: str
+    category: str
+    amount: float
+    zscore: float
+
+class BurnRate(BaseModel):
+    month: str
+    spent: float
+    daily_rate: float
+    projected: float
+    budget: Optional[float] = None
+    budget_used_pct: Optional[float] = None
+    days_until_exhausted: Optional[float] = None
+
+class SpendingInsights(BaseModel):
+    entries: int
+    total: float
+    by_category: Dict[str, float] = {}
+    by_month: Dict[str, float] = {}
+    rolling_daily_average: Dict[str, float] = {}
+    anomalies: List[SpendingAnomaly] = []
+    burn_rate: Optional[BurnRate] = None
+
+class CohortStats(BaseModel):
+    profiles: int
+    entries: int
+    category_per_profile: Dict[str, Dict[str, float]] = {}
+    monthly_spend_per_profile: Dict[str, float] = {}
 
 class UserInput(BaseModel):
     message: str
@@ -36,3 +123,10 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: Optional[str] = None
+
+class User(BaseModel):
+    username: str
+    disabled: bool = False
+
+class UserInDB(User):
+    hashed_password: str
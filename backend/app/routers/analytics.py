@@ -0,0 +1,32 @@
+# Backend: app/routers/analytics.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+from app.models import SpendingInsights, CohortStats
+from app.services.analytics_service import AnalyticsService, spending_frame, compute_spending_insights, compute_cohort_stats
+from app.routers.profiles import profile_filters
+from app.dependencies import get_current_active_user
+
+router = APIRouter()
+
+@router.get("/analytics/spending/{profile_id}", response_model=SpendingInsights)
+async def spending_insights(
+    profile_id: str,
+    monthly_budget: Optional[float] = Query(None, gt=0, description="Defaults to a twelfth of the profile's income"),
+    window: int = Query(7, ge=1, le=90, description="Rolling average window in days"),
+    z_threshold: float = Query(3.0, gt=0),
+    current_user: dict = Depends(get_current_active_user),
+):
+    profile = await AnalyticsService.load_profile_spending(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if monthly_budget is None and profile.get("income"):
+        monthly_budget = profile["income"] / 12
+    # pandas work is CPU-bound, keep it off the event loop
+    frame = await run_in_threadpool(spending_frame, profile.get("spending_data", []))
+    return await run_in_threadpool(compute_spending_insights, frame, monthly_budget, window, z_threshold)
+
+@router.get("/analytics/cohort", response_model=CohortStats)
+async def cohort_stats(query: dict = Depends(profile_filters), current_user: dict = Depends(get_current_active_user)):
+    frame = await AnalyticsService.load_cohort_spending(query)
+    return await run_in_threadpool(compute_cohort_stats, frame)
@@ -1,16 +1,15 @@
 # Backend: app/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from app.config import settings
 from app.models import Token
+from app.services.auth_service import UserService, pwd_context
 from jose import jwt
-from passlib.context import CryptContext
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -20,13 +19,15 @@ def create_access_token(data: dict):
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    # Here you would typically authenticate against your user database
-    # For simplicity, we're using a hardcoded username and password
-    if form_data.username != "testuser" or form_data.password != "testpassword":
+    user = await UserService.get_user(form_data.username)
+    # bcrypt is deliberately slow; verify in a worker thread so the event loop keeps serving
+    if user is None or user.disabled or not await run_in_threadpool(
+        pwd_context.verify, form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(data={"sub": form_data.username})
+    access_token = create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
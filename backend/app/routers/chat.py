@@ -1,30 +1,113 @@
 # Backend: app/routers/chat.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from app.models import UserInput, BotResponse
-from app.services.ai_service import AIService
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+import asyncio
+import json
+from typing import Optional
+from fastapi.responses import StreamingResponse
+from app.models import UserInput, BotResponse, ConversationPage
+from app.services.ai_service import AIService, format_server_timing
 from app.services.profile_service import ProfileService
+from app.services.memory_service import MemoryService
+from app.services.openai_service import LLMTimeoutError
+from app.services.llm_scheduler import SchedulerOverloaded, llm_scheduler
 from app.dependencies import get_current_active_user
 from datetime import datetime  # Add this import
 
 router = APIRouter()
 
+def overloaded(e: SchedulerOverloaded) -> HTTPException:
+    return HTTPException(status_code=429, detail="AI advisor is busy, please try again shortly",
+                         headers={"Retry-After": str(e.retry_after)})
+
 @router.post("/chat/{profile_id}", response_model=BotResponse)
-async def chat(profile_id: str, user_input: UserInput, current_user: dict = Depends(get_current_active_user)):
-    profile = await ProfileService.get_profile(profile_id)
+async def chat(profile_id: str, user_input: UserInput, response: Response, current_user: dict = Depends(get_current_active_user)):
+    profile, memory = await asyncio.gather(
+        ProfileService.get_advisor_context(profile_id),
+        MemoryService.get_memory(profile_id),
+    )
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    ai_response, sentiment, confidence = await AIService.process_user_input(profile, user_input)
+    timings = {}
+    try:
+        ai_response, sentiment, confidence = await AIService.process_user_input(profile, user_input, timings, memory)
+    except LLMTimeoutError:
+        raise HTTPException(status_code=504, detail="AI advisor timed out, please try again")
+    except SchedulerOverloaded as e:
+        raise overloaded(e)
     
     timestamp = datetime.now().isoformat()
     await ProfileService.save_conversation(profile_id, user_input.message, ai_response, timestamp)
+    response.headers["Server-Timing"] = format_server_timing(timings)
     
     return BotResponse(message=ai_response, sentiment=sentiment, confidence=confidence)
 
-@router.get("/conversation_history/{profile_id}")
-async def get_conversation_history(profile_id: str, current_user: dict = Depends(get_current_active_user)):
-    profile = await ProfileService.get_profile(profile_id)
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/chat/{profile_id}/stream")
+async def chat_stream(profile_id: str, user_input: UserInput, current_user: dict = Depends(get_current_active_user)):
+    # Server-sent events: "token" events as the reply is generated, then one
+    # "sentiment" event. The turn is then saved and a final "saved" event
+    # confirms it, so clients know when the stored history includes it.
+    profile, memory = await asyncio.gather(
+        ProfileService.get_advisor_context(profile_id),
+        MemoryService.get_memory(profile_id),
+    )
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return profile.conversation_history
+    timings = {}
+    routed = await AIService.route_message(profile, user_input, timings, memory)
+    # Only LLM-bound requests can be shed: before the 200 goes out here, or
+    # with an error event if the queue sheds them later. Local answers and
+    # cache hits always stream.
+    if routed[1] is None:
+        try:
+            llm_scheduler.check_admission(profile_id, "interactive")
+        except SchedulerOverloaded as e:
+            raise overloaded(e)
+
+    async def events():
+        tokens = []
+        try:
+            async for event, data in AIService.stream_user_input(profile, user_input, timings, memory=memory,
+                                                                 routed=routed):
+                if event == "token":
+                    tokens.append(data["text"])
+                yield format_sse(event, data)
+        except LLMTimeoutError:
+            yield format_sse("error", {"detail": "AI advisor timed out, please try again"})
+            return
+        except SchedulerOverloaded as e:
+            yield format_sse("error", {"detail": "AI advisor is busy, please try again shortly",
+                                       "retry_after": e.retry_after})
+            return
+        if not tokens:
+            return
+        timestamp = datetime.now().isoformat()
+        # Shielded so a client that disconnects now doesn't lose the turn
+        await asyncio.shield(
+            ProfileService.save_conversation(profile_id, user_input.message, "".join(tokens).strip(), timestamp)
+        )
+        yield format_sse("saved", {"timestamp": timestamp})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/conversation_history/{profile_id}", response_model=ConversationPage)
+async def get_conversation_history(
+    profile_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = Query(None, description="Return turns older than this cursor (next_before of the previous page)"),
+    current_user: dict = Depends(get_current_active_user),
+):
+    if not await ProfileService.profile_exists(profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    try:
+        return await ProfileService.get_conversation_page(profile_id, limit, before)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
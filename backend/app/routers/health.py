@@ -0,0 +1,31 @@
+# Backend: app/routers/health.py
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.database import database
+from app.services.openai_service import llm_backend
+from app.services.sentiment_service import sentiment_engine
+
+router = APIRouter()
+
+@router.get("/health/live")
+async def liveness():
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+async def readiness():
+    components = {
+        "database": database.client is not None,
+        "llm_client": llm_backend.ready,
+        "sentiment_model": sentiment_engine.ready,
+    }
+    # Without startup warm-up the models load on first use, so only the
+    # database gates readiness.
+    if settings.WARM_UP_ON_STARTUP:
+        ready = all(components.values())
+    else:
+        ready = components["database"]
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "components": components},
+    )
@@ -0,0 +1,83 @@
+# Backend: app/routers/metrics.py
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import PlainTextResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from app.config import settings
+from app.dependencies import get_current_active_user
+from app.instrumentation import profile_store
+from app.services.response_cache import response_cache
+from app.services.profile_cache import profile_cache
+from app.services.intent_router import intent_router
+from app.services.llm_scheduler import llm_scheduler
+
+router = APIRouter()
+
+# Cache, router and scheduler internals and profiler stacks are for logged-in users only
+AUTHENTICATED = [Depends(get_current_active_user)]
+
+
+def scrape_token(authorization: Optional[str] = Header(None)):
+    # Prometheus can't log in, so scrapes present a static bearer token when one is configured
+    expected = settings.METRICS_BEARER_TOKEN
+    if expected and not hmac.compare_digest(authorization or "", f"Bearer {expected}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+class CacheCollector:
+    # Reads the caches' own counters at scrape time instead of duplicating them
+    caches = {"response": response_cache.snapshot, "profile": profile_cache.snapshot}
+
+    def collect(self):
+        counters = {
+            name: CounterMetricFamily(f"cache_{name}", f"Cache {name} by cache", labels=["cache"])
+            for name in ("hits", "misses", "evictions")
+        }
+        entries = GaugeMetricFamily("cache_entries", "Entries currently cached", labels=["cache"])
+        for cache, snapshot in self.caches.items():
+            stats = snapshot()
+            for name, family in counters.items():
+                family.add_metric([cache], stats.get(name, 0))
+            entries.add_metric([cache], stats.get("entries", 0))
+        yield from counters.values()
+        yield entries
+
+
+REGISTRY.register(CacheCollector())
+
+
+@router.get("/metrics", dependencies=[Depends(scrape_token)])
+async def prometheus_metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/metrics/response_cache", dependencies=AUTHENTICATED)
+async def response_cache_metrics():
+    return response_cache.snapshot()
+
+
+@router.get("/metrics/profile_cache", dependencies=AUTHENTICATED)
+async def profile_cache_metrics():
+    return profile_cache.snapshot()
+
+
+@router.get("/metrics/intent_router", dependencies=AUTHENTICATED)
+async def intent_router_metrics():
+    return intent_router.snapshot()
+
+
+@router.get("/metrics/llm_scheduler", dependencies=AUTHENTICATED)
+async def llm_scheduler_metrics():
+    return llm_scheduler.snapshot()
+
+
+@router.get("/metrics/request_profiles/{profile_id}", response_class=PlainTextResponse, dependencies=AUTHENTICATED)
+async def request_profile(profile_id: str):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
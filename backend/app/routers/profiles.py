@@ -1,9 +1,12 @@
 # app/routers/profiles.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from app.models import UserProfile
-from app.services.profile_service import ProfileService
+import secrets
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
+from app.models import UserProfile, ProfileSummary, ProfilePage, ProfileUpdate, SpendingEntry, SpendingAppendResult
+from app.services.profile_service import ProfileService, VersionConflictError, build_profile_filter, build_profile_sort
+from app.services.synthetic_data import seed_database
 from app.dependencies import get_current_active_user
 
 router = APIRouter()
@@ -19,21 +22,118 @@ async def get_profile(profile_id: str, current_user: dict = Depends(get_current_
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
 
+VERSION_QUERY = Query(None, ge=0, description="Only write if the profile is still at this version (409 otherwise)")
+
 @router.put("/update_profile/{profile_id}", response_model=UserProfile)
-async def update_profile(profile_id: str, profile: UserProfile, current_user: dict = Depends(get_current_active_user)):
-    existing_profile = await ProfileService.get_profile(profile_id)
-    if not existing_profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
+async def update_profile(profile_id: str, profile: UserProfile, expected_version: Optional[int] = VERSION_QUERY,
+                         current_user: dict = Depends(get_current_active_user)):
     profile.id = profile_id
-    updated_profile = await ProfileService.update_profile(profile)
+    try:
+        updated_profile = await ProfileService.update_profile(profile, expected_version)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not updated_profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
     return updated_profile
 
-@router.get("/get_all_profiles", response_model=List[UserProfile])
+@router.patch("/profiles/{profile_id}", response_model=ProfileSummary)
+async def patch_profile(profile_id: str, changes: ProfileUpdate, expected_version: Optional[int] = VERSION_QUERY,
+                        current_user: dict = Depends(get_current_active_user)):
+    try:
+        profile = await ProfileService.patch_profile(profile_id, changes, expected_version)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+@router.post("/profiles/{profile_id}/spending", response_model=SpendingAppendResult)
+async def append_spending(profile_id: str, entries: List[SpendingEntry] = Body(..., min_length=1),
+                          expected_version: Optional[int] = VERSION_QUERY,
+                          current_user: dict = Depends(get_current_active_user)):
+    try:
+        version = await ProfileService.append_spending(profile_id, entries, expected_version)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return SpendingAppendResult(profile_id=profile_id, appended=len(entries), version=version)
+
+@router.post("/profiles/spending/bulk")
+async def append_spending_bulk(entries_by_profile: Dict[str, List[SpendingEntry]],
+                               current_user: dict = Depends(get_current_active_user)):
+    return await ProfileService.append_spending_bulk(entries_by_profile)
+
+@router.get("/get_all_profiles", response_model=List[UserProfile], deprecated=True)
 async def get_all_profiles(current_user: dict = Depends(get_current_active_user)):
     profiles = await ProfileService.get_all_profiles()
     return profiles
 
+def profile_filters(
+    name: Optional[str] = Query(None, description="Case-insensitive name prefix"),
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    min_income: Optional[float] = None,
+    max_income: Optional[float] = None,
+) -> dict:
+    return build_profile_filter(name, min_age, max_age, min_income, max_income)
+
+def profile_sort(sort: str = Query("name", description="name, age, income, savings or debts; prefix with - for descending")) -> str:
+    try:
+        build_profile_sort(sort)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return sort
+
+@router.get("/profiles", response_model=ProfilePage)
+async def list_profiles(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    query: dict = Depends(profile_filters),
+    sort: str = Depends(profile_sort),
+    current_user: dict = Depends(get_current_active_user),
+):
+    return await ProfileService.list_profiles(query, sort, offset, limit)
+
+@router.get("/profiles/export")
+async def export_profiles(
+    query: dict = Depends(profile_filters),
+    sort: str = Depends(profile_sort),
+    current_user: dict = Depends(get_current_active_user),
+):
+    # One JSON profile summary per line, streamed straight from the cursor
+    async def lines():
+        async for profile in ProfileService.iter_profiles(query, sort):
+            yield profile.json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.post("/generate_spending_data/{profile_id}")
 async def generate_spending_data(profile_id: str, num_entries: int = 30, current_user: dict = Depends(get_current_active_user)):
-    await ProfileService.generate_synthetic_spending_data(profile_id, num_entries)
-    return {"message": f"Generated {num_entries} synthetic spending entries for profile {profile_id}"}
\ No newline at end of file
+    generated = await ProfileService.generate_synthetic_spending_data(profile_id, num_entries)
+    if generated is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    entries, version = generated
+    # The new entries are returned so clients can update their copy without refetching the profile
+    return {
+        "message": f"Replaced spending data for profile {profile_id} with {num_entries} synthetic entries",
+        "entries": [entry.dict() for entry in entries],
+        "version": version,
+    }
+
+@router.post("/generate_bulk_data")
+async def generate_bulk_data(
+    num_profiles: int = Query(100, ge=1, le=100_000),
+    entries_per_profile: int = Query(100, ge=0, le=10_000),
+    turns_per_profile: int = Query(0, ge=0, le=1_000),
+    seed: Optional[int] = Query(None, ge=0, description="Reuse a seed to reproduce a run; omit for new profiles"),
+    current_user: dict = Depends(get_current_active_user),
+):
+    # Profile ids come from the seed, so a fixed default would regenerate the same ids every call
+    if seed is None:
+        seed = secrets.randbits(32)
+    stats = await seed_database(num_profiles, entries_per_profile, turns_per_profile, seed)
+    message = f"Generated {stats['profiles']} synthetic profiles"
+    if stats["skipped_profiles"]:
+        message += f", skipped {stats['skipped_profiles']} that already exist"
+    return {"message": message, "seed": seed, **stats}
@@ -1,11 +1,157 @@
 # Backend: app/services/ai_service.py
-from app.models import UserProfile, UserInput
-from app.services.openai_service import generate_ai_response
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import AsyncIterator, Awaitable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.models import AdvisorContext, ConversationMemory, UserInput
+from app.services.intent_router import Route, intent_router
+from app.services.llm_scheduler import llm_scheduler
+from app.services.openai_service import generate_ai_response, generate_ai_response_stream, request_tokens
 from app.services.sentiment_service import analyze_sentiment
+from app.services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+NEUTRAL_SENTIMENT = ("NEUTRAL", 0.0)
+
+
+async def timed(stage: str, awaitable: Awaitable, timings: Dict[str, float]):
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = (time.perf_counter() - start) * 1000
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={duration:.1f}" for stage, duration in timings.items())
+
+
+async def sentiment_stage(message: str, timings: Dict[str, float]) -> Tuple[str, float]:
+    # Creates the coroutine inside the task, so a task cancelled before it
+    # starts (e.g. a shed request) leaves no never-awaited coroutine behind
+    return await timed("sentiment", analyze_sentiment(message), timings)
+
+
+async def sentiment_or_neutral(sentiment_task: asyncio.Task) -> Tuple[str, float]:
+    try:
+        return await asyncio.wait_for(sentiment_task, settings.SENTIMENT_TIMEOUT)
+    except Exception:
+        logger.warning("Sentiment analysis failed, falling back to neutral", exc_info=True)
+        return NEUTRAL_SENTIMENT
+
+
+def memory_digest(memory: Optional[ConversationMemory]) -> str:
+    # The memory is part of the prompt, so it is part of the cache key; empty memory gives ""
+    if memory is None or (not memory.summary and not memory.recent):
+        return ""
+    return hashlib.sha1(json.dumps(memory.dict(), sort_keys=True).encode()).hexdigest()
+
+
+def cached_response(profile: AdvisorContext, user_input: UserInput,
+                    memory: Optional[ConversationMemory] = None) -> Optional[str]:
+    # Entries are per profile, since replies name the client and quote their
+    # figures, and per conversation memory, since follow-ups depend on it.
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    return response_cache.get(user_input.message, profile, memory_digest(memory))
+
+
+def cache_response(profile: AdvisorContext, user_input: UserInput, ai_response: str, generation_ms: float,
+                   memory: Optional[ConversationMemory] = None):
+    if settings.RESPONSE_CACHE_ENABLED and ai_response:
+        response_cache.put(user_input.message, profile, ai_response, generation_ms, memory_digest(memory))
+
+
+async def ready_response(route: Route, profile: AdvisorContext, user_input: UserInput,
+                         timings: Dict[str, float], memory: Optional[ConversationMemory] = None) -> Optional[str]:
+    # A reply that needs no LLM call: answered from profile data, or cached
+    if route.direct:
+        answer = await timed("local_answer", intent_router.answer(route, profile, user_input.message), timings)
+        if answer is not None:
+            intent_router.record(route, "local")
+            return answer
+    answer = cached_response(profile, user_input, memory)
+    if answer is not None:
+        intent_router.record(route, "cache")
+    return answer
+
 
 class AIService:
     @staticmethod
-    async def process_user_input(profile: UserProfile, user_input: UserInput):
-        ai_response = generate_ai_response(profile, user_input.message)
-        sentiment, confidence = analyze_sentiment(user_input.message)
-        return ai_response, sentiment, confidence
\ No newline at end of file
+    async def route_message(profile: AdvisorContext, user_input: UserInput, timings: Optional[Dict[str, float]] = None,
+                            memory: Optional[ConversationMemory] = None) -> Tuple[Route, Optional[str]]:
+        """Route a message; the reply is set when it needs no LLM call (a local answer or cache hit)."""
+        timings = {} if timings is None else timings
+        route = intent_router.route(user_input.message)
+        return route, await ready_response(route, profile, user_input, timings, memory)
+
+    @staticmethod
+    async def process_user_input(profile: AdvisorContext, user_input: UserInput, timings: Optional[Dict[str, float]] = None,
+                                 memory: Optional[ConversationMemory] = None, priority: str = "standard"):
+        # Generation and sentiment are independent, so they run side by side.
+        # Stage durations (ms) are written into ``timings`` when provided.
+        # Raises SchedulerOverloaded when the LLM queue sheds the request.
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+        sentiment_task = asyncio.create_task(sentiment_stage(user_input.message, timings))
+        try:
+            route = intent_router.route(user_input.message)
+            ai_response = await ready_response(route, profile, user_input, timings, memory)
+            if ai_response is None:
+                intent_router.record(route, "llm")
+                tokens = request_tokens(profile, user_input.message, memory, route.intent)
+                async with llm_scheduler.slot(profile.id, priority, tokens) as ticket:
+                    timings["queue"] = ticket.wait * 1000
+                    ai_response = await timed("llm", generate_ai_response(profile, user_input.message, memory,
+                                                                          route.intent), timings)
+                cache_response(profile, user_input, ai_response, timings["llm"], memory)
+        except BaseException:
+            sentiment_task.cancel()
+            raise
+
+        sentiment, confidence = await sentiment_or_neutral(sentiment_task)
+
+        timings["total"] = (time.perf_counter() - start) * 1000
+        logger.info("process_user_input stages: %s", format_server_timing(timings))
+        return ai_response, sentiment, confidence
+
+    @staticmethod
+    async def stream_user_input(profile: AdvisorContext, user_input: UserInput, timings: Optional[Dict[str, float]] = None,
+                                memory: Optional[ConversationMemory] = None, priority: str = "interactive",
+                                routed: Optional[Tuple[Route, Optional[str]]] = None) -> AsyncIterator[Tuple[str, dict]]:
+        # Yields ("token", {"text": ...}) events as the completion streams in,
+        # then a single ("sentiment", {...}) event. ``routed`` is the result of
+        # route_message() when the caller has already routed the message.
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+        sentiment_task = asyncio.create_task(sentiment_stage(user_input.message, timings))
+        try:
+            route, cached = routed or await AIService.route_message(profile, user_input, timings, memory)
+            if cached is not None:
+                yield "token", {"text": cached}
+            else:
+                intent_router.record(route, "llm")
+                tokens = []
+                budget = request_tokens(profile, user_input.message, memory, route.intent)
+                async with llm_scheduler.slot(profile.id, priority, budget) as ticket:
+                    timings["queue"] = ticket.wait * 1000
+                    async for token in generate_ai_response_stream(profile, user_input.message, memory, route.intent):
+                        if "first_token" not in timings:
+                            timings["first_token"] = (time.perf_counter() - start) * 1000
+                        tokens.append(token)
+                        yield "token", {"text": token}
+                timings["llm"] = (time.perf_counter() - start) * 1000
+                cache_response(profile, user_input, "".join(tokens).strip(), timings["llm"], memory)
+        except BaseException:
+            sentiment_task.cancel()
+            raise
+
+        sentiment, confidence = await sentiment_or_neutral(sentiment_task)
+        timings["total"] = (time.perf_counter() - start) * 1000
+        logger.info("stream_user_input stages: %s", format_server_timing(timings))
+        yield "sentiment", {"sentiment": sentiment, "confidence": confidence}
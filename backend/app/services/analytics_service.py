@@ -0,0 +1,138 @@
+# Backend: app/services/analytics_service.py
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from app.database import database
+from app.models import BurnRate, CohortStats, SpendingAnomaly, SpendingInsights
+
+ROLLING_OUTPUT_DAYS = 90
+MAX_ANOMALIES = 50
+
+
+def as_categorical(values: List) -> pd.Categorical:
+    # factorize is several times faster than Categorical(list) for large inputs
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), sort=True)
+    return pd.Categorical.from_codes(codes, uniques)
+
+
+def parse_dates(values: List[str]) -> np.ndarray:
+    # Spending dates repeat heavily, so parse each distinct string once
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    parsed = pd.to_datetime(uniques, errors="coerce").values
+    return np.where(codes >= 0, parsed[codes], np.datetime64("NaT"))
+
+
+def spending_frame(entries: Iterable[dict], profile_ids: Optional[List[str]] = None) -> pd.DataFrame:
+    """Columnar view of SpendingEntry dicts.
+
+    Columns: date, day and month (datetime64 truncated once up front so the
+    aggregations group on plain integers), category, amount and optionally
+    profile_id.
+    """
+    entries = list(entries)
+    dates = parse_dates([entry["date"] for entry in entries])
+    frame = pd.DataFrame({
+        "date": dates,
+        "day": dates.astype("datetime64[D]").astype("datetime64[s]"),
+        "month": dates.astype("datetime64[M]").astype("datetime64[s]"),
+        "category": as_categorical([entry["category"] for entry in entries]),
+        "amount": np.fromiter((entry["amount"] for entry in entries), dtype=np.float64, count=len(entries)),
+    })
+    if profile_ids is not None:
+        frame["profile_id"] = as_categorical(profile_ids)
+    return frame.dropna(subset=["date"])
+
+
+def flag_anomalies(frame: pd.DataFrame, z_threshold: float) -> pd.DataFrame:
+    # Per-category z-score of each entry's amount
+    grouped = frame.groupby("category", observed=True)["amount"]
+    std = grouped.transform("std").replace(0, np.nan)
+    zscore = ((frame["amount"] - grouped.transform("mean")) / std).fillna(0.0)
+    flagged = frame.assign(zscore=zscore)[zscore.abs() >= z_threshold]
+    return flagged.reindex(flagged["zscore"].abs().sort_values(ascending=False).index)
+
+
+def burn_rate(frame: pd.DataFrame, monthly_budget: Optional[float]) -> BurnRate:
+    # Measured over the latest month that has data
+    last_date = frame["date"].max()
+    month = last_date.to_period("M")
+    spent = float(frame["amount"].values[frame["month"].values == frame["month"].values.max()].sum())
+    daily_rate = spent / last_date.day
+    projected = daily_rate * month.days_in_month
+    result = BurnRate(month=str(month), spent=round(spent, 2), daily_rate=round(daily_rate, 2), projected=round(projected, 2))
+    if monthly_budget:
+        result.budget = monthly_budget
+        result.budget_used_pct = round(100 * spent / monthly_budget, 1)
+        remaining = monthly_budget - spent
+        result.days_until_exhausted = round(max(remaining, 0) / daily_rate, 1) if daily_rate else None
+    return result
+
+
+def compute_spending_insights(frame: pd.DataFrame, monthly_budget: Optional[float] = None,
+                              window: int = 7, z_threshold: float = 3.0) -> SpendingInsights:
+    if frame.empty:
+        return SpendingInsights(entries=0, total=0.0)
+
+    by_category = frame.groupby("category", observed=True)["amount"].sum().round(2)
+    by_month = frame.groupby("month")["amount"].sum().round(2)
+    daily = frame.groupby("day")["amount"].sum().asfreq("D", fill_value=0.0)
+    rolling = daily.rolling(window, min_periods=1).mean().tail(ROLLING_OUTPUT_DAYS).round(2)
+    anomalies = flag_anomalies(frame, z_threshold).head(MAX_ANOMALIES)
+
+    return SpendingInsights(
+        entries=len(frame),
+        total=round(float(frame["amount"].sum()), 2),
+        by_category={str(k): float(v) for k, v in by_category.items()},
+        by_month={k.strftime("%Y-%m"): float(v) for k, v in by_month.items()},
+        rolling_daily_average={k.date().isoformat(): float(v) for k, v in rolling.items()},
+        anomalies=[
+            SpendingAnomaly(date=row.date.date().isoformat(), category=str(row.category),
+                            amount=float(row.amount), zscore=round(float(row.zscore), 2))
+            for row in anomalies.itertuples(index=False)
+        ],
+        burn_rate=burn_rate(frame, monthly_budget),
+    )
+
+
+def compute_cohort_stats(frame: pd.DataFrame) -> CohortStats:
+    if frame.empty:
+        return CohortStats(profiles=0, entries=0)
+
+    per_profile = frame.groupby(["profile_id", "category"], observed=True)["amount"].sum().unstack(fill_value=0.0)
+    category_stats = per_profile.agg(["mean", "median", lambda column: column.quantile(0.9)])
+    category_stats.index = ["mean", "median", "p90"]
+
+    monthly = frame.groupby(["profile_id", "month"], observed=True)["amount"].sum()
+    monthly_per_profile = monthly.groupby(level="profile_id", observed=True).mean()
+
+    return CohortStats(
+        profiles=len(per_profile),
+        entries=len(frame),
+        category_per_profile={
+            str(category): {stat: round(float(value), 2) for stat, value in column.items()}
+            for category, column in category_stats.items()
+        },
+        monthly_spend_per_profile={
+            "mean": round(float(monthly_per_profile.mean()), 2),
+            "median": round(float(monthly_per_profile.median()), 2),
+            "p90": round(float(monthly_per_profile.quantile(0.9)), 2),
+        },
+    )
+
+
+class AnalyticsService:
+    @staticmethod
+    async def load_profile_spending(profile_id: str) -> Optional[dict]:
+        return await database.db.profiles.find_one({"_id": profile_id}, {"spending_data": 1, "income": 1})
+
+    @staticmethod
+    async def load_cohort_spending(query: dict) -> pd.DataFrame:
+        profile_ids: List[str] = []
+        entries: List[dict] = []
+        cursor = database.db.profiles.find({**query, "spending_data.0": {"$exists": True}}, {"spending_data": 1})
+        async for profile in cursor:
+            spending = profile["spending_data"]
+            entries.extend(spending)
+            profile_ids.extend([str(profile["_id"])] * len(spending))
+        return spending_frame(entries, profile_ids)
@@ -0,0 +1,125 @@
+# Backend: app/services/auth_service.py
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+from app.config import settings
+from app.database import database
+from app.instrumentation import instrumented
+from app.models import UserInDB
+from app.services.profile_cache import AsyncTTLCache
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Demo login, created on startup only with CREATE_DEMO_USER (local development)
+DEFAULT_USERNAME = "testuser"
+DEFAULT_PASSWORD = "testpassword"
+
+
+class TokenCache:
+    """Verified JWTs keyed by the SHA-256 digest of the raw token.
+
+    An entry is only served until the token's ``exp``, so caching never
+    extends a token's lifetime. Tokens without ``exp`` are not cached.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, token: str, username: str, expires_at: float):
+        key = self._key(token)
+        self._entries[key] = (expires_at, username)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+
+token_cache = TokenCache(max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES)
+user_cache = AsyncTTLCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+
+@instrumented("auth.verify_token")
+def verify_access_token(token: str) -> Optional[str]:
+    """Return the token's subject, or None if the token is invalid or expired."""
+    username = token_cache.get(token)
+    if username is not None:
+        return username
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    username = payload.get("sub")
+    if username is None:
+        return None
+    if isinstance(payload.get("exp"), (int, float)):
+        token_cache.put(token, username, payload["exp"])
+    return username
+
+
+class UserService:
+    @staticmethod
+    async def get_user(username: str) -> Optional[UserInDB]:
+        # Every authenticated request checks the disabled flag, so serve it from memory
+        return await user_cache.get_or_load(username, "user", lambda: UserService.load_user(username))
+
+    @staticmethod
+    async def load_user(username: str) -> Optional[UserInDB]:
+        user = await database.db.users.find_one({"_id": username})
+        if user:
+            user["username"] = user.pop("_id")
+            return UserInDB(**user)
+        return None
+
+    @staticmethod
+    async def create_user(username: str, password: str, disabled: bool = False) -> UserInDB:
+        hashed_password = await run_in_threadpool(pwd_context.hash, password)
+        await database.db.users.insert_one({"_id": username, "hashed_password": hashed_password, "disabled": disabled})
+        user_cache.invalidate(username, ("user",))
+        return UserInDB(username=username, hashed_password=hashed_password, disabled=disabled)
+
+    @staticmethod
+    async def set_disabled(username: str, disabled: bool) -> bool:
+        result = await database.db.users.update_one({"_id": username}, {"$set": {"disabled": disabled}})
+        user_cache.invalidate(username, ("user",))
+        return result.matched_count > 0
+
+    @staticmethod
+    async def ensure_default_user():
+        if await UserService.load_user(DEFAULT_USERNAME) is not None:
+            return
+        hashed_password = await run_in_threadpool(pwd_context.hash, DEFAULT_PASSWORD)
+        # Upsert so several workers starting at once don't collide
+        await database.db.users.update_one(
+            {"_id": DEFAULT_USERNAME},
+            {"$setOnInsert": {"hashed_password": hashed_password, "disabled": False}},
+            upsert=True,
+        )
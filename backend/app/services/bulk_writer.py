@@ -0,0 +1,120 @@
+# Backend: app/services/bulk_writer.py
+import asyncio
+from typing import List, Optional, Tuple
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+from app.config import settings
+from app.database import database
+
+
+def as_write_error(error: dict) -> WriteError:
+    # What the single-document call would have raised for one bulk write error
+    return (DuplicateKeyError if error["code"] == 11000 else WriteError)(error["errmsg"], error["code"], error)
+
+
+class BulkWriter:
+    """Coalesces single-document writes to one collection into ``bulk_write`` calls.
+
+    Callers still await their own write: ``insert`` and ``update`` return once
+    the batch holding them has been acknowledged, and a write error is raised
+    only for the operation that caused it. A batch goes out as soon as the
+    previous one finishes, so an idle writer adds no latency. Under load,
+    everything queued behind a flush is sent in the next one.
+    ``max_wait`` can hold a batch open a little longer to make it bigger.
+    """
+
+    def __init__(self, collection: str, max_batch_size: int = 500, max_wait: float = 0.0, enabled: bool = True):
+        self.collection = collection
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"operations": 0, "batches": 0}
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _submit(self, operation):
+        if not self.enabled:
+            try:
+                await database.db[self.collection].bulk_write([operation], ordered=False)
+            except BulkWriteError as e:
+                if not e.details["writeErrors"]:
+                    raise
+                raise as_write_error(e.details["writeErrors"][0]) from e
+            return
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((operation, future))
+        await future
+
+    async def insert(self, document: dict):
+        await self._submit(InsertOne(document))
+
+    async def update(self, query: dict, update: dict, upsert: bool = False):
+        await self._submit(UpdateOne(query, update, upsert=upsert))
+
+    async def _collect_batch(self) -> List[Tuple]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: List[Tuple]):
+        errors = {}
+        try:
+            await database.db[self.collection].bulk_write([operation for operation, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            errors = {error["index"]: as_write_error(error) for error in e.details["writeErrors"]}
+            if not errors:
+                errors = {index: e for index in range(len(batch))}
+        except Exception as e:
+            errors = {index: e for index in range(len(batch))}
+        self.stats["operations"] += len(batch)
+        self.stats["batches"] += 1
+        for index, (_, future) in enumerate(batch):
+            self._queue.task_done()
+            if future.done():
+                continue
+            if index in errors:
+                future.set_exception(errors[index])
+            else:
+                future.set_result(None)
+
+    async def _run(self):
+        while True:
+            await self._flush(await self._collect_batch())
+
+    async def close(self):
+        # Wait for queued and in-flight writes, then stop the worker
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            await self._queue.join()
+        self._worker.cancel()
+        self._worker = None
+
+
+conversation_writer = BulkWriter(
+    "conversations",
+    max_batch_size=settings.BULK_WRITE_MAX_BATCH_SIZE,
+    max_wait=settings.BULK_WRITE_MAX_WAIT_MS / 1000,
+    enabled=settings.BULK_WRITE_ENABLED,
+)
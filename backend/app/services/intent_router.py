@@ -0,0 +1,273 @@
+# Backend: app/services/intent_router.py
+import re
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.instrumentation import INTENT_ROUTES
+from app.models import AdvisorContext
+from app.services.analytics_service import AnalyticsService
+from app.services.response_cache import normalize_message
+
+INTENTS = ("spending", "saving", "debt", "investment", "small_talk", "general")
+
+# Keyword -> intent. Bigrams are matched too, so phrases can be listed as-is.
+KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "spending": (
+        "spend", "spent", "spending", "expense", "expenses", "bought", "buy", "buying", "purchase", "purchases",
+        "shopping", "grocery", "groceries", "bill", "bills", "budget", "budgeting", "cost", "costs", "paid",
+        "utilities", "dining", "restaurant", "restaurants", "transaction", "transactions", "monthly costs",
+    ),
+    "saving": (
+        "save", "saving", "savings", "saved", "emergency fund", "rainy day", "retire", "retirement", "pension",
+        "nest egg", "deposit", "deposits", "cash buffer",
+    ),
+    "debt": (
+        "debt", "debts", "loan", "loans", "owe", "owed", "owing", "mortgage", "credit card", "credit cards",
+        "interest rate", "repay", "repayment", "pay off", "payoff", "borrow", "borrowed", "lender", "apr",
+    ),
+    "investment": (
+        "invest", "investing", "investment", "investments", "stock", "stocks", "shares", "bond", "bonds",
+        "portfolio", "mutual fund", "index fund", "etf", "etfs", "dividend", "dividends", "annuity", "annuities",
+        "market", "returns",
+    ),
+    "small_talk": (
+        "hi", "hello", "hey", "thanks", "thank you", "thx", "bye", "goodbye", "good morning",
+        "good afternoon", "good evening", "how are you", "cheers",
+    ),
+}
+KEYWORD_INTENTS: Dict[str, str] = {keyword: intent for intent, keywords in KEYWORDS.items() for keyword in keywords}
+# Words that may accompany a greeting or thanks without making it more than
+# small talk ("thanks a lot", "hi there", "bye for now", "see you later")
+SMALL_TALK_FILLER = frozenset((
+    "a", "again", "all", "and", "day", "dear", "everyone", "for", "great", "have", "later", "lot", "much", "nice",
+    "now", "oh", "ok", "okay", "see", "so", "soon", "there", "today", "too", "very", "well", "you",
+))
+SMALL_TALK_PHRASES = frozenset(KEYWORDS["small_talk"])
+
+# Direct profile lookups: the whole message must be one of these questions
+# about a stored figure. Anything else, even about the same field ("what is
+# the interest rate on my mortgage", "what is my savings goal"), goes to the LLM.
+ASK = r"(?:please )?(?:show|show me|tell me|give me|list|what s|whats|what is|what are|what was|what were)"
+PERIOD = r"(?: (?:in |for |during )?(?:this|last|previous) (?:month|year))?"
+DIRECT_QUERIES: Dict[str, "re.Pattern[str]"] = {
+    "spending": re.compile(
+        rf"(?:{ASK} (?:my )?(?:total )?(?:spending|expenses)|(?:please )?how much (?:did i|have i|do i) (?:spend|spent)"
+        rf"|what did i spend)(?: in total)?(?: on (?P<category>\w+(?: \w+)?))?{PERIOD}"
+    ),
+    "saving": re.compile(
+        rf"{ASK} my (?:total )?savings(?: balance| total)?|(?:please )?how much (?:do i have|is) in (?:my )?savings"
+        rf"|(?:please )?how much (?:money )?have i saved(?: in total)?"
+    ),
+    "debt": re.compile(
+        rf"{ASK} my (?:total )?debts?(?: in total)?|(?:please )?how much (?:do i owe|debt do i have)(?: in total)?"
+        rf"|what do i owe(?: in total)?"
+    ),
+    "investment": re.compile(rf"{ASK} my investments"),
+}
+PERIODS = {
+    "this month": "this_month", "last month": "last_month", "previous month": "last_month",
+    "this year": "this_year",
+}
+
+
+class Route:
+    __slots__ = ("intent", "score", "direct")
+
+    def __init__(self, intent: str, score: int, direct: bool):
+        self.intent = intent
+        self.score = score
+        # True when the message can be answered from profile data alone
+        self.direct = direct
+
+
+def month_bounds(today: date, period: str) -> Tuple[str, str]:
+    # ISO date prefixes; entry dates compare as strings
+    if period == "this_year":
+        return f"{today.year}-01-01", f"{today.year + 1}-01-01"
+    year, month = today.year, today.month
+    if period == "last_month":
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    end_year, end_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year}-{month:02d}-01", f"{end_year}-{end_month:02d}-01"
+
+
+def format_amount(value: float) -> str:
+    return f"${value:,.2f}"
+
+
+def singular(word: str) -> str:
+    return word[:-1] if word.endswith("s") and len(word) > 3 else word
+
+
+def only_small_talk(words: List[str]) -> bool:
+    """True when every word belongs to a greeting, thanks or filler, and at
+    least one greeting or thanks is present. "Hello, I lost my job" is not."""
+    greeted = False
+    position = 0
+    while position < len(words):
+        for size in (3, 2, 1):
+            phrase = " ".join(words[position:position + size])
+            if phrase in SMALL_TALK_PHRASES:
+                greeted = True
+            elif size > 1 or phrase not in SMALL_TALK_FILLER:
+                continue
+            position += size
+            break
+        else:
+            return False
+    return greeted
+
+
+def mentions_category(category: str, text: str, words: set) -> bool:
+    name = normalize_message(category)
+    if " " in name:
+        return f" {name} " in f" {text} "
+    return singular(name) in words
+
+
+class IntentRouter:
+    """Keyword classifier that runs in front of the LLM.
+
+    Every message is tagged with one of ``INTENTS`` in a few microseconds.
+    Questions about the client's own figures ("show my spending this month",
+    "what are my debts") are answered from the profile without an LLM call.
+    The intent also selects which profile sections go into the LLM prompt.
+    """
+
+    def __init__(self, enabled: bool = True, local_answers: bool = True):
+        self.enabled = enabled
+        self.local_answers = local_answers
+        self.stats = {"messages": 0, "routed": 0, "local_answers": 0, "llm_calls": 0, "cached": 0,
+                      "classify_us": 0.0}
+        self.by_intent = {intent: 0 for intent in INTENTS}
+
+    def classify(self, message: str) -> Route:
+        text = normalize_message(message)
+        words = text.split()
+        scores = dict.fromkeys(INTENTS, 0)
+        first_seen: Dict[str, int] = {}
+        terms = [*enumerate(words), *((i, f"{a} {b}") for i, (a, b) in enumerate(zip(words, words[1:])))]
+        for position, term in terms:
+            intent = KEYWORD_INTENTS.get(term)
+            if intent is not None:
+                scores[intent] += 1
+                first_seen[intent] = min(position, first_seen.get(intent, position))
+
+        # Ties go to the topic mentioned first
+        financial = max(INTENTS[:4], key=lambda name: (scores[name], -first_seen.get(name, 0)))
+        if scores[financial]:
+            intent = financial
+        elif only_small_talk(words):
+            # Anything more than pleasantries goes to the LLM with the full profile
+            intent = "small_talk"
+        else:
+            intent = "general"
+
+        query = DIRECT_QUERIES.get(intent)
+        direct = intent == "small_talk" or (query is not None and query.fullmatch(text) is not None)
+        return Route(intent, scores.get(intent, 0), direct and self.local_answers)
+
+    def route(self, message: str) -> Route:
+        if not self.enabled:
+            return Route("general", 0, False)
+        start = time.perf_counter()
+        route = self.classify(message)
+        self.stats["classify_us"] += (time.perf_counter() - start) * 1e6
+        self.stats["messages"] += 1
+        self.by_intent[route.intent] += 1
+        if route.intent != "general":
+            self.stats["routed"] += 1
+        return route
+
+    def record(self, route: Route, handler: str):
+        # handler: "local", "cache" or "llm"
+        key = {"local": "local_answers", "cache": "cached", "llm": "llm_calls"}[handler]
+        self.stats[key] += 1
+        INTENT_ROUTES.labels(route.intent, handler).inc()
+
+    async def answer(self, route: Route, profile: AdvisorContext, message: str) -> Optional[str]:
+        """Reply to a direct query from profile data, or None to fall through to the LLM."""
+        if not route.direct:
+            return None
+        if route.intent == "small_talk":
+            return self.small_talk(profile, normalize_message(message))
+        if route.intent == "spending":
+            return await self.spending(profile, normalize_message(message))
+        if route.intent == "saving":
+            if profile.savings is None:
+                return None
+            return f"You have {format_amount(profile.savings)} in savings on record."
+        if route.intent == "debt":
+            if profile.debts is None:
+                return None
+            if not profile.debts:
+                return "You have no debts on record."
+            return f"Your recorded debts total {format_amount(profile.debts)}."
+        if route.intent == "investment":
+            if not profile.investments:
+                return None
+            return f"Your investments on record: {profile.investments}."
+        return None
+
+    @staticmethod
+    def small_talk(profile: AdvisorContext, text: str) -> str:
+        if re.search(r"\b(thanks|thank you|thx|cheers)\b", text):
+            return f"You're welcome, {profile.name}. Let me know if anything else about your finances is on your mind."
+        if re.search(r"\b(bye|goodbye)\b", text):
+            return f"Goodbye, {profile.name}. I'm here whenever you want to talk about your finances."
+        return (f"Hello {profile.name}, it's good to hear from you. "
+                "What would you like to talk about: your spending, savings, debts or investments?")
+
+    @staticmethod
+    async def spending(profile: AdvisorContext, text: str) -> Optional[str]:
+        document = await AnalyticsService.load_profile_spending(profile.id)
+        entries: List[dict] = (document or {}).get("spending_data", [])
+        if not entries:
+            return "There is no spending recorded on your profile yet."
+
+        period = next((value for phrase, value in PERIODS.items() if phrase in text), "this_month")
+        start, end = month_bounds(date.today(), period)
+        words = {singular(word) for word in text.split()}
+        categories = {category for category in {entry["category"] for entry in entries}
+                      if mentions_category(category, text, words)}
+        match = DIRECT_QUERIES["spending"].fullmatch(text)
+        if match is not None and match["category"] and not categories:
+            # "on average", "on travel" with no travel entries: not a total we can give
+            return None
+
+        total = 0.0
+        count = 0
+        by_category: Dict[str, float] = {}
+        for entry in entries:
+            if not start <= entry["date"] < end or (categories and entry["category"] not in categories):
+                continue
+            total += entry["amount"]
+            count += 1
+            by_category[entry["category"]] = by_category.get(entry["category"], 0.0) + entry["amount"]
+
+        label = {"this_month": "this month", "last_month": "last month", "this_year": "this year"}[period]
+        subject = f"on {', '.join(sorted(categories))} " if categories else ""
+        if not count:
+            return f"You have no spending {subject}recorded {label}."
+        transactions = f"{count} transaction{'s' if count != 1 else ''}"
+        reply = f"You have spent {format_amount(total)} {subject}{label} across {transactions}."
+        if not categories and len(by_category) > 1:
+            top = sorted(by_category.items(), key=lambda item: item[1], reverse=True)[:3]
+            reply += " Largest categories: " + ", ".join(f"{name} {format_amount(amount)}" for name, amount in top) + "."
+        return reply
+
+    def snapshot(self) -> dict:
+        messages = self.stats["messages"]
+        return {
+            **self.stats,
+            "by_intent": dict(self.by_intent),
+            "hit_rate": self.stats["routed"] / messages if messages else 0.0,
+            "llm_calls_avoided": self.stats["local_answers"],
+            "local_answer_rate": self.stats["local_answers"] / messages if messages else 0.0,
+            "avg_classify_us": self.stats["classify_us"] / messages if messages else 0.0,
+        }
+
+
+intent_router = IntentRouter(enabled=settings.INTENT_ROUTER_ENABLED, local_answers=settings.INTENT_ROUTER_LOCAL_ANSWERS)
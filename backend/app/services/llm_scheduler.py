@@ -0,0 +1,269 @@
+# Backend: app/services/llm_scheduler.py
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+from app.config import settings
+from app.instrumentation import LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT, LLM_SHED
+
+# Lower value is served first. Streaming chat is what the UI waits on; the
+# batch runner only gets slots that interactive traffic leaves free.
+PRIORITIES = {"interactive": 0, "standard": 1, "batch": 2}
+
+
+class SchedulerOverloaded(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"LLM scheduler overloaded ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+    __slots__ = ("profile_id", "priority", "tokens", "future", "enqueued_at", "granted_at")
+
+    def __init__(self, profile_id: str, priority: str, tokens: int):
+        self.profile_id = profile_id
+        self.priority = priority
+        self.tokens = tokens
+        self.future: Optional[asyncio.Future] = None
+        self.enqueued_at = time.monotonic()
+        self.granted_at: Optional[float] = None
+
+    @property
+    def wait(self) -> float:
+        return (self.granted_at or time.monotonic()) - self.enqueued_at
+
+
+class LLMScheduler:
+    """Admission control in front of the LLM backend.
+
+    A request gets a slot when fewer than ``max_concurrency`` completions are
+    running and its estimated tokens (prompt plus ``max_tokens``, which is how
+    upstream rate limits count) fit in what is left of ``tokens_per_minute``
+    over the last sixty seconds. A sliding window never admits more than the
+    budget in any minute, so it stays under both windowed and token-bucket
+    upstream limits.
+    Waiting requests are queued per priority class and, within a class, per
+    profile. Profiles are served round-robin, so a chatty profile gets at most
+    its share of the slots. When the queue or a profile's share of it is full,
+    or a request waits longer than ``queue_timeout``, it is shed with
+    ``SchedulerOverloaded`` and a Retry-After estimate.
+    """
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: Optional[int] = None, max_queue_depth: int = 256,
+                 max_queued_per_profile: int = 8, queue_timeout: float = 10.0, enabled: bool = True):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.max_queue_depth = max_queue_depth
+        self.max_queued_per_profile = max_queued_per_profile
+        self.queue_timeout = queue_timeout
+        self.enabled = enabled
+        self._queues: Dict[int, "OrderedDict[str, Deque[Ticket]]"] = {
+            rank: OrderedDict() for rank in sorted(PRIORITIES.values())
+        }
+        self._depth = 0
+        self._queued_per_profile: Dict[str, int] = {}
+        self._active = 0
+        # (start time, tokens) of the slots granted in the last minute
+        self._window: Deque = deque()
+        self._tokens_used = 0.0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._wakeup_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Moving average of how long a slot is held, for Retry-After estimates
+        self.service_time = 1.0
+        self.stats = {"admitted": 0, "queued": 0, "shed": 0, "completed": 0}
+
+    @property
+    def _tokens(self) -> float:
+        return self.tokens_per_minute - self._tokens_used if self.tokens_per_minute else 0.0
+
+    def _expire(self):
+        cutoff = time.monotonic() - 60
+        while self._window and self._window[0][0] <= cutoff:
+            self._tokens_used -= self._window.popleft()[1]
+
+    def _cost(self, ticket: Ticket) -> float:
+        # A request larger than the whole budget waits for an empty window instead of forever
+        return min(ticket.tokens, self.tokens_per_minute) if self.tokens_per_minute else 0
+
+    def _can_start(self, ticket: Ticket) -> bool:
+        return self._active < self.max_concurrency and self._tokens >= self._cost(ticket)
+
+    def _start(self, ticket: Ticket):
+        ticket.granted_at = time.monotonic()
+        cost = self._cost(ticket)
+        if cost:
+            self._window.append((ticket.granted_at, cost))
+            self._tokens_used += cost
+        self._active += 1
+        self.stats["admitted"] += 1
+        LLM_QUEUE_WAIT.labels(ticket.priority).observe(ticket.wait)
+
+    def retry_after(self, tokens: float = 0) -> int:
+        waves = (self._depth + self._active + 1) / self.max_concurrency
+        wait = waves * self.service_time
+        if self.tokens_per_minute:
+            wait = max(wait, self._window_wait(self._cost_queued() + max(tokens, 1)))
+        return max(1, math.ceil(wait))
+
+    def _cost_queued(self) -> float:
+        return sum(self._cost(ticket) for queue in self._queues.values() for tickets in queue.values()
+                   for ticket in tickets)
+
+    def _window_wait(self, tokens: float) -> float:
+        # Seconds until ``tokens`` more fit in the window; a minute per full budget beyond it
+        missing = tokens - self._tokens
+        if missing <= 0:
+            return 0.0
+        now = time.monotonic()
+        for started, cost in self._window:
+            missing -= cost
+            if missing <= 0:
+                return started + 60 - now
+        return 60 * (1 + missing / self.tokens_per_minute)
+
+    def _shed(self, priority: str, reason: str, tokens: float = 0):
+        self.stats["shed"] += 1
+        LLM_SHED.labels(priority, reason).inc()
+        raise SchedulerOverloaded(reason, self.retry_after(tokens))
+
+    def check_admission(self, profile_id: str, priority: str = "interactive"):
+        """Raise ``SchedulerOverloaded`` now if a request would be shed on arrival."""
+        if not self.enabled or (self._depth == 0 and self._active < self.max_concurrency):
+            return
+        if self._depth >= self.max_queue_depth:
+            self._shed(priority, "queue_full")
+        if self._queued_per_profile.get(profile_id, 0) >= self.max_queued_per_profile:
+            self._shed(priority, "profile_queue_full")
+
+    def _enqueue(self, ticket: Ticket):
+        rank = PRIORITIES[ticket.priority]
+        self._queues[rank].setdefault(ticket.profile_id, deque()).append(ticket)
+        self._depth += 1
+        self._queued_per_profile[ticket.profile_id] = self._queued_per_profile.get(ticket.profile_id, 0) + 1
+        self.stats["queued"] += 1
+        LLM_QUEUE_DEPTH.labels(ticket.priority).inc()
+
+    def _dequeue(self, ticket: Ticket):
+        queue = self._queues[PRIORITIES[ticket.priority]]
+        tickets = queue[ticket.profile_id]
+        if tickets[0] is ticket:
+            tickets.popleft()
+            if tickets:
+                # Round-robin: the profile goes to the back of its class
+                queue.move_to_end(ticket.profile_id)
+        else:
+            tickets.remove(ticket)
+        if not tickets:
+            del queue[ticket.profile_id]
+        self._depth -= 1
+        remaining = self._queued_per_profile[ticket.profile_id] - 1
+        if remaining:
+            self._queued_per_profile[ticket.profile_id] = remaining
+        else:
+            del self._queued_per_profile[ticket.profile_id]
+        LLM_QUEUE_DEPTH.labels(ticket.priority).dec()
+
+    def _next(self) -> Optional[Ticket]:
+        for queue in self._queues.values():
+            if queue:
+                return next(iter(queue.values()))[0]
+        return None
+
+    def _dispatch(self):
+        self._expire()
+        while self._active < self.max_concurrency:
+            ticket = self._next()
+            if ticket is None:
+                return
+            if not self._can_start(ticket):
+                self._schedule_wakeup(self._window_wait(self._cost(ticket)))
+                return
+            self._dequeue(ticket)
+            self._start(ticket)
+            ticket.future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._wakeup is not None and self._wakeup_loop is loop:
+            return
+
+        def wake():
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup = loop.call_later(delay, wake)
+        self._wakeup_loop = loop
+
+    async def acquire(self, profile_id: str, priority: str = "interactive", tokens: int = 0) -> Ticket:
+        ticket = Ticket(profile_id, priority, tokens)
+        self._expire()
+        if self._depth == 0 and self._can_start(ticket):
+            self._start(ticket)
+            return ticket
+        self.check_admission(profile_id, priority)
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._enqueue(ticket)
+        self._dispatch()
+        try:
+            done, _ = await asyncio.wait({ticket.future}, timeout=self.queue_timeout)
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        if not done:
+            self._abandon(ticket)
+            LLM_QUEUE_WAIT.labels(priority).observe(ticket.wait)
+            self._shed(priority, "timeout", self._cost(ticket))
+        return ticket
+
+    def _abandon(self, ticket: Ticket):
+        if ticket.granted_at is not None:
+            self.release(ticket)
+        else:
+            self._dequeue(ticket)
+            ticket.future.cancel()
+            # The ticket may have been the head of the queue holding back others that fit now
+            self._dispatch()
+
+    def release(self, ticket: Ticket):
+        self._active -= 1
+        self.stats["completed"] += 1
+        self.service_time = 0.9 * self.service_time + 0.1 * (time.monotonic() - ticket.granted_at)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, profile_id: str, priority: str = "interactive", tokens: int = 0):
+        """Hold one LLM slot for the body of the ``async with``; yields the Ticket."""
+        if not self.enabled:
+            yield Ticket(profile_id, priority, tokens)
+            return
+        ticket = await self.acquire(profile_id, priority, tokens)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def snapshot(self) -> dict:
+        self._expire()
+        return {
+            **self.stats,
+            "active": self._active,
+            "queue_depth": self._depth,
+            "queued_profiles": len(self._queued_per_profile),
+            "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+            "service_time_s": round(self.service_time, 3),
+        }
+
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    max_queue_depth=settings.LLM_QUEUE_MAX_DEPTH,
+    max_queued_per_profile=settings.LLM_QUEUE_MAX_PER_PROFILE,
+    queue_timeout=settings.LLM_QUEUE_TIMEOUT,
+    enabled=settings.LLM_SCHEDULER_ENABLED,
+)
@@ -0,0 +1,92 @@
+# Backend: app/services/memory_service.py
+import re
+from typing import Dict, Iterable
+
+from pymongo import ReturnDocument
+from app.config import settings
+from app.database import database
+from app.instrumentation import instrumented
+from app.models import ConversationMemory
+from app.services.profile_cache import profile_cache
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+# Compaction retries when another turn lands between the read and the write
+MAX_COMPACT_ATTEMPTS = 5
+
+
+def first_sentence(text: str, max_chars: int) -> str:
+    sentence = SENTENCE_END.split(text.strip(), maxsplit=1)[0]
+    if len(sentence) > max_chars:
+        sentence = sentence[:max_chars - 3].rstrip() + "..."
+    return sentence
+
+
+def summarize_turn(turn: dict) -> str:
+    return f"- {turn['timestamp'][:10]}: asked \"{first_sentence(turn['user'], 120)}\"; advised \"{first_sentence(turn['bot'], 160)}\""
+
+
+def extend_summary(summary: str, turns: Iterable[dict], max_chars: int) -> str:
+    # Append one line per evicted turn and drop the oldest lines past max_chars.
+    lines = summary.splitlines() if summary else []
+    lines.extend(summarize_turn(turn) for turn in turns)
+    while lines and sum(len(line) + 1 for line in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class MemoryService:
+    """Per-profile rolling memory: the last few turns verbatim plus a compact
+    summary of everything that has fallen out of the window."""
+
+    @staticmethod
+    @instrumented("memory.get_memory")
+    async def get_memory(profile_id: str) -> ConversationMemory:
+        return await profile_cache.get_or_load(profile_id, "memory", lambda: MemoryService.load_memory(profile_id))
+
+    @staticmethod
+    async def load_memory(profile_id: str) -> ConversationMemory:
+        memory = await database.db.conversation_memory.find_one({"_id": profile_id}, {"_id": 0})
+        return ConversationMemory(**memory) if memory else ConversationMemory()
+
+    @staticmethod
+    @instrumented("memory.load_memories")
+    async def load_memories(profile_ids: Iterable[str]) -> Dict[str, ConversationMemory]:
+        # Profiles without stored memory get an empty one
+        profile_ids = list(profile_ids)
+        memories = {profile_id: ConversationMemory() for profile_id in profile_ids}
+        async for memory in database.db.conversation_memory.find({"_id": {"$in": profile_ids}}):
+            memories[memory.pop("_id")] = ConversationMemory(**memory)
+        return memories
+
+    @staticmethod
+    @instrumented("memory.record_turn")
+    async def record_turn(profile_id: str, user_message: str, ai_response: str, timestamp: str):
+        turn = {"user": user_message, "bot": ai_response, "timestamp": timestamp}
+        # Every write bumps ``version``, so compaction can tell if the window moved under it
+        memory = await database.db.conversation_memory.find_one_and_update(
+            {"_id": profile_id},
+            {"$push": {"recent": turn}, "$inc": {"version": 1}, "$setOnInsert": {"summary": ""}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        window = settings.MEMORY_WINDOW_TURNS
+        for _ in range(MAX_COMPACT_ATTEMPTS):
+            if memory is None or len(memory["recent"]) <= window:
+                break
+            # The kept window is written out whole, so what is dropped is exactly what gets summarized
+            result = await database.db.conversation_memory.update_one(
+                {"_id": profile_id, "version": memory["version"]},
+                {
+                    "$set": {
+                        "recent": memory["recent"][-window:],
+                        "summary": extend_summary(memory["summary"], memory["recent"][:-window],
+                                                  settings.MEMORY_SUMMARY_MAX_CHARS),
+                    },
+                    "$inc": {"version": 1},
+                },
+            )
+            if result.modified_count:
+                break
+            memory = await database.db.conversation_memory.find_one({"_id": profile_id})
+        # Out of attempts, the window stays oversized until the next turn compacts it
+        profile_cache.invalidate(profile_id, ("memory",))
@@ -1,28 +1,222 @@
 # Backend: app/services/openai_service.py
-from openai import OpenAI
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+
+import httpx
 from app.config import settings
-from app.models import UserProfile
+from app.instrumentation import LLM_IN_PROGRESS, instrumented, record_llm_usage
+from app.models import AdvisorContext, ConversationMemory
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+class LLMTimeoutError(Exception):
+    pass
+
+
+class LLMBackend:
+    """Shared async completion client.
+
+    One AsyncOpenAI client (and its keep-alive connection pool) is reused for
+    every request, and a semaphore caps how many completions are in flight.
+    """
+
+    def __init__(self, max_concurrency: int, timeout: float, base_url: Optional[str] = None, max_retries: int = 1,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.base_url = base_url
+        self.max_retries = max_retries
+        # Benchmarks route requests to an in-process stub by setting this
+        self.transport = transport
+        self._client: Optional["AsyncOpenAI"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        if self._client is None:
+            # the openai package is slow to import, so defer it to first use
+            from openai import AsyncOpenAI
+            http_client = httpx.AsyncClient(
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                timeout=self.timeout,
+            )
+            self._client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=http_client,
+            )
+        return self._client
+
+    @property
+    def ready(self) -> bool:
+        return self._client is not None
+
+    async def warm_up(self):
+        await asyncio.get_running_loop().run_in_executor(None, lambda: self.client)
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def complete(self, messages: List[dict], **kwargs) -> str:
+        from openai import APITimeoutError
+        async with self.semaphore:
+            with LLM_IN_PROGRESS.track_inprogress():
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=settings.OPENAI_MODEL,
+                        messages=messages,
+                        timeout=self.timeout,
+                        **kwargs,
+                    )
+                except APITimeoutError as e:
+                    raise LLMTimeoutError(f"LLM completion timed out after {self.timeout}s") from e
+        record_llm_usage(response.usage)
+        return response.choices[0].message.content.strip()
+
+    async def stream(self, messages: List[dict], **kwargs) -> AsyncIterator[str]:
+        from openai import APITimeoutError
+        async with self.semaphore:
+            with LLM_IN_PROGRESS.track_inprogress():
+                try:
+                    stream = await self.client.chat.completions.create(
+                        model=settings.OPENAI_MODEL,
+                        messages=messages,
+                        timeout=self.timeout,
+                        stream=True,
+                        # the final chunk then carries token usage
+                        stream_options={"include_usage": True},
+                        **kwargs,
+                    )
+                    async for chunk in stream:
+                        record_llm_usage(chunk.usage)
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                except APITimeoutError as e:
+                    raise LLMTimeoutError(f"LLM completion timed out after {self.timeout}s") from e
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+llm_backend = LLMBackend(
+    max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+    timeout=settings.OPENAI_TIMEOUT,
+    base_url=settings.OPENAI_BASE_URL,
+    max_retries=settings.OPENAI_MAX_RETRIES,
+)
+
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+SYSTEM_PROMPT = "You are a helpful AI financial advisor."
+MAX_COMPLETION_TOKENS = 200
 
-def generate_ai_response(profile: UserProfile, user_input: str) -> str:
+
+# Profile sections the prompt includes for each routed intent; anything else gets all of them
+PROFILE_SECTIONS = ("income", "savings", "debts", "investments", "financial_goals")
+INTENT_SECTIONS = {
+    "spending": ("income", "financial_goals"),
+    "saving": ("income", "savings", "financial_goals"),
+    "debt": ("income", "savings", "debts"),
+    "investment": ("savings", "investments", "financial_goals"),
+    "small_talk": (),
+}
+
+
+def profile_lines(profile: AdvisorContext, sections) -> List[str]:
+    amounts = [f"{name.capitalize()}: {getattr(profile, name)}" for name in ("income", "savings", "debts")
+               if name in sections]
+    lines = [", ".join(amounts)] if amounts else []
+    if "investments" in sections:
+        lines.append(f"Investments: {profile.investments}")
+    if "financial_goals" in sections:
+        lines.append(f"Financial goals: {', '.join(profile.financial_goals)}")
+    return lines
+
+
+def build_prompt(profile: AdvisorContext, user_input: str, intent: Optional[str] = None) -> str:
+    sections = INTENT_SECTIONS.get(intent, PROFILE_SECTIONS)
     prompt = f"The elderly client (Name: {profile.name}, Age: {profile.age}) said: '{user_input}'. "
-    prompt += f"\n\nUser's financial profile:\n"
-    prompt += f"Income: {profile.income}, Savings: {profile.savings}, Debts: {profile.debts}\n"
-    prompt += f"Investments: {profile.investments}\n"
-    prompt += f"Financial goals: {', '.join(profile.financial_goals)}\n"
+    lines = profile_lines(profile, sections)
+    if lines:
+        prompt += f"\n\nUser's financial profile:\n"
+        prompt += "".join(f"{line}\n" for line in lines)
     prompt += "\nProvide an empathetic response and appropriate financial advice, "
     prompt += "considering their emotional state, financial context, and profile information."
+    return prompt
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text; good enough for budgeting
+    return len(text) // 4 + 1
+
+
+def build_messages(profile: AdvisorContext, user_input: str, memory: Optional[ConversationMemory] = None,
+                   token_budget: Optional[int] = None, intent: Optional[str] = None) -> List[dict]:
+    """Assemble the chat messages under ``token_budget``.
 
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",  # or another appropriate model
-        messages=[
-            {"role": "system", "content": "You are a helpful AI financial advisor."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=200,
+    The system prompt and the profile prompt are always sent. The running
+    summary comes next, then as many recent turns as fit, newest first.
+    """
+    token_budget = settings.PROMPT_TOKEN_BUDGET if token_budget is None else token_budget
+    system = {"role": "system", "content": SYSTEM_PROMPT}
+    prompt = {"role": "user", "content": build_prompt(profile, user_input, intent)}
+    used = estimate_tokens(system["content"]) + estimate_tokens(prompt["content"])
+
+    summary = []
+    history = []
+    if memory is not None:
+        if memory.summary:
+            content = f"Summary of earlier conversations with this client:\n{memory.summary}"
+            if used + estimate_tokens(content) <= token_budget:
+                summary.append({"role": "system", "content": content})
+                used += estimate_tokens(content)
+        for turn in reversed(memory.recent):
+            cost = estimate_tokens(turn.user) + estimate_tokens(turn.bot)
+            if used + cost > token_budget:
+                break
+            history[:0] = [{"role": "user", "content": turn.user}, {"role": "assistant", "content": turn.bot}]
+            used += cost
+
+    return [system, *summary, *history, prompt]
+
+
+def request_tokens(profile: AdvisorContext, user_input: str, memory: Optional[ConversationMemory] = None,
+                   intent: Optional[str] = None) -> int:
+    # What an upstream rate limiter charges: the prompt plus max_tokens
+    messages = build_messages(profile, user_input, memory, intent=intent)
+    return sum(estimate_tokens(message["content"]) for message in messages) + MAX_COMPLETION_TOKENS
+
+
+@instrumented("llm.generate")
+async def generate_ai_response(profile: AdvisorContext, user_input: str, memory: Optional[ConversationMemory] = None,
+                               intent: Optional[str] = None) -> str:
+    return await llm_backend.complete(
+        build_messages(profile, user_input, memory, intent=intent),
+        max_tokens=MAX_COMPLETION_TOKENS,
         n=1,
         temperature=0.7,
     )
 
-    return response.choices[0].message.content.strip()
+
+@instrumented("llm.stream")
+async def generate_ai_response_stream(profile: AdvisorContext, user_input: str,
+                                      memory: Optional[ConversationMemory] = None,
+                                      intent: Optional[str] = None) -> AsyncIterator[str]:
+    async for token in llm_backend.stream(
+        build_messages(profile, user_input, memory, intent=intent),
+        max_tokens=MAX_COMPLETION_TOKENS,
+        temperature=0.7,
+    ):
+        yield token
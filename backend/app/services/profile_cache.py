@@ -0,0 +1,102 @@
+# Backend: app/services/profile_cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.config import settings
+
+# Views cached per profile; invalidating a profile drops all of them
+PROFILE_VIEWS = ("profile", "advisor_context", "memory")
+
+
+class AsyncTTLCache:
+    """Bounded LRU + TTL cache for validated profile views.
+
+    Keys are ``(profile_id, view)``. Concurrent misses for the same key share
+    one loader call, run in its own task so that a cancelled caller doesn't
+    cancel the others. ``invalidate`` bumps a per-profile epoch, so a load that
+    was already in flight when the profile changed is returned to its waiters
+    but never stored. Cached objects are shared: treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._epochs: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "invalidations": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get_or_load(self, profile_id: str, view: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await loader()
+        key = (profile_id, view)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(self._load(key, loader, self._epochs.get(profile_id, 0)))
+            # Retrieve a failure nobody is left waiting for, so it isn't logged as unhandled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        # A caller that is cancelled (e.g. the client disconnected) stops waiting; the load goes on
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Tuple[str, str], loader: Callable[[], Awaitable[Any]], epoch: int) -> Any:
+        try:
+            value = await loader()
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        if value is not None and self._epochs.get(key[0], 0) == epoch:
+            self._store(key, value)
+        return value
+
+    def _store(self, key: Tuple[str, str], value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, profile_id: str, views: Tuple[str, ...] = PROFILE_VIEWS):
+        self._epochs[profile_id] = self._epochs.get(profile_id, 0) + 1
+        for view in views:
+            key = (profile_id, view)
+            self._inflight.pop(key, None)
+            if self._entries.pop(key, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+        self._epochs.clear()
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": (self.stats["hits"] + self.stats["coalesced"]) / lookups if lookups else 0.0,
+        }
+
+
+profile_cache = AsyncTTLCache(
+    max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+    ttl=settings.PROFILE_CACHE_TTL_SECONDS,
+    enabled=settings.PROFILE_CACHE_ENABLED,
+)
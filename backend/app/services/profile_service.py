@@ -1,23 +1,117 @@
-from app.models import UserProfile, SpendingEntry
+from app.models import UserProfile, SpendingEntry, AdvisorContext, ConversationPage, ProfileSummary, ProfilePage, ProfileUpdate
 from app.models import UserProfile
 from app.database import database
+from app.instrumentation import instrumented
+from app.services.bulk_writer import conversation_writer
+from app.services.memory_service import MemoryService
+from app.services.profile_cache import profile_cache
+from app.services.response_cache import response_cache
+from app.services.synthetic_data import generate_spending
 from bson import ObjectId
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+import re
 from uuid import uuid4
-import random
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
+
+# Fields the LLM prompt needs; chat reads only these instead of the full document
+ADVISOR_CONTEXT_FIELDS = ["name", "age", "income", "savings", "debts", "investments", "financial_goals"]
+SUMMARY_PROJECTION = {field: 1 for field in ADVISOR_CONTEXT_FIELDS + ["version"]}
+SORTABLE_FIELDS = {"name", "age", "income", "savings", "debts"}
+
+
+def build_profile_filter(name: Optional[str] = None, min_age: Optional[int] = None, max_age: Optional[int] = None,
+                         min_income: Optional[float] = None, max_income: Optional[float] = None) -> dict:
+    query = {}
+    if name:
+        query["name"] = {"$regex": f"^{re.escape(name)}", "$options": "i"}
+    for field, low, high in (("age", min_age, max_age), ("income", min_income, max_income)):
+        bounds = {}
+        if low is not None:
+            bounds["$gte"] = low
+        if high is not None:
+            bounds["$lte"] = high
+        if bounds:
+            query[field] = bounds
+    return query
+
+
+def build_profile_sort(sort: str) -> list:
+    # "age" sorts ascending, "-age" descending; _id keeps pages stable on ties
+    field = sort.lstrip("-")
+    if field not in SORTABLE_FIELDS:
+        raise ValueError(f"Cannot sort by {field!r}; choose one of {sorted(SORTABLE_FIELDS)}")
+    direction = -1 if sort.startswith("-") else 1
+    return [(field, direction), ("_id", direction)]
+
+
+class VersionConflictError(Exception):
+    pass
+
+
+def version_filter(profile_id: str, expected_version: Optional[int] = None) -> dict:
+    query = {"_id": profile_id}
+    if expected_version is not None:
+        # Profiles written before versioning have no version field
+        query["version"] = expected_version if expected_version else {"$in": [0, None]}
+    return query
+
+
+def to_summary(profile: dict) -> ProfileSummary:
+    profile['id'] = str(profile.pop('_id'))
+    return ProfileSummary(**profile)
+
+
+def turn_cursor(turn: dict) -> str:
+    # "<timestamp>|<id>": turns sharing a timestamp are ordered by _id, so none fall between pages
+    turn_id = turn["_id"]
+    encoded = f"oid:{turn_id}" if isinstance(turn_id, ObjectId) else f"str:{turn_id}"
+    return f"{turn['timestamp']}|{encoded}"
+
+
+def older_than(cursor: str) -> dict:
+    timestamp, _, encoded = cursor.partition("|")
+    if not encoded:
+        # A bare timestamp, as next_before used to be
+        return {"timestamp": {"$lt": timestamp}}
+    kind, _, value = encoded.partition(":")
+    if kind == "oid" and ObjectId.is_valid(value):
+        turn_id = ObjectId(value)
+    elif kind == "str":
+        turn_id = value
+    else:
+        raise ValueError(f"Invalid conversation cursor {cursor!r}")
+    same_time = [{"timestamp": timestamp, "_id": {"$lt": turn_id}}]
+    if kind == "oid":
+        # Range queries don't match across types, and string ids sort below ObjectIds
+        same_time.append({"timestamp": timestamp, "_id": {"$type": "string"}})
+    return {"$or": [{"timestamp": {"$lt": timestamp}}, *same_time]}
 
 
 class ProfileService:
     @staticmethod
     async def create_profile(profile: UserProfile):
-        profile_dict = profile.dict(exclude={"id"})
+        profile_dict = profile.dict(exclude={"id", "conversation_history"})
         profile_dict['_id'] = str(uuid4())
+        profile_dict['version'] = 1
         result = await database.db.profiles.insert_one(profile_dict)
         profile.id = profile_dict['_id']
+        profile.version = 1
+        if profile.conversation_history:
+            await database.db.conversations.insert_many(
+                [{**turn, "profile_id": profile.id} for turn in profile.conversation_history]
+            )
         return profile
 
     @staticmethod
+    @instrumented("profile.get_profile")
     async def get_profile(profile_id: str):
+        return await profile_cache.get_or_load(profile_id, "profile", lambda: ProfileService.load_profile(profile_id))
+
+    @staticmethod
+    async def load_profile(profile_id: str):
         profile = await database.db.profiles.find_one({"_id": profile_id})
         if profile:
             profile['id'] = profile['_id']
@@ -25,15 +119,122 @@ class ProfileService:
         return None
 
     @staticmethod
-    async def update_profile(profile: UserProfile):
-        await database.db.profiles.update_one(
-            {"_id": profile.id},
-            {"$set": profile.dict(exclude={"id"})}
+    async def get_profile_fields(profile_id: str, fields: Iterable[str]) -> Optional[dict]:
+        projection = {field: 1 for field in fields}
+        profile = await database.db.profiles.find_one({"_id": profile_id}, projection)
+        if profile:
+            profile['id'] = profile.pop('_id')
+        return profile
+
+    @staticmethod
+    @instrumented("profile.get_advisor_context")
+    async def get_advisor_context(profile_id: str) -> Optional[AdvisorContext]:
+        return await profile_cache.get_or_load(
+            profile_id, "advisor_context", lambda: ProfileService.load_advisor_context(profile_id)
         )
+
+    @staticmethod
+    async def load_advisor_context(profile_id: str) -> Optional[AdvisorContext]:
+        profile = await ProfileService.get_profile_fields(profile_id, ADVISOR_CONTEXT_FIELDS)
+        if profile:
+            return AdvisorContext(**profile)
+        return None
+
+    @staticmethod
+    @instrumented("profile.load_advisor_contexts")
+    async def load_advisor_contexts(profile_ids: Iterable[str]) -> Dict[str, AdvisorContext]:
+        # One $in query for a batch of profiles; missing ids are left out
+        projection = {field: 1 for field in ADVISOR_CONTEXT_FIELDS}
+        cursor = database.db.profiles.find({"_id": {"$in": list(profile_ids)}}, projection)
+        contexts = {}
+        async for profile in cursor:
+            profile['id'] = profile.pop('_id')
+            contexts[profile['id']] = AdvisorContext(**profile)
+        return contexts
+
+    @staticmethod
+    async def profile_exists(profile_id: str) -> bool:
+        # Served from the advisor context view, which chat has usually cached already
+        return await ProfileService.get_advisor_context(profile_id) is not None
+
+    @staticmethod
+    async def versioned_update(profile_id: str, update: dict, expected_version: Optional[int] = None,
+                               projection: Optional[dict] = None) -> Optional[dict]:
+        # Applies ``update`` and bumps the version; with ``expected_version`` the
+        # write only happens if nobody else has written since that version.
+        update = {**update, "$inc": {**update.get("$inc", {}), "version": 1}}
+        profile = await database.db.profiles.find_one_and_update(
+            version_filter(profile_id, expected_version),
+            update,
+            projection=projection or {"version": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if profile is None and expected_version is not None and await ProfileService.profile_exists(profile_id):
+            raise VersionConflictError(f"Profile {profile_id} has changed since version {expected_version}")
+        return profile
+
+    @staticmethod
+    @instrumented("profile.update_profile")
+    async def update_profile(profile: UserProfile, expected_version: Optional[int] = None):
+        updated = await ProfileService.versioned_update(
+            profile.id,
+            {"$set": profile.dict(exclude={"id", "conversation_history", "version"})},
+            expected_version,
+        )
+        response_cache.invalidate_profile(profile.id)
+        profile_cache.invalidate(profile.id)
+        if updated is None:
+            return None
+        profile.version = updated["version"]
         return profile
 
+    @staticmethod
+    @instrumented("profile.patch_profile")
+    async def patch_profile(profile_id: str, changes: ProfileUpdate, expected_version: Optional[int] = None) -> Optional[ProfileSummary]:
+        fields = changes.dict(exclude_unset=True)
+        if not fields:
+            # Nothing to write, but a stale version is still a conflict rather than a missing profile
+            profile = await database.db.profiles.find_one({"_id": profile_id}, SUMMARY_PROJECTION)
+            if profile and expected_version is not None and (profile.get("version") or 0) != expected_version:
+                raise VersionConflictError(f"Profile {profile_id} has changed since version {expected_version}")
+        else:
+            profile = await ProfileService.versioned_update(profile_id, {"$set": fields}, expected_version, SUMMARY_PROJECTION)
+            response_cache.invalidate_profile(profile_id)
+            profile_cache.invalidate(profile_id)
+        return to_summary(profile) if profile else None
+
+    @staticmethod
+    @instrumented("profile.append_spending")
+    async def append_spending(profile_id: str, entries: List[SpendingEntry], expected_version: Optional[int] = None) -> Optional[int]:
+        # $push only sends the new entries instead of rewriting spending_data
+        updated = await ProfileService.versioned_update(
+            profile_id,
+            {"$push": {"spending_data": {"$each": [entry.dict() for entry in entries]}}},
+            expected_version,
+        )
+        profile_cache.invalidate(profile_id)
+        return updated["version"] if updated else None
+
+    @staticmethod
+    @instrumented("profile.append_spending_bulk")
+    async def append_spending_bulk(entries_by_profile: Dict[str, List[SpendingEntry]]) -> dict:
+        operations = [
+            UpdateOne(
+                {"_id": profile_id},
+                {"$push": {"spending_data": {"$each": [entry.dict() for entry in entries]}}, "$inc": {"version": 1}},
+            )
+            for profile_id, entries in entries_by_profile.items() if entries
+        ]
+        if not operations:
+            return {"matched": 0, "modified": 0}
+        result = await database.db.profiles.bulk_write(operations, ordered=False)
+        for profile_id in entries_by_profile:
+            profile_cache.invalidate(profile_id)
+        return {"matched": result.matched_count, "modified": result.modified_count}
+
     @staticmethod
     async def get_all_profiles():
+        # Full documents, as the deprecated endpoint has always returned; new clients page through list_profiles
         cursor = database.db.profiles.find({})
         profiles = await cursor.to_list(length=None)
         for profile in profiles:
@@ -41,35 +242,84 @@ class ProfileService:
         return [UserProfile(**profile) for profile in profiles]
 
     @staticmethod
-    async def save_conversation(profile_id: str, user_message: str, ai_response: str, timestamp: str):
-        await database.db.profiles.update_one(
-            {"_id": profile_id},
-            {"$push": {"conversation_history": {
-                "user": user_message,
-                "bot": ai_response,
-                "timestamp": timestamp
-            }}}
-        )
+    @instrumented("profile.list_profiles")
+    async def list_profiles(query: dict, sort: str = "name", offset: int = 0, limit: int = 50) -> ProfilePage:
+        cursor = database.db.profiles.find(query, SUMMARY_PROJECTION).sort(build_profile_sort(sort)).skip(offset).limit(limit)
+        items = [to_summary(profile) async for profile in cursor]
+        total = await database.db.profiles.count_documents(query)
+        return ProfilePage(items=items, total=total, offset=offset, limit=limit)
+
+    @staticmethod
+    async def iter_profiles(query: dict, sort: str = "name", batch_size: int = 500) -> AsyncIterator[ProfileSummary]:
+        cursor = database.db.profiles.find(query, SUMMARY_PROJECTION).sort(build_profile_sort(sort)).batch_size(batch_size)
+        async for profile in cursor:
+            yield to_summary(profile)
 
     @staticmethod
-    async def generate_synthetic_spending_data(profile_id: str, num_entries: int = 30):
-        categories = ["Groceries", "Utilities", "Entertainment", "Transportation", "Dining Out", "Healthcare"]
+    @instrumented("profile.save_conversation")
+    async def save_conversation(profile_id: str, user_message: str, ai_response: str, timestamp: str,
+                                turn_id: Optional[str] = None) -> bool:
+        # Batched with other requests' turns into one bulk_write under load.
+        # With ``turn_id`` the save is idempotent: returns False if that turn
+        # was already saved. Such a turn carries ``memory_pending`` until its
+        # memory is recorded, so complete_saved_turn() can finish it after a crash.
+        turn = {
+            "profile_id": profile_id,
+            "user": user_message,
+            "bot": ai_response,
+            "timestamp": timestamp
+        }
+        if turn_id is not None:
+            turn["_id"] = turn_id
+            turn["memory_pending"] = True
+        try:
+            await conversation_writer.insert(turn)
+        except DuplicateKeyError:
+            if turn_id is None:
+                raise
+            return False
+        await MemoryService.record_turn(profile_id, user_message, ai_response, timestamp)
+        if turn_id is not None:
+            await conversation_writer.update({"_id": turn_id}, {"$unset": {"memory_pending": ""}})
+        return True
+
+    @staticmethod
+    async def load_saved_turns(turn_ids: Iterable[str]) -> Dict[str, dict]:
+        # One $in query for the turns of a batch that are already stored, keyed by turn id
+        cursor = database.db.conversations.find({"_id": {"$in": list(turn_ids)}})
+        return {turn["_id"]: turn async for turn in cursor}
+
+    @staticmethod
+    async def complete_saved_turn(turn: dict):
+        """Record the memory of a turn saved by an interrupted run, if it never was."""
+        if not turn.get("memory_pending"):
+            return
+        await MemoryService.record_turn(turn["profile_id"], turn["user"], turn["bot"], turn["timestamp"])
+        await conversation_writer.update({"_id": turn["_id"]}, {"$unset": {"memory_pending": ""}})
+
+    @staticmethod
+    @instrumented("profile.get_conversation_page")
+    async def get_conversation_page(profile_id: str, limit: int = 50, before: Optional[str] = None) -> ConversationPage:
+        # Newest turns first from the (profile_id, timestamp, _id) index, returned oldest-first.
+        # Raises ValueError for a malformed ``before`` cursor.
+        query = {"profile_id": profile_id}
+        if before:
+            query.update(older_than(before))
+        cursor = (database.db.conversations.find(query, {"profile_id": 0})
+                  .sort([("timestamp", -1), ("_id", -1)]).limit(limit))
+        turns = await cursor.to_list(length=limit)
+        turns.reverse()
+        next_before = turn_cursor(turns[0]) if len(turns) == limit else None
+        return ConversationPage(turns=turns, next_before=next_before)
+
+    @staticmethod
+    async def generate_synthetic_spending_data(profile_id: str, num_entries: int = 30) -> Optional[Tuple[List[SpendingEntry], int]]:
+        # Replaces the profile's spending data; returns the new entries and profile
+        # version, or None if the profile doesn't exist
         end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=num_entries)
-
-        synthetic_data = []
-        for i in range(num_entries):
-            entry_date = (start_date + timedelta(days=i)).isoformat()  # Convert date to ISO format string
-            category = random.choice(categories)
-            amount = round(random.uniform(10, 200), 2)
-            synthetic_data.append({
-                "date": entry_date,
-                "category": category,
-                "amount": amount,
-                "description": f"Synthetic {category} expense"
-            })
-
-        await database.db.profiles.update_one(
-            {"_id": profile_id},
-            {"$set": {"spending_data": synthetic_data}}
-        )
\ No newline at end of file
+        entries = [SpendingEntry(**entry) for entry in generate_spending(np.random.default_rng(), num_entries, end_date)]
+        updated = await ProfileService.versioned_update(
+            profile_id, {"$set": {"spending_data": [entry.dict() for entry in entries]}}
+        )
+        profile_cache.invalidate(profile_id)
+        return (entries, updated["version"]) if updated else None
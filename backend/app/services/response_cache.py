@@ -0,0 +1,189 @@
+# Backend: app/services/response_cache.py
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from app.config import settings
+from app.models import AdvisorContext
+
+NON_WORD = re.compile(r"[^a-z0-9\s]")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    return WHITESPACE.sub(" ", NON_WORD.sub(" ", text.lower())).strip()
+
+
+class HashingEmbedder:
+    """Local, model-free sentence embedding: hashed word unigrams/bigrams and
+    character trigrams, L2-normalised. Cheap enough to run on every request."""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = text.split()
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        padded = f" {text} "
+        features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Brute-force cosine index over normalised vectors."""
+
+    def __init__(self, dim: int):
+        self.keys: List[tuple] = []
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def add(self, key: tuple, vector: np.ndarray):
+        self.keys.append(key)
+        self.vectors = np.vstack([self.vectors, vector])
+
+    def remove(self, key: tuple):
+        index = self.keys.index(key)
+        del self.keys[index]
+        self.vectors = np.delete(self.vectors, index, axis=0)
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[tuple], float]:
+        if not self.keys:
+            return None, 0.0
+        scores = self.vectors @ vector
+        best = int(np.argmax(scores))
+        return self.keys[best], float(scores[best])
+
+
+class CacheEntry:
+    __slots__ = ("response", "expires_at", "generation_ms")
+
+    def __init__(self, response: str, expires_at: float, generation_ms: float):
+        self.response = response
+        self.expires_at = expires_at
+        self.generation_ms = generation_ms
+
+
+class ResponseCache:
+    """LRU + TTL cache of advisor replies keyed on (normalised message, profile
+    id, context).
+
+    Entries are never shared between profiles: replies address the client by
+    name and quote their figures. ``context`` is a digest of whatever else
+    went into the prompt (the conversation memory), so a follow-up such as
+    "can you explain that?" is only answered from cache after the same
+    conversation. Profiles without an id are not cached.
+    With ``semantic`` enabled, a miss falls back to the most similar cached
+    message for the same profile and context when its cosine similarity is
+    at least ``similarity``.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600.0, semantic: bool = False,
+                 similarity: float = 0.9, embedder: Optional[HashingEmbedder] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.semantic = semantic
+        self.similarity = similarity
+        self.embedder = embedder or HashingEmbedder()
+        self._entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._by_profile: Dict[str, Set[tuple]] = {}
+        # (profile id, context) -> index of that conversation's cached messages
+        self._indexes: Dict[tuple, VectorIndex] = {}
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0,
+                      "latency_saved_ms": 0.0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key: tuple):
+        del self._entries[key]
+        keys = self._by_profile.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_profile[key[1]]
+        index = self._indexes.get(key[1:])
+        if index is not None:
+            index.remove(key)
+            if not index.keys:
+                del self._indexes[key[1:]]
+
+    def _lookup(self, key: tuple, now: float) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, message: str, profile: AdvisorContext, context: str = "") -> Optional[str]:
+        if not profile.id:
+            return None
+        now = time.monotonic()
+        normalized = normalize_message(message)
+        key = (normalized, profile.id, context)
+        entry = self._lookup(key, now)
+        if entry is None and self.semantic and key[1:] in self._indexes:
+            nearest, score = self._indexes[key[1:]].nearest(self.embedder.embed(normalized))
+            if nearest is not None and score >= self.similarity:
+                entry = self._lookup(nearest, now)
+                if entry is not None:
+                    key = nearest
+                    self.stats["semantic_hits"] += 1
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.stats["latency_saved_ms"] += entry.generation_ms
+        return entry.response
+
+    def put(self, message: str, profile: AdvisorContext, response: str, generation_ms: float = 0.0,
+            context: str = ""):
+        if not profile.id:
+            return
+        normalized = normalize_message(message)
+        key = (normalized, profile.id, context)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(response, time.monotonic() + self.ttl, generation_ms)
+        self._by_profile.setdefault(profile.id, set()).add(key)
+        if self.semantic:
+            self._indexes.setdefault(key[1:], VectorIndex(self.embedder.dim)).add(key, self.embedder.embed(normalized))
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def invalidate_profile(self, profile_id: str):
+        for key in list(self._by_profile.get(profile_id, ())):
+            if key in self._entries:
+                self._remove(key)
+                self.stats["invalidations"] += 1
+        self._by_profile.pop(profile_id, None)
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    semantic=settings.RESPONSE_CACHE_SEMANTIC,
+    similarity=settings.RESPONSE_CACHE_SIMILARITY,
+)
@@ -1,8 +1,114 @@
 # Backend: app/services/sentiment_service.py
-from transformers import pipeline
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 
-sentiment_analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+from app.config import settings
+from app.instrumentation import instrumented
 
-def analyze_sentiment(text: str):
-    result = sentiment_analyzer(text)[0]
-    return result['label'], result['score']
+
+class SentimentBatcher:
+    """Queues sentiment requests and runs them in micro-batches off the event loop.
+
+    A batch is flushed when it reaches ``max_batch_size`` or when the oldest
+    queued message has waited ``max_wait`` seconds, whichever comes first.
+    Pass either a ready ``analyzer`` or a ``loader`` that builds one on first
+    use (or during ``warm_up``).
+    """
+
+    def __init__(self, analyzer: Optional[Callable] = None, max_batch_size: int = 32, max_wait: float = 0.01,
+                 executor: Optional[ThreadPoolExecutor] = None, loader: Optional[Callable[[], Callable]] = None):
+        self.analyzer = analyzer
+        self.loader = loader
+        self._load_lock = threading.Lock()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.analyzer is not None
+
+    def _get_analyzer(self) -> Callable:
+        if self.analyzer is None:
+            with self._load_lock:
+                if self.analyzer is None:
+                    self.analyzer = self.loader()
+        return self.analyzer
+
+    async def warm_up(self):
+        await asyncio.get_running_loop().run_in_executor(self.executor, self._get_analyzer)
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def analyze(self, text: str) -> Tuple[str, float]:
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _collect_batch(self) -> List[tuple]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _infer(self, texts: List[str]) -> List[dict]:
+        return self._get_analyzer()(texts, batch_size=len(texts), truncation=True)
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                results = await self._loop.run_in_executor(self.executor, self._infer, [text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result((result['label'], result['score']))
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self.executor.shutdown(wait=False)
+
+
+def load_sentiment_pipeline():
+    # transformers/torch take seconds to import, so defer until needed
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=settings.SENTIMENT_MODEL)
+
+
+sentiment_engine = SentimentBatcher(
+    loader=load_sentiment_pipeline,
+    max_batch_size=settings.SENTIMENT_MAX_BATCH_SIZE,
+    max_wait=settings.SENTIMENT_MAX_WAIT_MS / 1000,
+)
+
+
+@instrumented("sentiment.analyze")
+async def analyze_sentiment(text: str):
+    return await sentiment_engine.analyze(text)
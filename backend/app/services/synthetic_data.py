@@ -0,0 +1,134 @@
+# Backend: app/services/synthetic_data.py
+import asyncio
+import uuid
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from app.database import database
+from pymongo.errors import BulkWriteError
+
+SPENDING_CATEGORIES = np.array(["Groceries", "Utilities", "Entertainment", "Transportation", "Dining Out", "Healthcare"])
+DESCRIPTIONS = np.array([f"Synthetic {category} expense" for category in SPENDING_CATEGORIES])
+FIRST_NAMES = np.array(["Anna", "Bernard", "Clara", "Dirk", "Elise", "Frans", "Greta", "Hendrik", "Ingrid", "Jan",
+                        "Karin", "Lucas", "Maria", "Nico", "Olga", "Pieter", "Rosa", "Stefan", "Thea", "Willem"])
+LAST_NAMES = np.array(["Bakker", "de Vries", "Jansen", "Smit", "Visser", "Mulder", "Bos", "Peters", "Hendriks", "Dekker"])
+INVESTMENTS = np.array(["None", "Savings account", "Stocks and bonds", "Index funds", "Real estate", "Pension fund"])
+GOALS = np.array(["Retire comfortably", "Leave inheritance", "Pay off debts", "Cover healthcare costs",
+                  "Travel more", "Help grandchildren", "Build emergency fund", "Stay independent at home"])
+QUESTIONS = np.array([
+    "How much can I spend monthly?", "Should I pay off my debt first?", "Is my pension enough?",
+    "Can I afford a trip this summer?", "How do I save for healthcare costs?", "Should I move my savings?",
+])
+ANSWERS = np.array([
+    "Let's look at your regular income and fixed costs first.",
+    "Paying off high-interest debt first is usually a good idea.",
+    "Your savings give you a good buffer; let's review your monthly costs.",
+    "A modest trip fits your budget if you plan for it over a few months.",
+])
+
+
+def generate_spending(rng: np.random.Generator, num_entries: int, end_date: date,
+                      span_days: Optional[int] = None, groups: int = 1) -> List[dict]:
+    """Spending entries drawn in one vectorized pass.
+
+    Without ``span_days`` there is one entry per day ending the day before
+    ``end_date``. With it, entries fall on random days within the span, split
+    into ``groups`` equal runs (one per profile) that are each date-ordered.
+    """
+    if span_days is None:
+        offsets = np.arange(num_entries, 0, -1)
+    else:
+        offsets = rng.integers(1, span_days + 1, (groups, num_entries // groups))
+        offsets = np.sort(offsets, axis=1)[:, ::-1].ravel()
+    dates = (np.datetime64(end_date, "D") - offsets).astype(str)
+    categories = rng.integers(0, len(SPENDING_CATEGORIES), num_entries)
+    amounts = np.round(rng.uniform(10, 200, num_entries), 2)
+    return [
+        {"date": d, "category": c, "amount": a, "description": desc}
+        for d, c, a, desc in zip(dates.tolist(), SPENDING_CATEGORIES[categories].tolist(),
+                                 amounts.tolist(), DESCRIPTIONS[categories].tolist())
+    ]
+
+
+def generate_profile_batch(rng: np.random.Generator, count: int, entries_per_profile: int, turns_per_profile: int,
+                           end_date: date, span_days: int = 365) -> Tuple[List[dict], List[dict]]:
+    ids = [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(count)]
+    first = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), count)]
+    last = LAST_NAMES[rng.integers(0, len(LAST_NAMES), count)]
+    ages = rng.integers(60, 96, count)
+    incomes = np.round(rng.lognormal(10.0, 0.4, count), -2)
+    savings = np.round(rng.lognormal(10.5, 1.0, count), -2)
+    debts = np.round(rng.lognormal(8.0, 1.5, count) * (rng.random(count) < 0.6), -2)
+    investments = INVESTMENTS[rng.integers(0, len(INVESTMENTS), count)]
+    goal_masks = rng.random((count, len(GOALS))) < 0.25
+
+    spending = generate_spending(rng, count * entries_per_profile, end_date, span_days, groups=count)
+    profiles = [
+        {
+            "_id": ids[i],
+            "name": f"{first[i]} {last[i]}",
+            "age": int(ages[i]),
+            "income": float(incomes[i]),
+            "savings": float(savings[i]),
+            "debts": float(debts[i]),
+            "investments": str(investments[i]),
+            "financial_goals": GOALS[goal_masks[i]].tolist(),
+            "spending_data": spending[i * entries_per_profile:(i + 1) * entries_per_profile],
+        }
+        for i in range(count)
+    ]
+
+    turns = count * turns_per_profile
+    owners = np.repeat(np.arange(count), turns_per_profile)
+    seconds = np.sort(rng.integers(0, span_days * 86400, turns))
+    base = np.datetime64(end_date, "s") - np.int64(span_days * 86400)
+    timestamps = (base + seconds.astype("timedelta64[s]")).astype(str)
+    questions = QUESTIONS[rng.integers(0, len(QUESTIONS), turns)]
+    answers = ANSWERS[rng.integers(0, len(ANSWERS), turns)]
+    conversations = [
+        {"profile_id": ids[o], "user": q, "bot": a, "timestamp": t}
+        for o, q, a, t in zip(owners.tolist(), questions.tolist(), answers.tolist(), timestamps.tolist())
+    ]
+    return profiles, conversations
+
+
+def iter_synthetic_batches(num_profiles: int, entries_per_profile: int = 100, turns_per_profile: int = 0,
+                           seed: int = 0, batch_size: int = 500,
+                           end_date: Optional[date] = None) -> Iterator[Tuple[List[dict], List[dict]]]:
+    """Yields (profiles, conversation turns) batches; the same seed always yields the same data."""
+    rng = np.random.default_rng(seed)
+    end_date = end_date or datetime.now().date()
+    for start in range(0, num_profiles, batch_size):
+        yield generate_profile_batch(rng, min(batch_size, num_profiles - start), entries_per_profile,
+                                     turns_per_profile, end_date)
+
+
+async def seed_database(num_profiles: int, entries_per_profile: int = 100, turns_per_profile: int = 0,
+                        seed: int = 0, batch_size: int = 500, end_date: Optional[date] = None) -> dict:
+    # Generate the next batch in a worker thread while the current one is written.
+    # Profiles already in the database (an earlier run with the same seed) are
+    # skipped along with their turns.
+    loop = asyncio.get_running_loop()
+    batches = iter_synthetic_batches(num_profiles, entries_per_profile, turns_per_profile, seed, batch_size, end_date)
+    stats = {"profiles": 0, "spending_entries": 0, "conversation_turns": 0, "skipped_profiles": 0}
+    batch = await loop.run_in_executor(None, next, batches, None)
+    while batch is not None:
+        next_batch = loop.run_in_executor(None, next, batches, None)
+        profiles, conversations = batch
+        existing = set()
+        try:
+            await database.db.profiles.insert_many(profiles, ordered=False)
+        except BulkWriteError as e:
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+            existing = {profiles[error["index"]]["_id"] for error in e.details["writeErrors"]}
+            conversations = [turn for turn in conversations if turn["profile_id"] not in existing]
+        if conversations:
+            await database.db.conversations.insert_many(conversations, ordered=False)
+        stats["profiles"] += len(profiles) - len(existing)
+        stats["spending_entries"] += (len(profiles) - len(existing)) * entries_per_profile
+        stats["conversation_turns"] += len(conversations)
+        stats["skipped_profiles"] += len(existing)
+        batch = await next_batch
+    return stats
@@ -0,0 +1,105 @@
+# Backend: benchmarks/analytics_benchmark.py
+# Spending analytics on synthetic data: per-entry Python loops vs. the
+# vectorized pandas/NumPy engine in app.services.analytics_service.
+#
+#   python benchmarks/analytics_benchmark.py --entries 1000000 --profiles 1000
+import argparse
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.analytics_service import compute_cohort_stats, compute_spending_insights, spending_frame
+
+CATEGORIES = ["Groceries", "Utilities", "Entertainment", "Transportation", "Dining Out", "Healthcare"]
+
+
+def make_entries(count: int, profiles: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = date(2020, 1, 1)
+    days = rng.integers(0, 4 * 365, count)
+    categories = rng.integers(0, len(CATEGORIES), count)
+    amounts = np.round(rng.gamma(2.0, 40.0, count), 2)
+    owners = rng.integers(0, profiles, count)
+    entries = [
+        {"date": (start + timedelta(days=int(d))).isoformat(), "category": CATEGORIES[c], "amount": float(a)}
+        for d, c, a in zip(days, categories, amounts)
+    ]
+    return entries, [f"profile-{o}" for o in owners]
+
+
+def python_insights(entries, window=7, z_threshold=3.0):
+    by_category = defaultdict(float)
+    by_month = defaultdict(float)
+    daily = defaultdict(float)
+    per_category = defaultdict(list)
+    for entry in entries:
+        by_category[entry["category"]] += entry["amount"]
+        by_month[entry["date"][:7]] += entry["amount"]
+        daily[entry["date"]] += entry["amount"]
+        per_category[entry["category"]].append(entry["amount"])
+
+    first = date.fromisoformat(min(daily))
+    last = date.fromisoformat(max(daily))
+    series = [daily.get((first + timedelta(days=i)).isoformat(), 0.0) for i in range((last - first).days + 1)]
+    rolling = []
+    for i in range(len(series)):
+        chunk = series[max(0, i - window + 1):i + 1]
+        rolling.append(sum(chunk) / len(chunk))
+
+    stats = {}
+    for category, amounts in per_category.items():
+        mean = sum(amounts) / len(amounts)
+        std = math.sqrt(sum((a - mean) ** 2 for a in amounts) / max(len(amounts) - 1, 1))
+        stats[category] = (mean, std)
+    anomalies = [
+        entry for entry in entries
+        if stats[entry["category"]][1] and abs(entry["amount"] - stats[entry["category"]][0]) / stats[entry["category"]][1] >= z_threshold
+    ]
+    return by_category, by_month, rolling, anomalies
+
+
+def python_cohort(entries, profile_ids):
+    totals = defaultdict(lambda: defaultdict(float))
+    monthly = defaultdict(lambda: defaultdict(float))
+    for entry, profile_id in zip(entries, profile_ids):
+        totals[entry["category"]][profile_id] += entry["amount"]
+        monthly[profile_id][entry["date"][:7]] += entry["amount"]
+    averages = sorted(sum(months.values()) / len(months) for months in monthly.values())
+    result = {"monthly": (sum(averages) / len(averages), averages[len(averages) // 2])}
+    for category, per_profile in totals.items():
+        values = sorted(per_profile.values())
+        result[category] = (sum(values) / len(values), values[len(values) // 2], values[int(0.9 * (len(values) - 1))])
+    return result
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    print(f"  {label:<34} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized vs. per-entry spending analytics")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--profiles", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"generating {args.entries:,} entries across {args.profiles:,} profiles")
+    entries, profile_ids = make_entries(args.entries, args.profiles)
+
+    print("single-profile insights")
+    timed("python loops", python_insights, entries)
+    frame = timed("vectorized: build frame", spending_frame, entries, profile_ids)
+    timed("vectorized: compute", compute_spending_insights, frame, 5000.0)
+
+    print("cohort stats")
+    timed("python loops", python_cohort, entries, profile_ids)
+    timed("vectorized: compute", compute_cohort_stats, frame)
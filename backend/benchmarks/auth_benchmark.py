@@ -0,0 +1,65 @@
+# Backend: benchmarks/auth_benchmark.py
+# Per-request cost of the auth dependencies (get_current_user +
+# get_current_active_user): a full JWT decode and user lookup on every call
+# vs. the verified-token and user caches. Uses the configured MongoDB by
+# default, or an in-memory embedded store (LocalClient) with --in-memory.
+#
+#   python benchmarks/auth_benchmark.py --in-memory --iterations 20000
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.dependencies import get_current_active_user, get_current_user
+from app.routers.auth import create_access_token
+from app.services.auth_service import DEFAULT_USERNAME, UserService, token_cache, user_cache
+
+
+async def connect(in_memory: bool):
+    if in_memory:
+        from app.local_store import LocalClient
+        database.client = LocalClient(":memory:")
+        database.db = database.client["auth_benchmark"]
+    else:
+        await database.connect_to_database()
+
+
+async def authenticate(token: str):
+    return await get_current_active_user(await get_current_user(token))
+
+
+async def time_calls(token: str, iterations: int, cached: bool) -> float:
+    user_cache.enabled = cached
+    token_cache.clear()
+    user_cache.clear()
+    await authenticate(token)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if not cached:
+            token_cache.clear()
+        await authenticate(token)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def main(args):
+    await connect(args.in_memory)
+    await UserService.ensure_default_user()
+    token = create_access_token({"sub": DEFAULT_USERNAME})
+    try:
+        uncached = await time_calls(token, args.iterations, cached=False)
+        cached = await time_calls(token, args.iterations, cached=True)
+        print(f"{'uncached':>10}  {uncached:>8.1f}us/request")
+        print(f"{'cached':>10}  {cached:>8.1f}us/request  ({uncached / cached:.1f}x)")
+    finally:
+        await database.close_database_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Auth dependency overhead per request")
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--in-memory", action="store_true", help="Use the embedded in-memory store instead of MONGO_URL")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,68 @@
+# Backend: benchmarks/chat_load_test.py
+# Drives POST /chat/{profile_id} at increasing concurrency against a running API.
+#
+#   python benchmarks/fake_llm_server.py --latency 1.0
+#   OPENAI_BASE_URL=http://127.0.0.1:9000/v1 uvicorn main:app
+#   python benchmarks/chat_load_test.py --profile-id <id> --concurrency 1 4 16
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/token", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_level(client: httpx.AsyncClient, token: str, profile_id: str, concurrency: int, total: int):
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in remaining:
+            start = time.perf_counter()
+            response = await client.post(
+                f"/chat/{profile_id}",
+                headers=headers,
+                json={"message": f"How much can I spend this month? ({i})"},
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"concurrency={concurrency:<4} requests={total:<5} errors={errors:<4} "
+        f"throughput={total / elapsed:7.2f} req/s  p50={statistics.median(latencies):.3f}s  p95={p95:.3f}s"
+    )
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.api_url, limits=limits, timeout=120) as client:
+        token = await login(client, args.username, args.password)
+        for level in args.concurrency:
+            await run_level(client, token, args.profile_id, level, args.requests or level * 4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chat throughput vs. concurrency")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--profile-id", required=True)
+    parser.add_argument("--username", default="testuser")
+    parser.add_argument("--password", default="testpassword")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=0, help="Requests per level (default: 4 x concurrency)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,250 @@
+# Backend: benchmarks/e2e_benchmark.py
+# End-to-end API benchmark. Runs main.py's app in process against an
+# in-memory embedded store (LocalClient), the fake LLM server and a stub sentiment
+# model, then drives a mixed workload at each concurrency level and reports
+# throughput and p50/p95/p99 per operation. Results are written as JSON so
+# runs from different commits can be compared.
+#
+#   python benchmarks/e2e_benchmark.py --concurrency 1 8 32 --duration 10 --output before.json
+#   python benchmarks/e2e_benchmark.py --concurrency 1 8 32 --duration 10 --output after.json --compare before.json
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Nothing external is contacted, but Settings still requires these
+for name, value in {
+    "MONGO_URL": "mongodb://unused", "DB_NAME": "e2e_benchmark", "SECRET_KEY": "benchmark-secret",
+    "ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "60", "OPENAI_API_KEY": "unused",
+    "API_URL": "http://unused",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx
+
+# Default mix: mostly chat, with the profile screens the frontend polls
+WORKLOAD = {"chat": 40, "get_profile": 20, "update_profile": 10, "history": 20, "list_all": 10}
+
+
+class StubSentimentModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def __call__(self, texts, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        time.sleep(self.latency)
+        return [{"label": "POSITIVE", "score": 0.9} for _ in texts]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[int(pct / 100 * (len(values) - 1))] if values else None
+
+
+def summarize(latencies, errors: int, elapsed: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p95_ms": percentile(latencies, 95) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def configure_stubs(args):
+    from app.config import settings
+    from app.database import database
+    from app.local_store import LocalClient
+    from app.services.openai_service import llm_backend
+    from app.services.sentiment_service import sentiment_engine
+    from benchmarks import fake_llm_server
+
+    async def connect_in_memory():
+        database.client = LocalClient(":memory:")
+        database.db = database.client[settings.DB_NAME]
+
+    database.connect_to_database = connect_in_memory
+    fake_llm_server.app.state.latency = args.llm_latency
+    fake_llm_server.app.state.jitter = args.llm_jitter
+    llm_backend.base_url = "http://fake-llm/v1"
+    llm_backend.transport = httpx.ASGITransport(app=fake_llm_server.app)
+    sentiment_engine.loader = lambda: StubSentimentModel(args.sentiment_latency)
+    settings.RESPONSE_CACHE_ENABLED = args.response_cache
+    # The workload logs in as the demo user
+    settings.CREATE_DEMO_USER = True
+
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, headers: dict, profile_ids, questions, rng: random.Random):
+        self.client = client
+        self.headers = headers
+        self.profile_ids = profile_ids
+        self.questions = questions
+        self.rng = rng
+
+    async def chat(self):
+        question = self.rng.choice(self.questions)
+        return await self.client.post(f"/chat/{self.rng.choice(self.profile_ids)}", headers=self.headers,
+                                      json={"message": f"{question} ({self.rng.random():.6f})"})
+
+    async def get_profile(self):
+        return await self.client.get(f"/get_profile/{self.rng.choice(self.profile_ids)}", headers=self.headers)
+
+    async def update_profile(self):
+        return await self.client.patch(f"/profiles/{self.rng.choice(self.profile_ids)}", headers=self.headers,
+                                       json={"savings": round(self.rng.uniform(0, 500000), 2)})
+
+    async def history(self):
+        return await self.client.get(f"/conversation_history/{self.rng.choice(self.profile_ids)}",
+                                     headers=self.headers, params={"limit": 20})
+
+    async def list_all(self):
+        return await self.client.get("/get_all_profiles", headers=self.headers)
+
+
+async def run_level(client, headers, profile_ids, questions, concurrency: int, duration: float, seed: int) -> dict:
+    operations = list(WORKLOAD)
+    weights = [WORKLOAD[name] for name in operations]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_seed: int):
+        rng = random.Random(worker_seed)
+        workload = Workload(client, headers, profile_ids, questions, rng)
+        while time.perf_counter() < deadline:
+            name = rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await getattr(workload, name)()
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - start)
+            errors[name] += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(seed * 100003 + concurrency * 1009 + i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    everything = [latency for values in latencies.values() for latency in values]
+    return {
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "overall": summarize(everything, sum(errors.values()), elapsed),
+        "operations": {name: summarize(latencies[name], errors[name], elapsed) for name in operations if latencies[name]},
+    }
+
+
+def print_level(level: dict):
+    print(f"\nconcurrency={level['concurrency']}")
+    print(f"  {'operation':<15} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, stats in [*level["operations"].items(), ("overall", level["overall"])]:
+        print(f"  {name:<15} {stats['requests']:>8} {stats['errors']:>6} {stats['throughput']:>8.1f} "
+              f"{stats['p50_ms']:>6.1f}ms {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms")
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    # Compares overall throughput and p95 per concurrency level; True if nothing regressed
+    baseline_levels = {level["concurrency"]: level for level in baseline["levels"]}
+    ok = True
+    print(f"\nCompared with {baseline['commit']} ({baseline['timestamp']}):")
+    if baseline["config"] != results["config"]:
+        print("  warning: the baseline was run with different settings")
+    for level in results["levels"]:
+        before = baseline_levels.get(level["concurrency"])
+        if before is None:
+            continue
+        throughput = level["overall"]["throughput"] / before["overall"]["throughput"] - 1
+        p95 = level["overall"]["p95_ms"] / before["overall"]["p95_ms"] - 1
+        regressed = throughput < -max_regression or p95 > max_regression
+        ok = ok and not regressed
+        print(f"  concurrency={level['concurrency']:<4} throughput {throughput:+.1%}  p95 {p95:+.1%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+async def main(args) -> int:
+    configure_stubs(args)
+    import main as api
+    from app.database import database
+    from app.services.intent_router import intent_router
+    from app.services.synthetic_data import QUESTIONS, seed_database
+
+    async with api.app.router.lifespan_context(api.app):
+        await seed_database(args.profiles, args.entries_per_profile, args.turns_per_profile, seed=args.seed,
+                            end_date=date(2024, 1, 1))
+        profile_ids = await database.db.profiles.distinct("_id")
+        profile_ids.sort()
+        limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://api",
+                                     limits=limits, timeout=120) as client:
+            response = await client.post("/token", data={"username": "testuser", "password": "testpassword"})
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            questions = list(QUESTIONS)
+            await run_level(client, headers, profile_ids, questions, 1, args.warmup, args.seed)
+            levels = []
+            for concurrency in args.concurrency:
+                level = await run_level(client, headers, profile_ids, questions, concurrency, args.duration, args.seed)
+                print_level(level)
+                levels.append(level)
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "workload": WORKLOAD,
+        "levels": levels,
+        "intent_router": intent_router.snapshot(),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            if not compare(results, json.load(f), args.max_regression):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mixed-workload API benchmark against in-process stubs")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of single-client warm-up")
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--entries-per-profile", type=int, default=100)
+    parser.add_argument("--turns-per-profile", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake LLM seconds per completion")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--sentiment-latency", type=float, default=0.01, help="Stub model seconds per batch")
+    parser.add_argument("--response-cache", action="store_true", help="Leave the advisor response cache on")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="Allowed throughput drop / p95 increase before --compare fails")
+    sys.exit(asyncio.run(main(parser.parse_args())))
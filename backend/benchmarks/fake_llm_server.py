@@ -0,0 +1,142 @@
+# Backend: benchmarks/fake_llm_server.py
+# OpenAI-compatible stub for load testing. Point the API at it with
+#   OPENAI_BASE_URL=http://127.0.0.1:9000/v1
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from typing import Optional
+from uuid import uuid4
+
+import json
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+class RateLimiter:
+    """Sliding one-minute window over requests and tokens, like OpenAI's limits.
+
+    Tokens are charged the way upstream does it: the prompt (about four
+    characters per token) plus ``max_tokens``.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = deque()
+        self.tokens = 0
+        self.stats = {"accepted": 0, "rate_limited": 0}
+
+    @staticmethod
+    def cost(body: dict) -> int:
+        prompt = sum(len(message.get("content") or "") // 4 + 1 for message in body.get("messages", []))
+        return prompt + (body.get("max_tokens") or 0)
+
+    def check(self, body: dict) -> Optional[float]:
+        # Returns None when accepted, otherwise seconds until it would be
+        now = time.monotonic()
+        while self.window and self.window[0][0] <= now - 60:
+            self.tokens -= self.window.popleft()[1]
+        cost = self.cost(body)
+        over_requests = self.requests_per_minute and len(self.window) >= self.requests_per_minute
+        over_tokens = self.tokens_per_minute and self.window and self.tokens + cost > self.tokens_per_minute
+        if over_requests or over_tokens:
+            self.stats["rate_limited"] += 1
+            return self.window[0][0] + 60 - now
+        self.window.append((now, cost))
+        self.tokens += cost
+        self.stats["accepted"] += 1
+        return None
+
+
+app = FastAPI(title="Fake LLM server")
+app.state.latency = 1.0
+app.state.jitter = 0.0
+app.state.first_token_latency = 0.2
+app.state.rate_limiter = RateLimiter()
+
+
+def make_reply(request_body: dict) -> str:
+    prompt = request_body.get("messages", [{}])[-1].get("content", "")
+    return (f"This is a canned advisor reply to a {len(prompt)} character prompt. "
+            "Keep an emergency fund, review your monthly budget, and talk to someone you trust before big decisions.")
+
+
+def make_usage(request_body: dict, completion_tokens: int) -> dict:
+    prompt_tokens = sum(len(message.get("content", "").split()) for message in request_body.get("messages", []))
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+async def stream_reply(body: dict, delay: float):
+    # First token after first_token_latency, the rest spread over the remaining delay
+    completion_id = f"chatcmpl-{uuid4().hex}"
+    words = make_reply(body).split(" ")
+    first = min(app.state.first_token_latency, delay)
+    await asyncio.sleep(first)
+    per_token = (delay - first) / max(len(words) - 1, 1)
+    for i, word in enumerate(words):
+        if i:
+            await asyncio.sleep(per_token)
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    if body.get("stream_options", {}).get("include_usage"):
+        usage = {**chunk, "choices": [], "usage": make_usage(body, len(words))}
+        yield f"data: {json.dumps(usage)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    retry_after = app.state.rate_limiter.check(body)
+    if retry_after is not None:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": str(math.ceil(retry_after))},
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+        )
+    delay = app.state.latency + random.uniform(0, app.state.jitter)
+    if body.get("stream"):
+        return StreamingResponse(stream_reply(body, delay), media_type="text/event-stream")
+    await asyncio.sleep(delay)
+    content = make_reply(body)
+    return {
+        "id": f"chatcmpl-{uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": make_usage(body, len(content.split())),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stub with adjustable latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=1.0, help="Base seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random seconds per completion")
+    parser.add_argument("--first-token-latency", type=float, default=0.2, help="Seconds to first streamed token")
+    parser.add_argument("--rpm", type=int, help="Requests per minute before answering 429")
+    parser.add_argument("--tpm", type=int, help="Tokens (prompt + max_tokens) per minute before answering 429")
+    args = parser.parse_args()
+    app.state.rate_limiter = RateLimiter(args.rpm, args.tpm)
+    app.state.latency = args.latency
+    app.state.jitter = args.jitter
+    app.state.first_token_latency = args.first_token_latency
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,112 @@
+# Backend: benchmarks/intent_router_benchmark.py
+# Accuracy and cost of the local intent router on a labelled sample of
+# client messages: per-intent accuracy, how many messages would skip the
+# LLM entirely, prompt size with and without section trimming, and the
+# classification time per message.
+#
+#   python benchmarks/intent_router_benchmark.py --iterations 20000
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import AdvisorContext
+from app.services.intent_router import IntentRouter
+from app.services.openai_service import build_prompt, estimate_tokens
+from app.services.synthetic_data import QUESTIONS
+
+# (message, expected intent, expected to be answered locally)
+SAMPLES = [
+    ("Show my spending this month", "spending", True),
+    ("How much did I spend on groceries last month?", "spending", True),
+    ("What did I spend on dining out this year?", "spending", True),
+    ("How much have I spent this month?", "spending", True),
+    ("How can I cut my grocery bills?", "spending", False),
+    ("How much can I spend monthly?", "spending", False),
+    ("Can I afford a trip this summer?", "general", False),
+    ("What are my savings?", "saving", True),
+    ("How much do I have in savings?", "saving", True),
+    ("How do I save for healthcare costs?", "saving", False),
+    ("Should I move my savings?", "saving", False),
+    ("Is my pension enough?", "saving", False),
+    ("How should I build an emergency fund?", "saving", False),
+    ("What are my debts?", "debt", True),
+    ("How much do I owe?", "debt", True),
+    ("Should I pay off my debt first?", "debt", False),
+    ("Is it worth refinancing my mortgage?", "debt", False),
+    ("What are my investments?", "investment", True),
+    ("Are bonds safer than stocks at my age?", "investment", False),
+    ("What is an index fund?", "investment", False),
+    ("Should I rebalance my portfolio?", "investment", False),
+    # Questions about a field that ask for more than its stored figure
+    ("What is the interest rate on my mortgage?", "debt", False),
+    ("What is my credit card APR?", "debt", False),
+    ("How many loans do I have", "debt", False),
+    ("Tell me about my retirement", "saving", False),
+    ("what is my savings goal", "saving", False),
+    ("what was my biggest purchase last month", "spending", False),
+    ("What are my stocks doing?", "investment", False),
+    ("Tell me my investment returns", "investment", False),
+    ("Hello!", "small_talk", True),
+    ("Thank you so much", "small_talk", True),
+    ("Good morning, how are you?", "small_talk", True),
+    ("Bye for now", "small_talk", True),
+    ("Hello, I lost my job", "general", False),
+    ("hey my wife died", "general", False),
+    ("Thanks, but I am still confused", "general", False),
+    ("My grandson is getting married next spring", "general", False),
+    ("I'm worried about the future", "general", False),
+]
+
+PROFILE = AdvisorContext(
+    id="benchmark", name="Alice", age=72, income=42000, savings=180000, debts=12000,
+    investments="Index funds and municipal bonds", financial_goals=["Travel", "Leave an inheritance"],
+)
+
+
+def main(args):
+    router = IntentRouter()
+    correct = Counter()
+    totals = Counter()
+    direct_correct = 0
+    direct = 0
+    for message, intent, expected_direct in SAMPLES:
+        route = router.route(message)
+        totals[intent] += 1
+        correct[intent] += route.intent == intent
+        direct += route.direct
+        direct_correct += route.direct == expected_direct
+        if args.verbose and (route.intent != intent or route.direct != expected_direct):
+            print(f"  mismatch: {message!r} -> {route.intent} direct={route.direct} "
+                  f"(expected {intent} direct={expected_direct})")
+
+    print(f"{'intent':<12} {'accuracy':>9}")
+    for intent in totals:
+        print(f"{intent:<12} {correct[intent]:>4}/{totals[intent]:<4}")
+    print(f"{'overall':<12} {sum(correct.values()):>4}/{len(SAMPLES):<4}  local-answer agreement "
+          f"{direct_correct}/{len(SAMPLES)}")
+
+    print(f"\nrouted to a specific intent: {router.snapshot()['hit_rate']:.0%}, "
+          f"answerable without the LLM: {direct / len(SAMPLES):.0%}")
+
+    full = slim = 0
+    for message, _, _ in SAMPLES:
+        full += estimate_tokens(build_prompt(PROFILE, message))
+        slim += estimate_tokens(build_prompt(PROFILE, message, router.classify(message).intent))
+    print(f"prompt tokens (estimated): {full} full, {slim} trimmed ({1 - slim / full:.0%} fewer)")
+
+    messages = [message for message, _, _ in SAMPLES] + QUESTIONS.tolist()
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        router.classify(messages[i % len(messages)])
+    print(f"classify: {(time.perf_counter() - start) / args.iterations * 1e6:.1f}us/message")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local intent router accuracy and overhead")
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--verbose", action="store_true", help="Print misclassified samples")
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+# Backend: benchmarks/profile_cache_benchmark.py
+# Counts MongoDB round-trips for a chat-heavy workload with the in-process
+# profile cache on and off. Each simulated turn reads the advisor context and
+# memory (as /chat does), checks the profile exists (as
+# /conversation_history does) and saves the turn. Concurrent clients talk to
+# a small set of profiles, so misses for the same profile get coalesced.
+#
+#   python benchmarks/profile_cache_benchmark.py --in-memory --profiles 20 --clients 50 --turns 20
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.models import UserProfile
+from app.services.memory_service import MemoryService
+from app.services.profile_cache import profile_cache
+from app.services.profile_service import ProfileService
+
+
+class CountingCollection:
+    def __init__(self, collection, counts: Counter):
+        self._collection = collection
+        self._counts = counts
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._counts[f"{self._collection.name}.{name}"] += 1
+            return attr(*args, **kwargs)
+        return call
+
+
+class CountingDatabase:
+    def __init__(self, db):
+        self._db = db
+        self.counts = Counter()
+
+    def __getattr__(self, name):
+        return CountingCollection(getattr(self._db, name), self.counts)
+
+    def __getitem__(self, name):
+        return CountingCollection(self._db[name], self.counts)
+
+
+async def connect(in_memory: bool):
+    if in_memory:
+        from app.local_store import LocalClient
+        database.client = LocalClient(":memory:")
+        database.db = database.client["profile_cache_benchmark"]
+    else:
+        await database.connect_to_database()
+
+
+async def chat_turn(profile_id: str, i: int):
+    await asyncio.gather(
+        ProfileService.get_advisor_context(profile_id),
+        MemoryService.get_memory(profile_id),
+    )
+    await ProfileService.profile_exists(profile_id)
+    await ProfileService.save_conversation(profile_id, f"Question {i}", "Advisor answer.", datetime.now().isoformat())
+
+
+async def client(profile_ids, turns: int, rng: random.Random):
+    for i in range(turns):
+        await chat_turn(rng.choice(profile_ids), i)
+
+
+async def run(profile_ids, args, enabled: bool):
+    profile_cache.clear()
+    profile_cache.enabled = enabled
+    counting = CountingDatabase(database.db)
+    real_db, database.db = database.db, counting
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(client(profile_ids, args.turns, random.Random(rng.random())) for _ in range(args.clients)))
+    finally:
+        database.db = real_db
+    elapsed = time.perf_counter() - start
+    return counting.counts, elapsed
+
+
+async def main(args):
+    await connect(args.in_memory)
+    profile_ids = []
+    for i in range(args.profiles):
+        profile = await ProfileService.create_profile(UserProfile(
+            name=f"Benchmark {i}", age=70 + i % 20, income=24000, savings=50000, debts=2000,
+            investments="Bonds", financial_goals=["Stay debt free"],
+        ))
+        profile_ids.append(profile.id)
+    try:
+        total_turns = args.clients * args.turns
+        print(f"{total_turns} turns, {args.clients} clients, {args.profiles} profiles")
+        print(f"{'cache':>6}  {'round-trips':>11}  {'per turn':>8}  {'reads':>6}  {'seconds':>7}")
+        for enabled in (False, True):
+            counts, elapsed = await run(profile_ids, args, enabled)
+            reads = sum(n for op, n in counts.items() if op.endswith((".find_one", ".find")))
+            total = sum(counts.values())
+            print(f"{'on' if enabled else 'off':>6}  {total:>11}  {total / total_turns:>8.2f}  {reads:>6}  {elapsed:>7.2f}")
+        print(f"cache stats: {profile_cache.snapshot()}")
+    finally:
+        await database.db.profiles.delete_many({"_id": {"$in": profile_ids}})
+        await database.db.conversations.delete_many({"profile_id": {"$in": profile_ids}})
+        await database.db.conversation_memory.delete_many({"_id": {"$in": profile_ids}})
+        await database.close_database_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MongoDB round-trips per chat turn with and without the profile cache")
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=20, help="Turns per client")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--in-memory", action="store_true", help="Use the embedded in-memory store instead of MONGO_URL")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+# Backend: benchmarks/profile_read_benchmark.py
+# Shows the per-turn profile read cost of /chat as conversation history grows:
+# the old full-document get_profile vs. the projected get_advisor_context.
+# Uses the configured MongoDB by default, or an in-memory embedded store (LocalClient) with
+# --in-memory.
+#
+#   python benchmarks/profile_read_benchmark.py --turns 0 100 1000 10000
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.models import UserProfile
+from app.services.profile_cache import profile_cache
+from app.services.profile_service import ProfileService
+
+
+async def connect(in_memory: bool):
+    if in_memory:
+        from app.local_store import LocalClient
+        database.client = LocalClient(":memory:")
+        database.db = database.client["profile_read_benchmark"]
+    else:
+        await database.connect_to_database()
+
+
+async def grow_history(profile_id: str, current: int, target: int):
+    turns = [
+        {"user": f"Question {i} about my pension", "bot": "A reasonably long advisor answer. " * 20,
+         "timestamp": f"2024-01-01T00:00:{i % 60:02d}"}
+        for i in range(current, target)
+    ]
+    if turns:
+        await database.db.profiles.update_one({"_id": profile_id}, {"$push": {"conversation_history": {"$each": turns}}})
+
+
+async def time_reads(read, profile_id: str, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await read(profile_id)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main(args):
+    await connect(args.in_memory)
+    # Time the store reads themselves, not profile cache hits
+    profile_cache.enabled = False
+    profile = await ProfileService.create_profile(UserProfile(
+        name="Benchmark", age=72, income=24000, savings=50000, debts=2000,
+        investments="Bonds", financial_goals=["Stay debt free"],
+    ))
+    try:
+        current = 0
+        print(f"{'turns':>7}  {'get_profile':>12}  {'get_advisor_context':>20}")
+        for target in sorted(args.turns):
+            await grow_history(profile.id, current, target)
+            current = target
+            full = await time_reads(ProfileService.get_profile, profile.id, args.iterations)
+            projected = await time_reads(ProfileService.get_advisor_context, profile.id, args.iterations)
+            print(f"{target:>7}  {full:>10.2f}ms  {projected:>18.2f}ms")
+    finally:
+        await database.db.profiles.delete_one({"_id": profile.id})
+        await database.close_database_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile read latency vs. conversation history size")
+    parser.add_argument("--turns", type=int, nargs="+", default=[0, 100, 1000, 10000])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--in-memory", action="store_true", help="Use the embedded in-memory store instead of MONGO_URL")
+    asyncio.run(main(parser.parse_args()))
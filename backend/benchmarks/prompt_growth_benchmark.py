@@ -0,0 +1,94 @@
+# Backend: benchmarks/prompt_growth_benchmark.py
+# Simulates a long advisor session and reports prompt size and assembly time.
+# "naive" sends the profile prompt plus the full history; "budgeted" uses
+# MemoryService and build_messages under PROMPT_TOKEN_BUDGET. With
+# --llm-url, each prompt is also sent to an OpenAI-compatible endpoint (for
+# example benchmarks/fake_llm_server.py) to time the completion.
+#
+#   python benchmarks/prompt_growth_benchmark.py --turns 1000 --in-memory
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.models import AdvisorContext
+from app.services.memory_service import MemoryService
+from app.services.openai_service import SYSTEM_PROMPT, build_messages, build_prompt, estimate_tokens
+
+PROFILE = AdvisorContext(
+    id="prompt-growth-benchmark", name="Benchmark", age=74, income=21000, savings=40000,
+    debts=3000, investments="Bonds", financial_goals=["Stay debt free", "Help grandchildren"],
+)
+
+
+def naive_messages(history, message):
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for turn in history:
+        messages += [{"role": "user", "content": turn["user"]}, {"role": "assistant", "content": turn["bot"]}]
+    return messages + [{"role": "user", "content": build_prompt(PROFILE, message)}]
+
+
+def prompt_tokens(messages):
+    return sum(estimate_tokens(message["content"]) for message in messages)
+
+
+async def main(args):
+    if args.in_memory:
+        from app.local_store import LocalClient
+        database.client = LocalClient(":memory:")
+        database.db = database.client["prompt_growth_benchmark"]
+    else:
+        await database.connect_to_database()
+
+    llm = None
+    if args.llm_url:
+        from openai import AsyncOpenAI
+        llm = AsyncOpenAI(api_key="benchmark", base_url=args.llm_url)
+
+    async def llm_latency(messages):
+        start = time.perf_counter()
+        await llm.chat.completions.create(model="benchmark", messages=messages, max_tokens=200)
+        return (time.perf_counter() - start) * 1000
+
+    await database.db.conversation_memory.delete_one({"_id": PROFILE.id})
+    history = []
+    checkpoints = {n for n in (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000) if n <= args.turns} | {args.turns}
+    header = f"{'turns':>6} {'naive tok':>10} {'budget tok':>11} {'naive build':>12} {'budget build':>13}"
+    print(header + (f" {'naive llm':>10} {'budget llm':>11}" if llm else ""))
+    try:
+        for i in range(1, args.turns + 1):
+            message = f"Turn {i}: can I afford to help my grandson with his rent this month?"
+            reply = "Let's look at your budget together. " * 12
+            timestamp = f"2024-01-01T00:00:00.{i:06d}"
+
+            if i in checkpoints:
+                start = time.perf_counter()
+                naive = naive_messages(history, message)
+                naive_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                memory = await MemoryService.get_memory(PROFILE.id)
+                budgeted = build_messages(PROFILE, message, memory)
+                budget_ms = (time.perf_counter() - start) * 1000
+                line = (f"{i:>6} {prompt_tokens(naive):>10} {prompt_tokens(budgeted):>11} "
+                        f"{naive_ms:>10.2f}ms {budget_ms:>11.2f}ms")
+                if llm:
+                    line += f" {await llm_latency(naive):>8.0f}ms {await llm_latency(budgeted):>9.0f}ms"
+                print(line)
+
+            history.append({"user": message, "bot": reply, "timestamp": timestamp})
+            await MemoryService.record_turn(PROFILE.id, message, reply, timestamp)
+    finally:
+        await database.db.conversation_memory.delete_one({"_id": PROFILE.id})
+        await database.close_database_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prompt size and latency over long sessions")
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--in-memory", action="store_true", help="Use the embedded in-memory store instead of MONGO_URL")
+    parser.add_argument("--llm-url", default=None, help="OpenAI-compatible base URL to time completions against")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+# Backend: benchmarks/scheduler_benchmark.py
+# Burst test for the LLM scheduler. Runs main.py's app in process (in-memory
+# LocalClient, stub sentiment model) against the fake LLM server with its own
+# tokens-per-minute limit. One chatty profile keeps many requests in flight
+# while every other profile sends one at a time; clients that get a 429 wait
+# for its Retry-After. Reports, per group, completed requests, requests shed
+# by the API (429), upstream failures (5xx) and latency, plus the upstream
+# limiter's and the scheduler's counters.
+#
+#   python benchmarks/scheduler_benchmark.py --upstream-tpm 30000
+#   python benchmarks/scheduler_benchmark.py --upstream-tpm 30000 --no-scheduler
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def configure(args):
+    # Settings are read once at import, so these must be set before the app loads
+    os.environ["LLM_SCHEDULER_ENABLED"] = str(args.scheduler).lower()
+    os.environ["LLM_TOKENS_PER_MINUTE"] = str(int(args.upstream_tpm * args.budget_fraction))
+    os.environ["LLM_QUEUE_TIMEOUT"] = str(args.queue_timeout)
+    os.environ["OPENAI_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    # Upstream 429s should surface instead of being retried inside the client
+    os.environ["OPENAI_MAX_RETRIES"] = "0"
+    os.environ["INTENT_ROUTER_LOCAL_ANSWERS"] = "false"
+
+
+async def sender(client, headers, profile_id: str, group: str, deadline: float, results, questions, index: int):
+    i = 0
+    while time.perf_counter() < deadline:
+        i += 1
+        start = time.perf_counter()
+        response = await client.post(f"/chat/{profile_id}", headers=headers,
+                                      json={"message": f"{questions[(index + i) % len(questions)]} ({index}.{i})"})
+        elapsed = time.perf_counter() - start
+        if response.status_code == 200:
+            results[group]["ok"].append(elapsed)
+        elif response.status_code == 429:
+            results[group]["shed"] += 1
+            await asyncio.sleep(min(float(response.headers.get("retry-after", 1)), max(deadline - time.perf_counter(), 0)))
+        else:
+            results[group]["failed"] += 1
+
+
+def report(results: dict, elapsed: float):
+    from benchmarks.e2e_benchmark import percentile
+    print(f"  {'group':<8} {'ok':>6} {'shed':>6} {'failed':>7} {'ok/s':>7} {'p50':>8} {'p95':>8}")
+    for group, stats in results.items():
+        ok = stats["ok"]
+        p50 = f"{percentile(ok, 50) * 1000:6.0f}ms" if ok else "     -"
+        p95 = f"{percentile(ok, 95) * 1000:6.0f}ms" if ok else "     -"
+        print(f"  {group:<8} {len(ok):>6} {stats['shed']:>6} {stats['failed']:>7} {len(ok) / elapsed:>7.2f} {p50:>8} {p95:>8}")
+
+
+async def main(args):
+    configure(args)
+    from benchmarks.e2e_benchmark import configure_stubs
+    configure_stubs(args)
+    import httpx
+    import main as api
+    from app.database import database
+    from app.services.llm_scheduler import llm_scheduler
+    from app.services.synthetic_data import QUESTIONS, seed_database
+    from benchmarks import fake_llm_server
+
+    fake_llm_server.app.state.rate_limiter = fake_llm_server.RateLimiter(tokens_per_minute=args.upstream_tpm)
+    results = defaultdict(lambda: {"ok": [], "shed": 0, "failed": 0})
+    async with api.app.router.lifespan_context(api.app):
+        await seed_database(args.profiles + 1, 30, 0, seed=args.seed, end_date=date(2024, 1, 1))
+        profile_ids = sorted(await database.db.profiles.distinct("_id"))
+        chatty, others = profile_ids[0], profile_ids[1:]
+        transport = httpx.ASGITransport(app=api.app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=120) as client:
+            response = await client.post("/token", data={"username": "testuser", "password": "testpassword"})
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            questions = QUESTIONS.tolist()
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(
+                *(sender(client, headers, chatty, "chatty", deadline, results, questions, i)
+                  for i in range(args.chatty_concurrency)),
+                *(sender(client, headers, profile_id, "others", deadline, results, questions, i)
+                  for i, profile_id in enumerate(others)),
+            )
+            elapsed = time.perf_counter() - start
+
+    print(f"scheduler={'on' if args.scheduler else 'off'}  upstream tpm={args.upstream_tpm}  "
+          f"max concurrency={args.max_concurrency}  duration={elapsed:.1f}s")
+    report(results, elapsed)
+    print(f"  upstream: {json.dumps(fake_llm_server.app.state.rate_limiter.stats)}")
+    if args.scheduler:
+        print(f"  scheduler: {json.dumps(llm_scheduler.snapshot())}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chat burst against a rate-limited fake LLM")
+    parser.add_argument("--scheduler", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--profiles", type=int, default=8, help="Profiles sending one request at a time")
+    parser.add_argument("--chatty-concurrency", type=int, default=24, help="Requests the chatty profile keeps in flight")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--upstream-tpm", type=int, default=30000, help="Fake LLM tokens-per-minute limit")
+    parser.add_argument("--budget-fraction", type=float, default=0.95,
+                        help="Scheduler budget as a fraction of the upstream limit")
+    parser.add_argument("--queue-timeout", type=float, default=10.0)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--sentiment-latency", type=float, default=0.005)
+    parser.add_argument("--response-cache", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+# Backend: benchmarks/sentiment_benchmark.py
+# Compares per-call sentiment inference on the event loop (the old path) with
+# the micro-batching SentimentBatcher. Uses a stub model by default; pass
+# --model to load a real transformers pipeline instead.
+#
+#   python benchmarks/sentiment_benchmark.py --messages 2000 --rate 500
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubAnalyzer:
+    """Mimics transformer inference cost: fixed per-call overhead plus per-item work."""
+
+    def __init__(self, overhead: float, per_item: float):
+        self.overhead = overhead
+        self.per_item = per_item
+
+    def __call__(self, texts, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        time.sleep(self.overhead + self.per_item * len(texts))
+        return [{"label": "POSITIVE", "score": 0.99} for _ in texts]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[int(pct / 100 * (len(values) - 1))]
+
+
+async def drive(analyze, messages: int, rate: float):
+    # Open-loop arrivals: latency is measured from each message's scheduled
+    # arrival time, so time spent waiting on a blocked event loop counts.
+    latencies = []
+    start = time.perf_counter()
+
+    async def one(i, arrival):
+        await analyze(f"I am worried about my pension payment number {i}")
+        latencies.append(time.perf_counter() - arrival)
+
+    tasks = []
+    for i in range(messages):
+        arrival = start + i / rate
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i, arrival)))
+    await asyncio.gather(*tasks)
+    return messages / (time.perf_counter() - start), percentile(latencies, 99)
+
+
+async def main(args):
+    from app.services.sentiment_service import SentimentBatcher
+
+    if args.model:
+        from transformers import pipeline
+        analyzer = pipeline("sentiment-analysis", model=args.model)
+    else:
+        analyzer = StubAnalyzer(args.overhead_ms / 1000, args.per_item_ms / 1000)
+
+    async def per_call(text):
+        result = analyzer(text)[0]
+        return result["label"], result["score"]
+
+    batcher = SentimentBatcher(analyzer, max_batch_size=args.batch_size, max_wait=args.max_wait_ms / 1000)
+
+    for name, analyze in (("per-call (old)", per_call), ("micro-batched", batcher.analyze)):
+        rate, p99 = await drive(analyze, args.messages, args.rate)
+        print(f"{name:<16} {rate:9.1f} msg/s   p99={p99 * 1000:8.1f} ms")
+    await batcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentiment throughput and p99 latency")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=500.0, help="Offered load in messages/sec")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--overhead-ms", type=float, default=8.0, help="Stub cost per model call")
+    parser.add_argument("--per-item-ms", type=float, default=0.5, help="Stub cost per message")
+    parser.add_argument("--model", default=None, help="Real transformers model to benchmark instead of the stub")
+    asyncio.run(main(parser.parse_args()))
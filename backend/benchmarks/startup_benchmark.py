@@ -0,0 +1,63 @@
+# Backend: benchmarks/startup_benchmark.py
+# Measures cold start of the API: import time of main.py, time until the
+# server answers its first request, and time until /health/ready reports warm
+# models. Runs once with the startup warm-up task and once without.
+#
+#   python benchmarks/startup_benchmark.py
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import_time() -> float:
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=BACKEND_DIR)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def poll(url: str, deadline: float, ok_statuses=(200,)) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code in ok_statuses:
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} did not respond in time")
+
+
+def measure_server(port: int, warm_up: bool, timeout: float):
+    env = dict(os.environ, WARM_UP_ON_STARTUP=str(warm_up).lower())
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        deadline = start + timeout
+        first_response = poll(f"{base_url}/health/live", deadline) - start
+        ready = poll(f"{base_url}/health/ready", deadline) - start
+        return first_response, ready
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API cold start timings")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    print(f"import main:                {measure_import_time():.3f}s")
+    for warm_up in (False, True):
+        first_response, ready = measure_server(args.port, warm_up, args.timeout)
+        label = "with warm-up" if warm_up else "lazy (no warm-up)"
+        print(f"{label:<18} first response: {first_response:.3f}s  ready: {ready:.3f}s")
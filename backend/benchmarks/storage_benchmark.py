@@ -0,0 +1,103 @@
+# Backend: benchmarks/storage_benchmark.py
+# Compares storage backends on the ProfileService operations the API uses:
+# the embedded local store (SQLite file) and, with --backends local mongo,
+# MongoDB at --mongo-url. The profile cache is disabled so every call reaches
+# the backend.
+#
+#   python benchmarks/storage_benchmark.py --profiles 1000
+#   python benchmarks/storage_benchmark.py --backends local mongo --mongo-url mongodb://localhost:27017
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.local_store import LocalClient
+from app.models import ProfileUpdate
+from app.services.profile_cache import profile_cache
+from app.services.profile_service import ProfileService
+from app.services.synthetic_data import seed_database
+
+
+def open_backend(name: str, args, workdir: str):
+    if name == "local":
+        return LocalClient(os.path.join(workdir, "storage_benchmark.sqlite3"))
+    if name == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(args.mongo_url)
+    raise ValueError(f"Unknown backend {name!r}")
+
+
+def operations(profile_ids, rng: random.Random):
+    turn = iter(range(10 ** 9))
+    return {
+        "get_advisor_context": lambda: ProfileService.get_advisor_context(rng.choice(profile_ids)),
+        "get_profile": lambda: ProfileService.get_profile(rng.choice(profile_ids)),
+        "patch_profile": lambda: ProfileService.patch_profile(rng.choice(profile_ids), ProfileUpdate(savings=rng.random())),
+        "save_conversation": lambda: ProfileService.save_conversation(
+            rng.choice(profile_ids), "How am I doing?", "Fine.", f"2024-06-01T00:00:00.{next(turn):09d}"),
+        "history_page": lambda: ProfileService.get_conversation_page(rng.choice(profile_ids), 20),
+        "list_profiles": lambda: ProfileService.list_profiles({}, "name", rng.randrange(len(profile_ids)), 20),
+    }
+
+
+async def time_operation(operation, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await operation()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.median(samples) * 1e6, samples[int(0.95 * (len(samples) - 1))] * 1e6
+
+
+async def run_backend(name: str, args, workdir: str) -> dict:
+    database.client = open_backend(name, args, workdir)
+    database.db = database.client["storage_benchmark"]
+    try:
+        await database.db.conversations.create_index([("profile_id", 1), ("timestamp", -1)])
+        start = time.perf_counter()
+        await seed_database(args.profiles, args.entries_per_profile, args.turns_per_profile, seed=args.seed,
+                            end_date=date(2024, 1, 1))
+        results = {"seed": (time.perf_counter() - start) * 1e6, "operations": {}}
+        profile_ids = sorted(await database.db.profiles.distinct("_id"))
+        for operation, call in operations(profile_ids, random.Random(args.seed)).items():
+            results["operations"][operation] = await time_operation(call, args.iterations)
+        return results
+    finally:
+        for collection in ("profiles", "conversations", "conversation_memory"):
+            await database.db[collection].delete_many({})
+        await database.close_database_connection()
+
+
+async def main(args):
+    profile_cache.enabled = False
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {name: await run_backend(name, args, workdir) for name in args.backends}
+    print(f"{args.profiles} profiles, {args.entries_per_profile} spending entries and "
+          f"{args.turns_per_profile} turns each; median / p95 per call")
+    print(f"{'operation':<22}" + "".join(f"{name:>24}" for name in results))
+    print(f"{'seed (total)':<22}" + "".join(f"{r['seed'] / 1e6:>23.2f}s" for r in results.values()))
+    for operation in next(iter(results.values()))["operations"]:
+        row = "".join(f"{r['operations'][operation][0]:>12.0f}us {r['operations'][operation][1]:>8.0f}us"
+                      for r in results.values())
+        print(f"{operation:<22}{row}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ProfileService latency per storage backend")
+    parser.add_argument("--backends", nargs="+", default=["local"], choices=["local", "mongo"])
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--profiles", type=int, default=1000)
+    parser.add_argument("--entries-per-profile", type=int, default=50)
+    parser.add_argument("--turns-per-profile", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,55 @@
+# Backend: benchmarks/ttft_benchmark.py
+# Time to first token: blocking POST /chat/{id} vs. streaming
+# POST /chat/{id}/stream. Run the API against the streaming stub:
+#
+#   python benchmarks/fake_llm_server.py --latency 2.0 --first-token-latency 0.2
+#   OPENAI_BASE_URL=http://127.0.0.1:9000/v1 uvicorn main:app
+#   python benchmarks/ttft_benchmark.py --profile-id <id>
+import argparse
+import statistics
+import time
+
+import httpx
+
+
+def blocking(client: httpx.Client, headers: dict, profile_id: str, message: str):
+    start = time.perf_counter()
+    response = client.post(f"/chat/{profile_id}", headers=headers, json={"message": message})
+    response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    # Nothing is shown until the whole reply arrives
+    return elapsed, elapsed
+
+
+def streaming(client: httpx.Client, headers: dict, profile_id: str, message: str):
+    start = time.perf_counter()
+    first_token = None
+    with client.stream("POST", f"/chat/{profile_id}/stream", headers=headers, json={"message": message}) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if first_token is None and line == "event: token":
+                first_token = time.perf_counter() - start
+    return first_token, time.perf_counter() - start
+
+
+def main(args):
+    with httpx.Client(base_url=args.api_url, timeout=120) as client:
+        token = client.post("/token", data={"username": args.username, "password": args.password}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        print(f"{'mode':<10} {'ttft p50':>10} {'ttft max':>10} {'total p50':>10}")
+        for name, run in (("blocking", blocking), ("streaming", streaming)):
+            samples = [run(client, headers, args.profile_id, f"Should I pay off my debt first? ({i})")
+                       for i in range(args.requests)]
+            ttft = [sample[0] for sample in samples]
+            total = [sample[1] for sample in samples]
+            print(f"{name:<10} {statistics.median(ttft):>9.3f}s {max(ttft):>9.3f}s {statistics.median(total):>9.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chat time-to-first-token")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--profile-id", required=True)
+    parser.add_argument("--username", default="testuser")
+    parser.add_argument("--password", default="testpassword")
+    parser.add_argument("--requests", type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,82 @@
+# Backend: benchmarks/write_amplification_benchmark.py
+# Cost of adding one spending entry to a large profile: the old
+# read-modify-$set of the whole spending_data array vs. a versioned $push.
+# Reports the BSON bytes sent per write and the median latency.
+#
+#   python benchmarks/write_amplification_benchmark.py --sizes 1000 10000 50000
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+import bson
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.models import SpendingEntry
+from app.services.profile_service import ProfileService
+from app.services.synthetic_data import generate_spending
+
+NEW_ENTRY = SpendingEntry(date="2024-06-30", category="Groceries", amount=42.5, description="Weekly shop")
+
+
+async def old_append(profile_id: str) -> int:
+    # What update_profile / generate_synthetic_spending_data used to do
+    profile = await database.db.profiles.find_one({"_id": profile_id}, {"spending_data": 1})
+    update = {"$set": {"spending_data": profile["spending_data"] + [NEW_ENTRY.dict()]}}
+    await database.db.profiles.update_one({"_id": profile_id}, update)
+    return len(bson.encode(update))
+
+
+async def new_append(profile_id: str) -> int:
+    update = {"$push": {"spending_data": {"$each": [NEW_ENTRY.dict()]}}, "$inc": {"version": 1}}
+    await ProfileService.append_spending(profile_id, [NEW_ENTRY])
+    return len(bson.encode(update))
+
+
+async def measure(write, profile_id: str, iterations: int):
+    samples, sizes = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        sizes.append(await write(profile_id))
+        samples.append(time.perf_counter() - start)
+    return statistics.median(sizes), statistics.median(samples) * 1000
+
+
+async def main(args):
+    if args.in_memory:
+        from app.local_store import LocalClient
+        database.client = LocalClient(":memory:")
+        database.db = database.client["write_amplification_benchmark"]
+    else:
+        await database.connect_to_database()
+
+    rng = np.random.default_rng(0)
+    print(f"{'entries':>8} {'$set bytes':>12} {'$push bytes':>12} {'$set ms':>9} {'$push ms':>9}")
+    try:
+        for size in args.sizes:
+            profile_id = f"write-amplification-{size}"
+            await database.db.profiles.replace_one(
+                {"_id": profile_id},
+                {"name": "Benchmark", "version": 1, "spending_data": generate_spending(rng, size, date(2024, 6, 30), 365)},
+                upsert=True,
+            )
+            old_bytes, old_ms = await measure(old_append, profile_id, args.iterations)
+            new_bytes, new_ms = await measure(new_append, profile_id, args.iterations)
+            print(f"{size:>8} {old_bytes:>12,} {new_bytes:>12,} {old_ms:>9.2f} {new_ms:>9.2f}")
+            await database.db.profiles.delete_one({"_id": profile_id})
+    finally:
+        await database.close_database_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write amplification of spending appends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--in-memory", action="store_true", help="Use the embedded in-memory store instead of MONGO_URL")
+    asyncio.run(main(parser.parse_args()))
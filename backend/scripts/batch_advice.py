@@ -0,0 +1,269 @@
+# Backend: scripts/batch_advice.py
+# Offline batch mode for advisor check-ins. Streams a JSONL file of
+# {"profile_id": ..., "message": ...} records (an optional "id" is copied to
+# the output), loads each chunk's profiles and conversation memory with one
+# query apiece, and runs generation at --concurrency with the LLM
+# scheduler's "batch" priority. Sentiment goes through the shared batcher and
+# turns are saved through the bulk conversation writer. Results are written
+# as JSONL in input order.
+#
+# Memory use is bounded by --chunk-size and --concurrency, whatever the input
+# size. Every --checkpoint-every records the output is flushed and the next
+# input line is recorded in <output>.checkpoint. --resume continues from
+# there: the output is truncated to the checkpointed size. Turn ids are
+# derived from the input line, so a record whose turn was saved after the
+# checkpoint is not generated again: its stored reply is written instead.
+#
+#   python scripts/batch_advice.py checkins.jsonl --output advice.jsonl --concurrency 16
+#   python scripts/batch_advice.py checkins.jsonl --output advice.jsonl --resume
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.models import UserInput
+from app.services.ai_service import AIService
+from app.services.bulk_writer import conversation_writer
+from app.services.intent_router import intent_router
+from app.services.llm_scheduler import SchedulerOverloaded
+from app.services.memory_service import MemoryService
+from app.services.openai_service import LLMTimeoutError, llm_backend
+from app.services.profile_service import ProfileService
+from app.services.sentiment_service import analyze_sentiment, sentiment_engine
+
+
+def read_records(path: str, start_line: int, chunk_size: int) -> Iterator[Tuple[List[tuple], int]]:
+    """Yields chunks of (line number, record or None if unparseable, error) and the bytes read so far."""
+    chunk = []
+    position = 0
+    with open(path, "rb") as f:
+        for line_number, raw in enumerate(f):
+            position += len(raw)
+            if line_number < start_line or not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+                if not isinstance(record, dict) or not record.get("profile_id") or not record.get("message"):
+                    raise ValueError("records need profile_id and message")
+                chunk.append((line_number, record, ""))
+            except ValueError as e:
+                chunk.append((line_number, None, str(e)))
+            if len(chunk) >= chunk_size:
+                yield chunk, position
+                chunk = []
+    if chunk:
+        yield chunk, position
+
+
+def turn_id(input_path: str, line_number: int) -> str:
+    # Stable across runs over the same file, so a resumed run can't save a turn twice
+    digest = hashlib.sha1(os.path.abspath(input_path).encode()).hexdigest()[:12]
+    return f"batch:{digest}:{line_number}"
+
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, state: dict):
+        # Written to a temporary file and renamed, so a crash leaves the old or the new checkpoint
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+
+
+class BatchRunner:
+    def __init__(self, args):
+        self.args = args
+        self.checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint")
+        self.slots = asyncio.Semaphore(args.concurrency)
+        self.stats = {"processed": 0, "succeeded": 0, "failed": 0, "duplicates": 0}
+        self.next_line = 0
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.bytes_read = 0
+        self.total_bytes = os.path.getsize(args.input)
+
+    async def advise(self, line_number: int, record: Optional[dict], error: str, context, memory,
+                     saved_turn: Optional[dict]) -> dict:
+        result = {"line": line_number}
+        if record is None:
+            return {**result, "error": f"invalid record: {error}"}
+        if "id" in record:
+            result["id"] = record["id"]
+        result.update(profile_id=record["profile_id"], message=record["message"])
+        if context is None:
+            return {**result, "error": "profile not found"}
+        this_turn = turn_id(self.args.input, line_number)
+        try:
+            if saved_turn is None:
+                response, sentiment, confidence = await self.generate(context, record, memory)
+                timestamp = datetime.now().isoformat()
+                if not await ProfileService.save_conversation(
+                        record["profile_id"], record["message"], response, timestamp, this_turn):
+                    # Saved by a concurrent run meanwhile; the stored reply is the one on record
+                    saved_turn = (await ProfileService.load_saved_turns([this_turn]))[this_turn]
+            else:
+                # Saved after the last checkpoint: no second LLM call, and the output matches the stored turn
+                sentiment, confidence = await analyze_sentiment(record["message"])
+            if saved_turn is not None:
+                self.stats["duplicates"] += 1
+                await ProfileService.complete_saved_turn(saved_turn)
+                response, timestamp = saved_turn["bot"], saved_turn["timestamp"]
+        except (LLMTimeoutError, SchedulerOverloaded) as e:
+            return {**result, "error": str(e)}
+        except Exception as e:
+            return {**result, "error": f"{type(e).__name__}: {e}"}
+        return {**result, "response": response, "sentiment": sentiment, "confidence": confidence,
+                "timestamp": timestamp}
+
+    async def generate(self, context, record: dict, memory) -> Tuple[str, str, float]:
+        for attempt in range(self.args.max_retries + 1):
+            try:
+                return await AIService.process_user_input(
+                    context, UserInput(message=record["message"]), memory=memory, priority="batch")
+            except SchedulerOverloaded as e:
+                if attempt == self.args.max_retries:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+    async def advise_bounded(self, *args) -> dict:
+        try:
+            return await self.advise(*args)
+        finally:
+            self.slots.release()
+
+    def write(self, output, result: dict):
+        output.write(json.dumps(result) + "\n")
+        self.stats["processed"] += 1
+        self.stats["failed" if "error" in result else "succeeded"] += 1
+        self.next_line = result["line"] + 1
+        if self.stats["processed"] % self.args.checkpoint_every == 0:
+            self.save_checkpoint(output)
+        now = time.perf_counter()
+        if now - self.last_report >= self.args.progress_every:
+            self.last_report = now
+            self.report(now)
+
+    def save_checkpoint(self, output):
+        output.flush()
+        os.fsync(output.fileno())
+        self.checkpoint.save({
+            "input": os.path.abspath(self.args.input),
+            "next_line": self.next_line,
+            "output_bytes": output.tell(),
+        })
+
+    def report(self, now: float):
+        elapsed = now - self.started
+        rate = self.stats["processed"] / elapsed if elapsed else 0.0
+        done = self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+        print(f"[{elapsed:7.1f}s] {self.stats['processed']} records ({self.stats['failed']} failed), "
+              f"{rate:.1f} records/s, ~{done:.0%} of input read", file=sys.stderr, flush=True)
+
+    async def drain(self, pending: deque, output, keep: int):
+        # Results are written in input order; at most ``keep`` finished or running tasks stay queued
+        while pending and (len(pending) > keep or pending[0].done()):
+            self.write(output, await pending[0])
+            pending.popleft()
+
+    async def run(self, output, start_line: int):
+        pending = deque()
+        max_pending = self.args.concurrency * 4
+        try:
+            for chunk, bytes_read in read_records(self.args.input, start_line, self.args.chunk_size):
+                self.bytes_read = bytes_read
+                profile_ids = {record["profile_id"] for _, record, _ in chunk if record is not None}
+                turn_ids = [turn_id(self.args.input, line_number) for line_number, record, _ in chunk if record is not None]
+                contexts, memories, saved_turns = await asyncio.gather(
+                    ProfileService.load_advisor_contexts(profile_ids),
+                    MemoryService.load_memories(profile_ids),
+                    ProfileService.load_saved_turns(turn_ids),
+                )
+                for line_number, record, error in chunk:
+                    profile_id = record["profile_id"] if record is not None else None
+                    await self.slots.acquire()
+                    pending.append(asyncio.create_task(self.advise_bounded(
+                        line_number, record, error, contexts.get(profile_id), memories.get(profile_id),
+                        saved_turns.get(turn_id(self.args.input, line_number)))))
+                    await self.drain(pending, output, max_pending)
+            await self.drain(pending, output, 0)
+        finally:
+            # Also on Ctrl-C: everything written so far is in input order, so it is safe to resume after
+            for task in pending:
+                task.cancel()
+            self.save_checkpoint(output)
+
+
+async def main(args) -> int:
+    runner = BatchRunner(args)
+    start_line = 0
+    mode = "w"
+    state = runner.checkpoint.load() if args.resume else None
+    if state is not None:
+        if state["input"] != os.path.abspath(args.input):
+            print(f"checkpoint {runner.checkpoint.path} is for {state['input']}, not {args.input}", file=sys.stderr)
+            return 1
+        start_line = runner.next_line = state["next_line"]
+        mode = "r+" if os.path.exists(args.output) else "w"
+        print(f"resuming at input line {start_line}", file=sys.stderr)
+
+    await database.connect_to_database()
+    # Load the sentiment model before timing starts
+    await sentiment_engine.warm_up()
+    try:
+        with open(args.output, mode, encoding="utf-8") as output:
+            if state is not None and mode == "r+":
+                # Drop results written after the checkpoint; they are redone
+                output.truncate(state["output_bytes"])
+                output.seek(state["output_bytes"])
+            runner.started = time.perf_counter()
+            await runner.run(output, start_line)
+    finally:
+        await conversation_writer.close()
+        await database.close_database_connection()
+        await llm_backend.close()
+        await sentiment_engine.close()
+
+    elapsed = time.perf_counter() - runner.started
+    stats = runner.stats
+    print(f"{stats['processed']} records in {elapsed:.1f}s ({stats['processed'] / elapsed if elapsed else 0:.1f} records/s): "
+          f"{stats['succeeded']} succeeded, {stats['failed']} failed, {stats['duplicates']} turns already saved; "
+          f"{intent_router.snapshot()['local_answers']} answered without the LLM")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the advisor over a JSONL file of profile_id/message records")
+    parser.add_argument("input")
+    parser.add_argument("--output", required=True, help="Results JSONL, one line per input record")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint")
+    parser.add_argument("--concurrency", type=int, default=16, help="Records being advised at once")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Records per bulk profile load")
+    parser.add_argument("--checkpoint-every", type=int, default=500)
+    parser.add_argument("--progress-every", type=float, default=10.0, help="Seconds between progress lines")
+    parser.add_argument("--max-retries", type=int, default=3, help="Retries when the LLM scheduler sheds a record")
+    try:
+        sys.exit(asyncio.run(main(parser.parse_args())))
+    except KeyboardInterrupt:
+        print("interrupted; run again with --resume to continue", file=sys.stderr)
+        sys.exit(130)
@@ -0,0 +1,40 @@
+# Backend: scripts/create_user.py
+# Adds a login to the users collection. The password is prompted for, so it
+# doesn't end up in shell history.
+#
+#   python scripts/create_user.py alice
+import argparse
+import asyncio
+import getpass
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo.errors import DuplicateKeyError
+from app.database import database
+from app.services.auth_service import UserService
+
+
+async def main(args) -> int:
+    password = getpass.getpass(f"Password for {args.username}: ")
+    if not password or password != getpass.getpass("Repeat password: "):
+        print("passwords are empty or don't match", file=sys.stderr)
+        return 1
+    await database.connect_to_database()
+    try:
+        await UserService.create_user(args.username, password, disabled=args.disabled)
+    except DuplicateKeyError:
+        print(f"user {args.username} already exists", file=sys.stderr)
+        return 1
+    finally:
+        await database.close_database_connection()
+    print(f"created user {args.username}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create an API user")
+    parser.add_argument("username")
+    parser.add_argument("--disabled", action="store_true", help="Create the account disabled")
+    sys.exit(asyncio.run(main(parser.parse_args())))
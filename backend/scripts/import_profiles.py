@@ -0,0 +1,87 @@
+# Backend: scripts/import_profiles.py
+# Bulk-imports the JSON profile files in financial_advisor_profiles/ (one
+# profile per file) into the configured storage backend. Embedded
+# conversation_history goes to the conversations collection with the same
+# deterministic ids as migrate_conversations.py (<profile_id>:<index>), so
+# re-running only adds what is missing.
+#
+#   python scripts/import_profiles.py
+#   STORAGE_BACKEND=local python scripts/import_profiles.py --profiles-dir ../financial_advisor_profiles
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo.errors import BulkWriteError
+from app.database import database
+from app.models import UserProfile
+
+DEFAULT_PROFILES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "financial_advisor_profiles"
+)
+
+
+def load_profile_file(path: str):
+    with open(path, encoding="utf-8") as f:
+        profile = UserProfile(**json.load(f))
+    profile_id = profile.id or os.path.splitext(os.path.basename(path))[0]
+    document = profile.dict(exclude={"id", "conversation_history"})
+    document["_id"] = profile_id
+    document["version"] = max(profile.version, 1)
+    turns = [
+        {"_id": f"{profile_id}:{index}", "profile_id": profile_id, **turn}
+        for index, turn in enumerate(profile.conversation_history)
+    ]
+    return document, turns
+
+
+async def insert_ignoring_duplicates(collection, documents: list) -> int:
+    if not documents:
+        return 0
+    try:
+        result = await collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        # Duplicate ids were imported by an earlier run
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+        return e.details["nInserted"]
+
+
+async def import_profiles(profiles_dir: str, batch_size: int, replace: bool):
+    paths = sorted(glob.glob(os.path.join(profiles_dir, "*.json")))
+    stats = {"files": len(paths), "profiles": 0, "conversation_turns": 0}
+    for start in range(0, len(paths), batch_size):
+        batch = [load_profile_file(path) for path in paths[start:start + batch_size]]
+        profiles = [document for document, _ in batch]
+        if replace:
+            for document in profiles:
+                await database.db.profiles.replace_one({"_id": document["_id"]}, document, upsert=True)
+            stats["profiles"] += len(profiles)
+        else:
+            stats["profiles"] += await insert_ignoring_duplicates(database.db.profiles, profiles)
+        turns = [turn for _, profile_turns in batch for turn in profile_turns]
+        stats["conversation_turns"] += await insert_ignoring_duplicates(database.db.conversations, turns)
+    return stats
+
+
+async def main(args):
+    await database.connect_to_database()
+    try:
+        stats = await import_profiles(args.profiles_dir, args.batch_size, args.replace)
+    finally:
+        await database.close_database_connection()
+    print(f"imported {stats['profiles']} profiles and {stats['conversation_turns']} conversation turns "
+          f"from {stats['files']} files in {args.profiles_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import JSON profile files into the configured storage backend")
+    parser.add_argument("--profiles-dir", default=DEFAULT_PROFILES_DIR)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--replace", action="store_true", help="Overwrite profiles that already exist")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,95 @@
+# Backend: scripts/migrate_conversations.py
+# Moves embedded profile.conversation_history arrays into the `conversations`
+# collection, both for profiles in MongoDB and for the JSON profile files in
+# financial_advisor_profiles/. Turns get deterministic ids
+# (<profile_id>:<index>), so re-running after an interruption is safe.
+#
+#   python scripts/migrate_conversations.py
+#   python scripts/migrate_conversations.py --profiles-dir ../financial_advisor_profiles --dry-run
+import argparse
+import asyncio
+import glob
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo.errors import BulkWriteError
+from app.database import database
+
+DEFAULT_PROFILES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "financial_advisor_profiles"
+)
+
+
+def dump_like(original: str, data: dict) -> str:
+    # Keep the file's layout (compact or indented, trailing newline), so the diff only drops the history
+    match = re.match(r"[{\[]\r?\n([ \t]+)", original)
+    text = json.dumps(data, indent=match.group(1) if match else None, ensure_ascii=original.isascii())
+    return text + "\n" if original.endswith("\n") else text
+
+
+async def insert_turns(profile_id: str, history: list, dry_run: bool) -> int:
+    documents = [
+        {"_id": f"{profile_id}:{index}", "profile_id": profile_id, **turn}
+        for index, turn in enumerate(history)
+    ]
+    if dry_run or not documents:
+        return len(documents)
+    try:
+        await database.db.conversations.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        # Duplicate ids are turns copied by an earlier, interrupted run
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+    return len(documents)
+
+
+async def migrate_database(dry_run: bool):
+    profiles = moved = 0
+    cursor = database.db.profiles.find(
+        {"conversation_history.0": {"$exists": True}}, {"conversation_history": 1}
+    )
+    async for profile in cursor:
+        moved += await insert_turns(profile["_id"], profile["conversation_history"], dry_run)
+        if not dry_run:
+            await database.db.profiles.update_one({"_id": profile["_id"]}, {"$unset": {"conversation_history": ""}})
+        profiles += 1
+    print(f"database: moved {moved} turns from {profiles} profiles")
+
+
+async def migrate_files(profiles_dir: str, dry_run: bool):
+    profiles = moved = 0
+    for path in sorted(glob.glob(os.path.join(profiles_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            original = f.read()
+        profile = json.loads(original)
+        history = profile.pop("conversation_history", None)
+        if not history:
+            continue
+        moved += await insert_turns(profile["id"], history, dry_run)
+        if not dry_run:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(dump_like(original, profile))
+        profiles += 1
+    print(f"files: moved {moved} turns from {profiles} profiles in {profiles_dir}")
+
+
+async def main(args):
+    await database.connect_to_database()
+    try:
+        await migrate_database(args.dry_run)
+        if args.profiles_dir:
+            await migrate_files(args.profiles_dir, args.dry_run)
+    finally:
+        await database.close_database_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move embedded conversation history into its own collection")
+    parser.add_argument("--profiles-dir", default=DEFAULT_PROFILES_DIR,
+                        help="Directory of JSON profile files to migrate (empty string to skip)")
+    parser.add_argument("--dry-run", action="store_true", help="Count turns without writing anything")
+    asyncio.run(main(parser.parse_args()))
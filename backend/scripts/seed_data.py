@@ -0,0 +1,73 @@
+# Backend: scripts/seed_data.py
+# Seeds synthetic profiles, spending histories and conversation turns for
+# load testing. Writes to MongoDB in batches, or streams NDJSON with --output.
+#
+#   python scripts/seed_data.py --profiles 10000 --entries-per-profile 100 --turns-per-profile 20 --seed 42
+#   python scripts/seed_data.py --profiles 1000 --output dataset.ndjson
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.synthetic_data import iter_synthetic_batches, seed_database
+
+
+def write_ndjson(args, stream):
+    stats = {"profiles": 0, "spending_entries": 0, "conversation_turns": 0}
+    for profiles, conversations in iter_synthetic_batches(
+        args.profiles, args.entries_per_profile, args.turns_per_profile, args.seed, args.batch_size, args.end_date
+    ):
+        lines = [json.dumps({"collection": "profiles", "document": profile}) for profile in profiles]
+        lines += [json.dumps({"collection": "conversations", "document": turn}) for turn in conversations]
+        stream.write("\n".join(lines) + "\n")
+        stats["profiles"] += len(profiles)
+        stats["spending_entries"] += len(profiles) * args.entries_per_profile
+        stats["conversation_turns"] += len(conversations)
+    return stats
+
+
+async def write_database(args):
+    from app.database import database
+    await database.connect_to_database()
+    try:
+        return await seed_database(args.profiles, args.entries_per_profile, args.turns_per_profile,
+                                   args.seed, args.batch_size, args.end_date)
+    finally:
+        await database.close_database_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic profiles for load testing")
+    parser.add_argument("--profiles", type=int, default=1000)
+    parser.add_argument("--entries-per-profile", type=int, default=100)
+    parser.add_argument("--turns-per-profile", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=500, help="Profiles per insert_many batch")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None,
+                        help="Last day of generated history (default: today); fix it for byte-identical output")
+    parser.add_argument("--output", default=None, help="Write NDJSON to this file ('-' for stdout) instead of MongoDB")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.output == "-":
+        stats = write_ndjson(args, sys.stdout)
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            stats = write_ndjson(args, f)
+    else:
+        stats = asyncio.run(write_database(args))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{stats['profiles']} profiles, {stats['spending_entries']} spending entries, "
+        f"{stats['conversation_turns']} turns in {elapsed:.2f}s "
+        f"({stats['spending_entries'] / elapsed:,.0f} entries/s)",
+        file=sys.stderr,
+    )
+    if stats.get("skipped_profiles"):
+        print(f"skipped {stats['skipped_profiles']} profiles that already exist (same --seed as an earlier run)",
+              file=sys.stderr)
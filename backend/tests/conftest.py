@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# Settings are read at import; nothing here talks to MongoDB or OpenAI
+for name, value in {
+    "MONGO_URL": "mongodb://localhost:27017", "DB_NAME": "test", "SECRET_KEY": "test-secret", "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30", "OPENAI_API_KEY": "sk-test", "API_URL": "http://localhost:8000",
+}.items():
+    os.environ.setdefault(name, value)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.local_store import LocalClient
+
+
+@pytest.fixture
+def db():
+    # The embedded store stands in for MongoDB
+    client = LocalClient(":memory:")
+    database.client = client
+    database.db = client["test"]
+    yield database.db
+    client.close()
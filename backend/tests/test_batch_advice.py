@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+import json
+
+from app.models import UserProfile
+from app.services.ai_service import AIService
+from app.services.memory_service import MemoryService
+from app.services.profile_service import ProfileService
+from scripts import batch_advice
+
+
+def test_resume_reuses_saved_turns_and_finishes_their_memory(db, tmp_path, monkeypatch):
+    input_path, output_path = tmp_path / "checkins.jsonl", tmp_path / "advice.jsonl"
+    llm_calls = []
+
+    async def process_user_input(context, user_input, memory=None, priority="standard"):
+        llm_calls.append(user_input.message)
+        return f"fresh reply to {user_input.message}", "NEUTRAL", 0.0
+
+    async def analyze_sentiment(message):
+        return "NEUTRAL", 0.0
+
+    monkeypatch.setattr(AIService, "process_user_input", process_user_input)
+    monkeypatch.setattr(batch_advice, "analyze_sentiment", analyze_sentiment)
+
+    async def scenario():
+        profile = await ProfileService.create_profile(UserProfile(name="Alice"))
+        input_path.write_text("".join(json.dumps({"profile_id": profile.id, "message": message}) + "\n"
+                                      for message in ("first", "second")))
+        # An earlier run saved line 0, then crashed before recording its memory
+        await db.conversations.insert_one({
+            "_id": batch_advice.turn_id(str(input_path), 0), "profile_id": profile.id, "user": "first",
+            "bot": "stored reply", "timestamp": "2024-06-01T00:00:00", "memory_pending": True,
+        })
+        args = argparse.Namespace(input=str(input_path), output=str(output_path), checkpoint=None, concurrency=2,
+                                  chunk_size=10, checkpoint_every=10, progress_every=60.0, max_retries=0)
+        runner = batch_advice.BatchRunner(args)
+        with open(output_path, "w") as output:
+            await runner.run(output, 0)
+        turns = await db.conversations.find({}).sort("_id", 1).to_list(None)
+        return runner.stats, turns, await MemoryService.load_memory(profile.id)
+
+    stats, turns, memory = asyncio.run(scenario())
+    results = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert llm_calls == ["second"]
+    assert [result["response"] for result in results] == ["stored reply", "fresh reply to second"]
+    assert stats["duplicates"] == 1
+    assert [turn["bot"] for turn in turns] == ["stored reply", "fresh reply to second"]
+    assert not any("memory_pending" in turn for turn in turns)
+    assert sorted(turn.user for turn in memory.recent) == ["first", "second"]
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import httpx
+from fastapi import FastAPI
+
+from app.dependencies import get_current_active_user
+from app.models import UserProfile
+from app.routers import chat
+from app.services import ai_service
+from app.services.ai_service import AIService
+from app.services.llm_scheduler import SchedulerOverloaded, llm_scheduler
+from app.services.openai_service import LLMTimeoutError
+from app.services.profile_service import ProfileService
+
+app = FastAPI()
+app.include_router(chat.router)
+app.dependency_overrides[get_current_active_user] = lambda: {"username": "testuser"}
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def stream_chat(stream_user_input, monkeypatch):
+    monkeypatch.setattr(AIService, "stream_user_input", stream_user_input)
+
+    async def scenario():
+        profile = await ProfileService.create_profile(UserProfile(name="Alice"))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            events = []
+            async with client.stream("POST", f"/chat/{profile.id}/stream", json={"message": "How am I doing?"}) as response:
+                body = ""
+                async for chunk in response.aiter_text():
+                    body += chunk
+                    while "\n\n" in body:
+                        block, body = body.split("\n\n", 1)
+                        event, data = parse_events(block)[0]
+                        # What a client refetching history at this point would see
+                        history = await ProfileService.get_conversation_page(profile.id, 10)
+                        events.append((event, data, len(history.turns)))
+        return events
+
+    return asyncio.run(scenario())
+
+
+def test_saved_event_follows_the_stored_turn(db, monkeypatch):
+    async def reply(profile, user_input, timings=None, **kwargs):
+        yield "token", {"text": "Fine, "}
+        yield "token", {"text": "thanks."}
+        yield "sentiment", {"sentiment": "neutral", "confidence": 0.5}
+
+    events = stream_chat(reply, monkeypatch)
+    assert [event for event, _, _ in events] == ["token", "token", "sentiment", "saved"]
+    _, saved, stored_turns = events[-1]
+    assert stored_turns == 1 and saved["timestamp"]
+
+
+def test_failed_stream_saves_nothing(db, monkeypatch):
+    async def timeout(profile, user_input, timings=None, **kwargs):
+        yield "token", {"text": "Fine"}
+        raise LLMTimeoutError()
+
+    events = stream_chat(timeout, monkeypatch)
+    assert [event for event, _, _ in events] == ["token", "error"]
+    assert events[-1][2] == 0
+
+
+def test_only_llm_bound_requests_are_shed(db, monkeypatch):
+    def full(profile_id, priority="interactive"):
+        raise SchedulerOverloaded("queue_full", 3)
+
+    async def neutral(message):
+        return "NEUTRAL", 0.0
+
+    monkeypatch.setattr(llm_scheduler, "check_admission", full)
+    monkeypatch.setattr(ai_service, "analyze_sentiment", neutral)
+
+    async def scenario():
+        profile = await ProfileService.create_profile(UserProfile(name="Alice"))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            greeting = await client.post(f"/chat/{profile.id}/stream", json={"message": "Hello!"})
+            question = await client.post(f"/chat/{profile.id}/stream", json={"message": "Should I buy a house?"})
+        return greeting, question
+
+    greeting, question = asyncio.run(scenario())
+    assert greeting.status_code == 200
+    assert [event for event, _ in parse_events(greeting.text)] == ["token", "sentiment", "saved"]
+    assert question.status_code == 429 and question.headers["Retry-After"] == "3"
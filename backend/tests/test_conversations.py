@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from bson import ObjectId
+
+from app.services.profile_service import ProfileService
+from scripts.migrate_conversations import dump_like
+
+
+def page_through(profile_id: str, limit: int) -> list:
+    async def pages():
+        turns, before = [], None
+        while True:
+            page = await ProfileService.get_conversation_page(profile_id, limit, before)
+            turns[:0] = [turn.user for turn in page.turns]
+            if page.next_before is None:
+                return turns
+            before = page.next_before
+    return asyncio.run(pages())
+
+
+def test_pages_keep_turns_that_share_a_timestamp(db):
+    # Imported turns have string ids, live ones ObjectIds; all saved in the same instant
+    turns = [{"_id": f"p1:{i}", "user": f"imported {i}"} for i in range(4)]
+    turns += [{"_id": ObjectId(), "user": f"live {i}"} for i in range(5)]
+    asyncio.run(db.conversations.insert_many(
+        [{**turn, "profile_id": "p1", "bot": "ok", "timestamp": "2024-06-01T10:00:00"} for turn in turns]
+        + [{"profile_id": "p1", "user": "earlier", "bot": "ok", "timestamp": "2024-05-01T10:00:00"}]
+    ))
+
+    for limit in (1, 2, 3, 4):
+        seen = page_through("p1", limit)
+        assert len(seen) == 10
+        assert set(seen) == {turn["user"] for turn in turns} | {"earlier"}
+        assert seen[0] == "earlier"
+
+
+def test_bare_timestamp_cursor_still_works(db):
+    asyncio.run(db.conversations.insert_many(
+        [{"profile_id": "p2", "user": str(day), "bot": "ok", "timestamp": f"2024-06-0{day}"} for day in range(1, 6)]
+    ))
+    page = asyncio.run(ProfileService.get_conversation_page("p2", 10, "2024-06-04"))
+    assert [turn.user for turn in page.turns] == ["1", "2", "3"]
+
+
+def test_migrated_profile_files_keep_their_layout():
+    profile = {"id": "p1", "name": "Zoë", "conversation_history": [{"user": "hi"}]}
+    migrated = {"id": "p1", "name": "Zoë"}
+    for options, ending in (({}, ""), ({"indent": 2}, "\n"), ({"indent": 4, "ensure_ascii": False}, "")):
+        original = json.dumps(profile, **options) + ending
+        assert dump_like(original, migrated) == json.dumps(migrated, **options) + ending
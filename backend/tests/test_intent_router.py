@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.models import AdvisorContext
+from app.services.analytics_service import AnalyticsService
+from app.services.intent_router import IntentRouter
+
+router = IntentRouter()
+
+
+@pytest.mark.parametrize("message", [
+    "Hello!", "Thank you so much", "Good morning, how are you?", "Bye for now", "Hi there", "Thanks a lot!",
+])
+def test_pleasantries_are_answered_locally(message):
+    route = router.classify(message)
+    assert (route.intent, route.direct) == ("small_talk", True)
+
+
+@pytest.mark.parametrize("message", [
+    "hey my wife died", "Hello, I lost my job", "Thanks, but I am still confused", "ok", "see you later",
+])
+def test_anything_more_than_small_talk_goes_to_the_llm(message):
+    # "general" also keeps the whole profile in the prompt
+    route = router.classify(message)
+    assert (route.intent, route.direct) == ("general", False)
+
+
+def test_greeting_with_a_financial_question_routes_by_topic():
+    route = router.classify("Hi, should I pay off my mortgage early?")
+    assert (route.intent, route.direct) == ("debt", False)
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("Show my spending this month", "spending"),
+    ("How much did I spend on groceries last month?", "spending"),
+    ("What did I spend on dining out this year?", "spending"),
+    ("How much do I have in savings?", "saving"),
+    ("What are my savings?", "saving"),
+    ("How much do I owe?", "debt"),
+    ("What do I owe in total?", "debt"),
+    ("What are my investments?", "investment"),
+])
+def test_questions_naming_a_stored_figure_are_answered_locally(message, intent):
+    route = router.classify(message)
+    assert (route.intent, route.direct) == (intent, True)
+
+
+@pytest.mark.parametrize("message", [
+    "What is the interest rate on my mortgage?",
+    "What is my credit card APR?",
+    "Tell me about my retirement",
+    "what is my savings goal",
+    "How many loans do I have",
+    "what was my biggest purchase last month",
+    "What are my stocks doing?",
+    "Tell me my investment returns",
+    "How much did I spend on groceries compared to last year?",
+])
+def test_other_questions_about_a_field_go_to_the_llm(message):
+    assert not router.classify(message).direct
+
+
+def test_spending_on_an_unknown_category_goes_to_the_llm(monkeypatch):
+    async def load_profile_spending(profile_id):
+        return {"spending_data": [{"date": "2024-06-03", "category": "Groceries", "amount": 40.0}]}
+
+    monkeypatch.setattr(AnalyticsService, "load_profile_spending", load_profile_spending)
+    profile = AdvisorContext(id="p1", name="Alice")
+    route = router.classify("How much did I spend on average?")
+    assert route.direct
+    assert asyncio.run(router.answer(route, profile, "How much did I spend on average?")) is None
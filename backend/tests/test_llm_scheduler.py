@@ -0,0 +1,22 @@
+import asyncio
+
+from app.services.llm_scheduler import LLMScheduler
+
+
+def test_abandoned_head_of_queue_lets_the_next_request_start():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=4, tokens_per_minute=100, queue_timeout=5)
+        running = await scheduler.acquire("p0", tokens=60)
+        # "big" can't fit in the 40 tokens left and heads the queue; "small" could
+        big = asyncio.ensure_future(scheduler.acquire("big", tokens=100))
+        await asyncio.sleep(0)
+        small = asyncio.ensure_future(scheduler.acquire("small", tokens=10))
+        await asyncio.sleep(0)
+        big.cancel()
+        ticket = await asyncio.wait_for(small, 1)
+        scheduler.release(ticket)
+        scheduler.release(running)
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert (snapshot["queue_depth"], snapshot["active"]) == (0, 0)
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from bson import ObjectId
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.local_store import LocalClient
+
+
+def run(collection, scenario):
+    return asyncio.run(scenario(collection))
+
+
+def test_supported_query_operators(db):
+    oid = ObjectId()
+
+    async def scenario(collection):
+        await collection.insert_many([
+            {"_id": "a", "name": "Alice Smith", "age": 30, "tags": ["saver"]},
+            {"_id": "b", "name": "bob", "age": 45, "debts": 0},
+            {"_id": oid, "name": "Carol", "age": None},
+        ])
+
+        async def ids(query):
+            return sorted(str(document["_id"]) for document in await collection.find(query).to_list(None))
+
+        return {
+            "eq": await ids({"name": "bob"}),
+            "array_eq": await ids({"tags": "saver"}),
+            "in": await ids({"_id": {"$in": ["a", oid]}}),
+            "range": await ids({"age": {"$gte": 30, "$lt": 45}}),
+            "lte": await ids({"age": {"$lte": 45}}),
+            "exists": await ids({"debts": {"$exists": True}}),
+            "missing": await ids({"debts": {"$exists": False}}),
+            "regex": await ids({"name": {"$regex": "^b", "$options": "i"}}),
+            "type": await ids({"_id": {"$type": "string"}}),
+            "or": await ids({"$or": [{"age": 30}, {"_id": oid}]}),
+        }
+
+    result = run(db.people, scenario)
+    assert result == {
+        "eq": ["b"], "array_eq": ["a"], "in": sorted(["a", str(oid)]), "range": ["a"], "lte": ["a", "b"],
+        "exists": ["b"], "missing": sorted(["a", str(oid)]), "regex": ["b"], "type": ["a", "b"],
+        "or": sorted(["a", str(oid)]),
+    }
+
+
+def test_supported_update_operators(db):
+    async def scenario(collection):
+        await collection.update_one({"_id": "p1"}, {"$setOnInsert": {"summary": ""}, "$push": {"recent": 1}}, upsert=True)
+        await collection.update_one({"_id": "p1"}, {"$setOnInsert": {"summary": "ignored"}, "$inc": {"version": 1}}, upsert=True)
+        updated = await collection.find_one_and_update(
+            {"_id": "p1", "version": 1},
+            {"$push": {"recent": {"$each": [2, 3]}}, "$set": {"meta.name": "x"}, "$unset": {"summary": ""}},
+            return_document=ReturnDocument.AFTER,
+        )
+        result = await collection.bulk_write([InsertOne({"_id": "p2"}), UpdateOne({"_id": "p1"}, {"$inc": {"version": 1}})])
+        return updated, result, await collection.find_one({"_id": "p1"}, {"version": 1})
+
+    updated, result, projected = run(db.memory, scenario)
+    assert updated == {"_id": "p1", "recent": [1, 2, 3], "version": 1, "meta": {"name": "x"}}
+    assert (result.inserted_count, result.modified_count) == (1, 1)
+    assert projected == {"_id": "p1", "version": 2}
+
+
+@pytest.mark.parametrize("operation", [
+    lambda collection: collection.find_one({"age": {"$gt": 1}}),
+    lambda collection: collection.find({"age": {"$ne": 1}}).to_list(None),
+    lambda collection: collection.count_documents({"$and": [{"age": 1}]}),
+    lambda collection: collection.update_one({"_id": "a"}, {"$addToSet": {"tags": "x"}}),
+    lambda collection: collection.update_one({"_id": "a"}, {"$push": {"tags": {"$each": ["x"], "$slice": -1}}}),
+    lambda collection: collection.bulk_write([DeleteOne({"_id": "a"})]),
+])
+def test_unsupported_operators_raise(db, operation):
+    async def scenario(collection):
+        await collection.insert_one({"_id": "a", "age": 1, "tags": []})
+        with pytest.raises(ValueError):
+            await operation(collection)
+
+    run(db.people, scenario)
+
+
+def test_replace_upsert_keeps_the_filter_id(db):
+    async def scenario(collection):
+        await collection.replace_one({"_id": "p1"}, {"name": "Alice"}, upsert=True)
+        await collection.replace_one({"_id": "p1"}, {"name": "Bob"}, upsert=True)
+        return await collection.find({}).to_list(None)
+
+    assert run(db.profiles, scenario) == [{"_id": "p1", "name": "Bob"}]
+
+
+def test_duplicate_keys_raise_like_mongo(db):
+    async def scenario(collection):
+        await collection.insert_one({"_id": "a"})
+        with pytest.raises(DuplicateKeyError):
+            await collection.insert_one({"_id": "a"})
+        with pytest.raises(BulkWriteError) as error:
+            await collection.insert_many([{"_id": "b"}, {"_id": "a"}, {"_id": "c"}], ordered=False)
+        return error.value.details, await collection.count_documents({})
+
+    details, count = run(db.people, scenario)
+    assert details["nInserted"] == 2 and [e["index"] for e in details["writeErrors"]] == [1]
+    assert count == 3
+
+
+def test_writes_survive_reopening_the_file(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+
+    async def write():
+        collection = LocalClient(path)["test"].profiles
+        await collection.insert_many([{"_id": "a", "n": 1}, {"_id": "b", "n": 1}])
+        await collection.bulk_write([UpdateOne({"_id": "a"}, {"$inc": {"n": 1}}), InsertOne({"_id": "c"})])
+        await collection.delete_one({"_id": "b"})
+        return collection
+
+    async def read(client):
+        return await client["test"].profiles.find({}).sort("_id", 1).to_list(None)
+
+    first = asyncio.run(write())
+    first._client.close()
+    first._client.close()
+    reopened = LocalClient(path)
+    try:
+        assert asyncio.run(read(reopened)) == [{"_id": "a", "n": 2}, {"_id": "c"}]
+    finally:
+        reopened.close()
+
+
+def test_sqlite_io_runs_off_the_event_loop(db):
+    blocked = threading.Event()
+    ticks = []
+
+    async def scenario(collection):
+        await collection.insert_one({"_id": "warm"})
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def stall():
+            threads.append(threading.get_ident())
+            blocked.set()
+            time.sleep(0.3)
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.ensure_future(ticker())
+        # A slow disk: the commit queued behind stall() waits, the loop doesn't
+        stalled = asyncio.ensure_future(collection._client.run(stall))
+        await asyncio.sleep(0.02)
+        await collection.insert_one({"_id": "late"})
+        await stalled
+        ticking.cancel()
+        return loop_thread, threads
+
+    loop_thread, threads = run(db.people, scenario)
+    assert blocked.is_set() and threads[0] != loop_thread
+    assert len(ticks) > 10
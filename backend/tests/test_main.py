@@ -0,0 +1,30 @@
+import asyncio
+import logging
+
+import main
+from app.services.bulk_writer import conversation_writer
+from app.services.openai_service import llm_backend
+from app.services.sentiment_service import sentiment_engine
+
+
+def test_shutdown_closes_everything_after_a_failed_warm_up(db, monkeypatch, caplog):
+    closed = []
+    for name, service in (("writer", conversation_writer), ("llm", llm_backend), ("sentiment", sentiment_engine)):
+        async def close(name=name):
+            closed.append(name)
+        monkeypatch.setattr(service, "close", close)
+
+    async def failing_warm_up():
+        raise OSError("model download failed")
+
+    async def scenario():
+        task = asyncio.ensure_future(failing_warm_up())
+        task.add_done_callback(main.log_warm_up_failure)
+        monkeypatch.setattr(main.app.state, "warm_up_task", task, raising=False)
+        await asyncio.sleep(0)
+        await main.shutdown_db_client()
+
+    with caplog.at_level(logging.ERROR, logger="main"):
+        asyncio.run(scenario())
+    assert closed == ["writer", "llm", "sentiment"]
+    assert "Warm-up failed" in caplog.text and "model download failed" in caplog.text
@@ -0,0 +1,50 @@
+import asyncio
+
+from app.config import settings
+from app.services.memory_service import MemoryService
+
+
+def test_turns_saved_concurrently_are_never_dropped(db, monkeypatch):
+    monkeypatch.setattr(settings, "MEMORY_WINDOW_TURNS", 2)
+    collection = db.conversation_memory
+    original = collection.update_one
+    calls = []
+
+    async def interleaved_update_one(query, update, **kwargs):
+        # A's compaction is held until B has pushed its turn; B's until A has written
+        calls.append(query)
+        if len(calls) == 1:
+            second = asyncio.ensure_future(MemoryService.record_turn("p1", "question 4", "answer 4", "2024-06-04"))
+            await asyncio.sleep(0)
+            result = await original(query, update, **kwargs)
+            first_written.set()
+            await second
+            return result
+        if len(calls) == 2:
+            await first_written.wait()
+        return await original(query, update, **kwargs)
+
+    async def scenario():
+        for day in (1, 2):
+            await MemoryService.record_turn("p1", f"question {day}", f"answer {day}", f"2024-06-0{day}")
+        monkeypatch.setattr(collection, "update_one", interleaved_update_one)
+        await MemoryService.record_turn("p1", "question 3", "answer 3", "2024-06-03")
+        return await MemoryService.load_memory("p1")
+
+    first_written = asyncio.Event()
+    memory = asyncio.run(scenario())
+    assert [turn.user for turn in memory.recent] == ["question 3", "question 4"]
+    assert "question 1" in memory.summary and "question 2" in memory.summary
+
+
+def test_memory_keeps_window_and_summarizes_the_rest(db, monkeypatch):
+    monkeypatch.setattr(settings, "MEMORY_WINDOW_TURNS", 3)
+
+    async def scenario():
+        for day in range(1, 8):
+            await MemoryService.record_turn("p2", f"question {day}", f"answer {day}.", f"2024-06-0{day}")
+        return await MemoryService.load_memory("p2")
+
+    memory = asyncio.run(scenario())
+    assert [turn.user for turn in memory.recent] == ["question 5", "question 6", "question 7"]
+    assert memory.summary.count("\n") == 3
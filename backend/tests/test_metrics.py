@@ -0,0 +1,37 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.config import settings
+from app.dependencies import get_current_active_user
+from app.routers import metrics
+
+app = FastAPI()
+app.include_router(metrics.router)
+JSON_ENDPOINTS = ["/metrics/response_cache", "/metrics/profile_cache", "/metrics/intent_router",
+                  "/metrics/llm_scheduler", "/metrics/request_profiles/abc"]
+
+
+def statuses(paths, headers=None):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            return [(await client.get(path, headers=headers)).status_code for path in paths]
+    return asyncio.run(run())
+
+
+def test_json_metrics_need_a_logged_in_user():
+    assert statuses(JSON_ENDPOINTS) == [401] * len(JSON_ENDPOINTS)
+    app.dependency_overrides[get_current_active_user] = lambda: {"username": "testuser"}
+    try:
+        assert statuses(JSON_ENDPOINTS) == [200, 200, 200, 200, 404]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_prometheus_scrape_token(monkeypatch):
+    assert statuses(["/metrics"]) == [200]
+    monkeypatch.setattr(settings, "METRICS_BEARER_TOKEN", "scrape-secret")
+    assert statuses(["/metrics"]) == [401]
+    assert statuses(["/metrics"], {"Authorization": "Bearer wrong"}) == [401]
+    assert statuses(["/metrics"], {"Authorization": "Bearer scrape-secret"}) == [200]
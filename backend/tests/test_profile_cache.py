@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.services.profile_cache import AsyncTTLCache
+
+
+def test_cancelling_the_first_caller_leaves_coalesced_callers_unaffected():
+    async def scenario():
+        cache = AsyncTTLCache()
+        release = asyncio.Event()
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            await release.wait()
+            return {"name": "Alice"}
+
+        first = asyncio.ensure_future(cache.get_or_load("p1", "profile", loader))
+        second = asyncio.ensure_future(cache.get_or_load("p1", "profile", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        value = await second
+        cached = await cache.get_or_load("p1", "profile", loader)
+        return first, value, cached, loads, cache.stats
+
+    first, value, cached, loads, stats = asyncio.run(scenario())
+    assert first.cancelled()
+    assert value == cached == {"name": "Alice"}
+    assert len(loads) == 1
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 1, 1)
+
+
+def test_loader_errors_reach_every_caller_and_are_not_cached():
+    async def scenario():
+        cache = AsyncTTLCache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0)
+            raise RuntimeError("database down")
+
+        results = await asyncio.gather(*(cache.get_or_load("p1", "profile", failing) for _ in range(3)),
+                                       return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("p1", "profile", failing)
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(calls) == 2
+
+
+def test_a_load_in_flight_during_invalidation_is_not_stored():
+    async def scenario():
+        cache = AsyncTTLCache()
+        release = asyncio.Event()
+
+        async def stale():
+            await release.wait()
+            return "old"
+
+        pending = asyncio.ensure_future(cache.get_or_load("p1", "profile", stale))
+        await asyncio.sleep(0)
+        cache.invalidate("p1")
+        release.set()
+
+        async def fresh():
+            return "new"
+
+        return await pending, await cache.get_or_load("p1", "profile", fresh)
+
+    assert asyncio.run(scenario()) == ("old", "new")
@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.dependencies import get_current_active_user
+from app.models import UserProfile
+from app.routers import profiles
+from app.services.profile_service import ProfileService
+
+app = FastAPI()
+app.include_router(profiles.router)
+app.dependency_overrides[get_current_active_user] = lambda: {"username": "testuser"}
+
+
+def call(scenario):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            return await scenario(client)
+    return asyncio.run(run())
+
+
+def test_patch_rejects_null_for_required_fields(db):
+    async def scenario(client):
+        profile = await ProfileService.create_profile(UserProfile(name="Alice", age=72, financial_goals=["Travel"]))
+        statuses = [(await client.patch(f"/profiles/{profile.id}", json=body)).status_code
+                    for body in ({"name": None}, {"financial_goals": None})]
+        patched = await client.patch(f"/profiles/{profile.id}", json={"age": None, "savings": 1000})
+        stored = await client.get(f"/get_profile/{profile.id}")
+        return statuses, patched, stored
+
+    statuses, patched, stored = call(scenario)
+    assert statuses == [422, 422]
+    assert patched.status_code == 200 and patched.json()["age"] is None
+    assert stored.json()["name"] == "Alice" and stored.json()["financial_goals"] == ["Travel"]
+
+
+def test_empty_patch_checks_the_version(db):
+    async def scenario(client):
+        profile = await ProfileService.create_profile(UserProfile(name="Alice"))
+        version = profile.version
+        return [(await client.patch(url, params=params, json={})).status_code for url, params in (
+            (f"/profiles/{profile.id}", {"expected_version": version}),
+            (f"/profiles/{profile.id}", {"expected_version": version + 1}),
+            ("/profiles/missing", {"expected_version": version}),
+        )]
+
+    assert call(scenario) == [200, 409, 404]
+
+
+def test_generating_spending_data_replaces_it(db):
+    async def scenario(client):
+        profile = await ProfileService.create_profile(UserProfile(name="Alice"))
+        for _ in range(3):
+            generated = await client.post(f"/generate_spending_data/{profile.id}", params={"num_entries": 10})
+        stored = await client.get(f"/get_profile/{profile.id}")
+        return generated.json(), stored.json()
+
+    generated, stored = call(scenario)
+    assert len(stored["spending_data"]) == 10
+    assert stored["spending_data"] == generated["entries"]
+    assert stored["version"] == generated["version"] == 4
@@ -0,0 +1,88 @@
+import asyncio
+
+from app.config import settings
+from app.models import AdvisorContext, ConversationMemory, ConversationTurn, UserInput
+from app.services import ai_service
+from app.services.ai_service import AIService
+from app.services.response_cache import ResponseCache, response_cache
+
+# Same age, income, savings, debts and goals: only the name and id differ
+ALICE = AdvisorContext(id="alice", name="Alice", age=72, income=42000, savings=180000, debts=12000,
+                       financial_goals=["Travel"])
+BOB = ALICE.model_copy(update={"id": "bob", "name": "Bob"})
+
+
+def test_profiles_with_the_same_finances_never_share_replies():
+    for cache in (ResponseCache(), ResponseCache(semantic=True, similarity=0.5)):
+        cache.put("Should I pay off my debt first?", ALICE, "Alice, with $12,000 of debt I would pay it off first.")
+        cache.put("Is my pension enough?", BOB, "Bob, your pension covers your costs.")
+
+        assert cache.get("Should I pay off my debt first?", BOB) is None
+        assert cache.get("should i pay off my debt first", ALICE).startswith("Alice")
+        assert cache.get("Is my pension enough?", ALICE) is None
+        assert "Alice" not in (cache.get("Is my pension enough?", BOB) or "")
+        assert cache.get("Is my pension really enough?", ALICE) is None
+
+
+def test_invalidating_a_profile_leaves_the_others():
+    cache = ResponseCache()
+    cache.put("Hello", ALICE, "Hello Alice")
+    cache.put("Hello", BOB, "Hello Bob")
+    cache.invalidate_profile("alice")
+    assert cache.get("Hello", ALICE) is None
+    assert cache.get("Hello", BOB) == "Hello Bob"
+
+
+def test_profiles_without_an_id_are_not_cached():
+    cache = ResponseCache()
+    anonymous = ALICE.model_copy(update={"id": None})
+    cache.put("Hello", anonymous, "Hello Alice")
+    assert len(cache) == 0 and cache.get("Hello", anonymous) is None
+
+
+def test_replies_are_cached_per_conversation_context():
+    for cache in (ResponseCache(), ResponseCache(semantic=True, similarity=0.5)):
+        cache.put("Can you explain that in more detail?", ALICE, "About the car loan...", context="car")
+        assert cache.get("Can you explain that in more detail?", ALICE, "house") is None
+        assert cache.get("Can you explain that in more detail?", ALICE) is None
+        assert cache.get("can you explain that in more detail", ALICE, "car") == "About the car loan..."
+        cache.invalidate_profile("alice")
+        assert len(cache) == 0
+
+
+def test_follow_ups_after_different_turns_are_not_served_from_cache(monkeypatch):
+    prompts = []
+
+    async def generate(profile, message, memory, intent):
+        prompts.append(memory.recent[-1].user)
+        return f"reply {len(prompts)}"
+
+    async def generate_stream(profile, message, memory, intent):
+        yield await generate(profile, message, memory, intent)
+
+    async def neutral(message):
+        return "NEUTRAL", 0.0
+
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(ai_service, "generate_ai_response", generate)
+    monkeypatch.setattr(ai_service, "generate_ai_response_stream", generate_stream)
+    monkeypatch.setattr(ai_service, "analyze_sentiment", neutral)
+    response_cache.invalidate_profile("alice")
+
+    def memory(topic):
+        return ConversationMemory(recent=[ConversationTurn(user=f"Should I take the {topic}?", bot="...",
+                                                           timestamp="2024-06-01")])
+
+    async def scenario():
+        follow_up = UserInput(message="Can you explain that in more detail?")
+        replies = [(await AIService.process_user_input(ALICE, follow_up, memory=memory(topic)))[0]
+                   for topic in ("car loan", "house", "car loan")]
+        streamed = [data["text"] async for event, data
+                    in AIService.stream_user_input(ALICE, follow_up, memory=memory("pension")) if event == "token"]
+        return replies, streamed
+
+    replies, streamed = asyncio.run(scenario())
+    response_cache.invalidate_profile("alice")
+    assert replies == ["reply 1", "reply 2", "reply 1"]
+    assert streamed == ["reply 3"]
+    assert prompts == ["Should I take the car loan?", "Should I take the house?", "Should I take the pension?"]
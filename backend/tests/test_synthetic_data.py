@@ -0,0 +1,17 @@
+import asyncio
+from datetime import date
+
+from app.services.synthetic_data import seed_database
+
+
+def test_reseeding_skips_existing_profiles_and_their_turns(db):
+    async def scenario():
+        first = await seed_database(20, 5, 3, seed=7, batch_size=10, end_date=date(2024, 1, 1))
+        # Same seed: the first 20 profiles are the same ones again
+        again = await seed_database(25, 5, 3, seed=7, batch_size=10, end_date=date(2024, 1, 1))
+        return first, again, await db.profiles.count_documents({}), await db.conversations.count_documents({})
+
+    first, again, profiles, turns = asyncio.run(scenario())
+    assert (first["profiles"], first["skipped_profiles"]) == (20, 0)
+    assert (again["profiles"], again["skipped_profiles"], again["conversation_turns"]) == (5, 20, 15)
+    assert (profiles, turns) == (25, 75)
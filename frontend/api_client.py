@@ -0,0 +1,108 @@
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+# Reads are served from Streamlit's cache for this long unless a write invalidates them
+CACHE_TTL_SECONDS = int(os.getenv("UI_CACHE_TTL_SECONDS", "30"))
+POOL_SIZE = int(os.getenv("UI_HTTP_POOL_SIZE", "20"))
+REQUEST_TIMEOUT = float(os.getenv("UI_REQUEST_TIMEOUT", "30"))
+# Chat replies stream for as long as the model generates
+STREAM_TIMEOUT = (5, 120)
+
+
+@st.cache_resource
+def get_session():
+    """One keep-alive connection pool shared by every UI session in this process."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        # Connection failures are retried for any method; error statuses only for idempotent ones
+        allowed_methods=frozenset(["GET", "HEAD", "PUT"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.hooks["response"].append(count_request)
+    return session
+
+
+def count_request(response, *args, **kwargs):
+    # Lets the page show how many backend requests an interaction cost
+    try:
+        st.session_state.backend_requests = st.session_state.get("backend_requests", 0) + 1
+    except Exception:
+        pass
+
+
+def auth_headers(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def request(method, path, token=None, **kwargs):
+    headers = auth_headers(token) if token else {}
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    response = get_session().request(method, f"{API_URL}{path}", headers=headers, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+# Cached reads. The token is part of each cache key, so users never see each
+# other's data; failed requests raise and are therefore never cached.
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def list_profiles(token, offset, limit, name=None, sort="name"):
+    params = {"offset": offset, "limit": limit, "sort": sort}
+    if name:
+        params["name"] = name
+    return request("GET", "/profiles", token, params=params).json()
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_profile(token, profile_id):
+    return request("GET", f"/get_profile/{profile_id}", token).json()
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_conversation_history(token, profile_id, limit):
+    return request("GET", f"/conversation_history/{profile_id}", token, params={"limit": limit}).json()["turns"]
+
+
+def invalidate_profiles():
+    list_profiles.clear()
+    get_profile.clear()
+
+
+def invalidate_history():
+    get_conversation_history.clear()
+
+
+# Writes
+
+def login(username, password):
+    return request("POST", "/token", data={"username": username, "password": password}).json()["access_token"]
+
+
+def create_profile(token, profile_data):
+    profile = request("POST", "/create_profile", token, json=profile_data).json()
+    invalidate_profiles()
+    return profile
+
+
+def generate_spending_data(token, profile_id):
+    result = request("POST", f"/generate_spending_data/{profile_id}", token).json()
+    invalidate_profiles()
+    return result
+
+
+def stream_chat(token, profile_id, message):
+    # Call invalidate_history() on the final "saved" event, once the turn is stored
+    return request("POST", f"/chat/{profile_id}/stream", token, json={"message": message},
+                   stream=True, timeout=STREAM_TIMEOUT)
@@ -1,16 +1,20 @@
 import streamlit as st
 import requests
-import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class FinancialAdvisorUI:
-    def __init__(self):
-        self.api_url = os.getenv("API_URL", "http://localhost:8000")
+import api_client
+
+# Only the latest page of turns is shown in the chat view
+HISTORY_PAGE_SIZE = 20
+PROFILES_PAGE_SIZE = 20
 
+class FinancialAdvisorUI:
     def run(self):
         st.title("AI Financial Advisor")
+        requests_before = st.session_state.get("backend_requests", 0)
         self.handle_authentication()
         if "token" in st.session_state:
             self.show_profile_management()
@@ -18,6 +22,8 @@ class FinancialAdvisorUI:
                 self.show_chat_interface()
             else:
                 st.warning("Please load or create a profile before chatting.")
+        requests_total = st.session_state.get("backend_requests", 0)
+        st.sidebar.caption(f"Backend requests: {requests_total - requests_before} this run, {requests_total} this session")
 
     def handle_authentication(self):
         if "token" not in st.session_state:
@@ -28,15 +34,15 @@ class FinancialAdvisorUI:
                 submit_button = st.form_submit_button("Login")
                 
                 if submit_button:
-                    response = requests.post(f"{self.api_url}/token", data={"username": username, "password": password})
-                    if response.status_code == 200:
-                        st.session_state.token = response.json()["access_token"]
+                    try:
+                        st.session_state.token = api_client.login(username, password)
+                    except requests.RequestException:
+                        st.error("Invalid credentials")
+                    else:
                         st.success("Logged in successfully!")
                         if profile_id:
                             self.load_profile(profile_id)
                         st.experimental_rerun()
-                    else:
-                        st.error("Invalid credentials")
         else:
             st.success("You are logged in.")
             if st.button("Logout"):
@@ -78,22 +84,32 @@ class FinancialAdvisorUI:
             st.json(st.session_state.profile)
             
             if st.button("Generate Synthetic Spending Data"):
-                headers = {"Authorization": f"Bearer {st.session_state.token}"}
-                response = requests.post(f"{self.api_url}/generate_spending_data/{st.session_state.profile['id']}", headers=headers)
-                if response.status_code == 200:
-                    st.success("Synthetic spending data generated successfully!")
-                    self.load_profile(st.session_state.profile['id'])  # Reload the profile to show new data
-                else:
+                try:
+                    result = api_client.generate_spending_data(st.session_state.token, st.session_state.profile['id'])
+                except requests.RequestException:
                     st.error("Failed to generate synthetic spending data")
+                else:
+                    # The returned entries replace the old ones; no need to reload the whole profile
+                    st.session_state.profile["spending_data"] = result["entries"]
+                    st.session_state.profile["version"] = result["version"]
+                    st.success("Synthetic spending data generated successfully!")
+                    st.experimental_rerun()
 
     
     def view_stored_profiles(self):
         st.subheader("Stored Profiles")
-        headers = {"Authorization": f"Bearer {st.session_state.token}"}
-        response = requests.get(f"{self.api_url}/get_all_profiles", headers=headers)
-        if response.status_code == 200:
-            profiles = response.json()
-            for profile in profiles:
+        name_filter = st.text_input(
+            "Filter by name", key="profile_name_filter",
+            on_change=lambda: st.session_state.update(profiles_offset=0),
+        )
+        offset = st.session_state.get("profiles_offset", 0)
+        try:
+            # Cached, so reruns caused by other widgets don't refetch the list
+            page = api_client.list_profiles(st.session_state.token, offset, PROFILES_PAGE_SIZE, name_filter or None)
+        except requests.RequestException:
+            page = None
+        if page is not None:
+            for profile in page["items"]:
                 with st.expander(f"Profile: {profile['name']}"):
                     st.write(f"Profile ID: {profile['id']}")
                     st.write(f"Age: {profile['age']}")
@@ -104,17 +120,29 @@ class FinancialAdvisorUI:
                     st.write(f"Financial Goals: {', '.join(profile['financial_goals'])}")
                     if st.button(f"Load Profile {profile['id']}", key=f"load_{profile['id']}"):
                         self.load_profile(profile['id'])
+
+            shown_to = min(offset + PROFILES_PAGE_SIZE, page["total"])
+            st.caption(f"Showing {offset + 1 if page['total'] else 0}-{shown_to} of {page['total']} profiles")
+            previous_col, next_col = st.columns(2)
+            if previous_col.button("Previous page", disabled=offset == 0):
+                st.session_state.profiles_offset = max(offset - PROFILES_PAGE_SIZE, 0)
+                st.experimental_rerun()
+            if next_col.button("Next page", disabled=shown_to >= page["total"]):
+                st.session_state.profiles_offset = offset + PROFILES_PAGE_SIZE
+                st.experimental_rerun()
         else:
-            st.error("Failed to retrieve stored profiles")   
+            st.error("Failed to retrieve stored profiles")
 
     def load_profile(self, profile_id):
-        headers = {"Authorization": f"Bearer {st.session_state.token}"}
-        response = requests.get(f"{self.api_url}/get_profile/{profile_id}", headers=headers)
-        if response.status_code == 200:
-            st.session_state.profile = response.json()
-            st.success("Profile loaded successfully!")
-        else:
+        try:
+            profile = api_client.get_profile(st.session_state.token, profile_id)
+        except requests.RequestException:
             st.error("Failed to load profile")
+        else:
+            # Copy so local edits (e.g. appended spending) don't alter the cached value
+            st.session_state.profile = json.loads(json.dumps(profile))
+            st.session_state.pop("conversation_history", None)
+            st.success("Profile loaded successfully!")
 
     def create_new_profile(self, name, age, income, savings, debts, investments, financial_goals):
         profile_data = {
@@ -126,13 +154,13 @@ class FinancialAdvisorUI:
             "investments": investments,
             "financial_goals": financial_goals.split('\n') if financial_goals else []
         }
-        headers = {"Authorization": f"Bearer {st.session_state.token}"}
-        response = requests.post(f"{self.api_url}/create_profile", headers=headers, json=profile_data)
-        if response.status_code == 200:
-            st.session_state.profile = response.json()
-            st.success("Profile created successfully!")
-        else:
+        try:
+            st.session_state.profile = api_client.create_profile(st.session_state.token, profile_data)
+        except requests.RequestException:
             st.error("Failed to create profile")
+        else:
+            st.session_state.pop("conversation_history", None)
+            st.success("Profile created successfully!")
 
     
     def show_chat_interface(self):
@@ -159,12 +187,11 @@ class FinancialAdvisorUI:
             if send_button and user_input:
                 if "profile" in st.session_state:
                     try:
-                        headers = {"Authorization": f"Bearer {st.session_state.token}"}
-                        data = {"message": user_input}
-                        response = requests.post(f"{self.api_url}/chat/{st.session_state.profile['id']}", headers=headers, json=data)
-                        if response.status_code == 200:
-                            bot_response = response.json()
-                            
+                        with chat_history:
+                            st.text(f"User: {user_input}")
+                            placeholder = st.empty()
+                            bot_response = self.stream_chat(user_input, placeholder)
+                        if bot_response is not None:
                             # Update conversation history
                             st.session_state.conversation_history.append({
                                 "user": user_input,
@@ -174,13 +201,8 @@ class FinancialAdvisorUI:
                             
                             # Update the chat history display
                             with chat_history:
-                                st.text(f"User: {user_input}")
-                                st.text(f"AI: {bot_response['message']}")
                                 st.text(f"Sentiment: {bot_response['sentiment']} (Confidence: {bot_response['confidence']})")
                                 st.markdown("---")
-                            
-                        else:
-                            st.error(f"Failed to get response from AI. Status code: {response.status_code}")
                     except requests.RequestException as e:
                         st.error(f"An error occurred while communicating with the AI: {str(e)}")
                     except Exception as e:
@@ -193,12 +215,45 @@ class FinancialAdvisorUI:
             latest_message = st.session_state.conversation_history[-1]
             st.text(f"Latest AI Response: {latest_message['bot']}")
 
+    def stream_chat(self, user_input, placeholder):
+        # Renders the reply into ``placeholder`` as tokens arrive over SSE
+        try:
+            response = api_client.stream_chat(st.session_state.token, st.session_state.profile['id'], user_input)
+        except requests.HTTPError as e:
+            st.error(f"Failed to get response from AI. Status code: {e.response.status_code}")
+            return None
+
+        response.encoding = "utf-8"
+        message = ""
+        result = None
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                payload = json.loads(line[len("data: "):])
+                if event == "token":
+                    message += payload["text"]
+                    placeholder.text(f"AI: {message}")
+                elif event == "sentiment":
+                    result = {"message": message.strip(), **payload}
+                elif event == "saved":
+                    # Only now does the stored history include this turn
+                    api_client.invalidate_history()
+                elif event == "error":
+                    st.error(payload["detail"])
+        return result
+
     def get_conversation_history(self):
         if "profile" in st.session_state:
-            headers = {"Authorization": f"Bearer {st.session_state.token}"}
-            response = requests.get(f"{self.api_url}/conversation_history/{st.session_state.profile['id']}", headers=headers)
-            if response.status_code == 200:
-                return response.json()
+            try:
+                turns = api_client.get_conversation_history(
+                    st.session_state.token, st.session_state.profile['id'], HISTORY_PAGE_SIZE
+                )
+            except requests.RequestException:
+                return []
+            # Copy: the chat view appends to this list
+            return list(turns)
         return []
 
 if __name__ == "__main__":
@@ -1,8 +1,18 @@
 # Backend: main.py
+import asyncio
+import contextlib
+import logging
 from fastapi import FastAPI
-from app.routers import auth, profiles, chat
+from app.routers import auth, profiles, chat, health, metrics, analytics
 from app.database import database
 from app.config import settings
+from app.instrumentation import MetricsMiddleware
+from app.services.auth_service import UserService
+from app.services.bulk_writer import conversation_writer
+from app.services.openai_service import llm_backend
+from app.services.sentiment_service import sentiment_engine
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="AI Financial Advisor API",
@@ -10,16 +20,43 @@ app = FastAPI(
     version="0.2.0",
 )
 
+app.add_middleware(MetricsMiddleware)
+
 @app.on_event("startup")
 async def startup_db_client():
     await database.connect_to_database()
+    if settings.CREATE_DEMO_USER:
+        await UserService.ensure_default_user()
+    if settings.WARM_UP_ON_STARTUP:
+        # Load models in the background so the server accepts traffic right away;
+        # /health/ready reports when they are warm.
+        app.state.warm_up_task = asyncio.ensure_future(asyncio.gather(sentiment_engine.warm_up(), llm_backend.warm_up()))
+        app.state.warm_up_task.add_done_callback(log_warm_up_failure)
+
+def log_warm_up_failure(task: asyncio.Future):
+    # Otherwise a failed warm-up only shows as /health/ready staying 503;
+    # the models are loaded again on first use.
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Warm-up failed, models will load on first use", exc_info=task.exception())
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    warm_up_task = getattr(app.state, "warm_up_task", None)
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+        # A warm-up that already failed was logged; it must not stop the closes below
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await warm_up_task
+    await conversation_writer.close()
     await database.close_database_connection()
+    await llm_backend.close()
+    await sentiment_engine.close()
 
 app.include_router(auth.router)
 app.include_router(profiles.router)
 app.include_router(chat.router)
+app.include_router(analytics.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
 
 